@@ -18,10 +18,11 @@ from app.ui_utils.icon_utils import load_icon
 from app.utils import validate_url, resource_path, ConfigManager
 from app.ui_utils import show_error_message, FeedbackManager
 from app.threads.TranscodingThread import TranscodingThread
+from app.ffmpeg_utils import is_directly_usable, probe_media
 from app.threads.YouTubeDownloadThread import YouTubeDownloadThread
 from app.VoiceRecorderWidget import VoiceRecorderWidget
 from app.FileDropWidget import FileDropWidget
-from app.ThreadManager import ThreadManager
+from app.ThreadManager import POOL_CPU, POOL_NETWORK, ThreadManager
 
 # Configure logging (use app name)
 logger = logging.getLogger("transcribrr")
@@ -321,9 +322,10 @@ class ControlPanelWidget(QWidget):
                 self.handle_io_complete)
             self.youtube_download_thread.error.connect(self.on_error)
 
-            # Register thread with ThreadManager
-            ThreadManager.instance().register_thread(self.youtube_download_thread)
-            self.youtube_download_thread.start()
+            # Queue for a network slot; starts at once if one is free
+            self.youtube_cancel_token = ThreadManager.instance().submit(
+                self.youtube_download_thread, pool=POOL_NETWORK
+            )
         except Exception as e:
             self.on_error(f"Failed to start YouTube download: {e}")
 
@@ -344,9 +346,10 @@ class ControlPanelWidget(QWidget):
 
     def cancel_youtube_download(self):
         """Cancel YouTube download."""
-        if self.youtube_download_thread and self.youtube_download_thread.isRunning():
+        thread = self.youtube_download_thread
+        if thread and (thread.isRunning() or ThreadManager.instance().is_queued(thread)):
             logger.info("User requested cancellation of YouTube download")
-            self.youtube_download_thread.cancel()
+            self.youtube_cancel_token.cancel()
             self.feedback_manager.show_status("Cancelling YouTube download...")
 
     def on_youtube_progress(self, message):
@@ -385,29 +388,38 @@ class ControlPanelWidget(QWidget):
                 delay=2000,
             )
 
-        # Check if transcoding is needed (e.g., not mp3/wav)
-        _, ext = os.path.splitext(filepath)
-        if ext.lower() not in [
-            ".mp3",
-            ".wav",
-        ]:  # Define supported directly usable formats
+        # Probe the file to decide whether transcoding is needed
+        info = probe_media(filepath)
+        if info is not None:
+            needs_transcoding = not is_directly_usable(filepath, info)
+        else:
+            # ffprobe unavailable: fall back to the extension check
+            _, ext = os.path.splitext(filepath)
+            needs_transcoding = ext.lower() not in [".mp3", ".wav"]
+
+        if needs_transcoding:
             logger.info(f"Transcoding needed for {filepath}")
-            # Quick UI-level check for mute video to provide instant feedback
-            try:
-                # Lazy import moviepy only when needed for video
-                from moviepy.editor import VideoFileClip
-                with VideoFileClip(filepath) as test_clip:
-                    if test_clip.audio is None:
-                        self.on_error(
-                            "The selected video file contains no audio track."
-                        )
-                        return
-            except ImportError:
-                logger.warning("MoviePy not available - skipping audio track check")
-                # Continue without checking - let transcoding thread handle it
-            except Exception as e:
-                self.on_error(f"Error analyzing video file: {e}")
+            if info is not None and not info.has_audio:
+                self.on_error("The selected file contains no audio track.")
                 return
+            if info is None:
+                # Quick UI-level check for mute video to provide instant feedback
+                try:
+                    # Lazy import moviepy only when needed for video
+                    from moviepy.editor import VideoFileClip
+                    with VideoFileClip(filepath) as test_clip:
+                        if test_clip.audio is None:
+                            self.on_error(
+                                "The selected video file contains no audio track."
+                            )
+                            return
+                except ImportError:
+                    logger.warning(
+                        "MoviePy not available - skipping audio track check")
+                    # Continue without checking - let transcoding thread handle it
+                except Exception as e:
+                    self.on_error(f"Error analyzing video file: {e}")
+                    return
             # Setup feedback for transcoding
             ui_elements = self.get_transcoding_ui_elements()
             self.feedback_manager.set_ui_busy(True, ui_elements)
@@ -421,7 +433,7 @@ class ControlPanelWidget(QWidget):
                 self.transcoding_progress_id,
                 "Audio Transcoding",
                 f"Converting file: {os.path.basename(filepath)}",
-                maximum=0,  # Indeterminate for now
+                maximum=100,
                 cancelable=True,
                 cancel_callback=lambda: self.cancel_transcoding(),
             )
@@ -442,9 +454,10 @@ class ControlPanelWidget(QWidget):
                     self.on_transcoding_complete)
                 self.transcoding_thread.error.connect(self.on_error)
 
-                # Register thread with ThreadManager
-                ThreadManager.instance().register_thread(self.transcoding_thread)
-                self.transcoding_thread.start()
+                # Queue for a CPU slot; starts at once if one is free
+                self.transcoding_cancel_token = ThreadManager.instance().submit(
+                    self.transcoding_thread, pool=POOL_CPU
+                )
             except Exception as e:
                 self.on_error(f"Failed to start transcoding: {e}")
         else:
@@ -473,9 +486,10 @@ class ControlPanelWidget(QWidget):
 
     def cancel_transcoding(self):
         """Cancel transcoding."""
-        if self.transcoding_thread and self.transcoding_thread.isRunning():
+        thread = self.transcoding_thread
+        if thread and (thread.isRunning() or ThreadManager.instance().is_queued(thread)):
             logger.info("User requested cancellation of transcoding")
-            self.transcoding_thread.cancel()  # Call the thread's cancel method
+            self.transcoding_cancel_token.cancel()  # Dequeues or cancels the thread
             self.feedback_manager.show_status("Cancelling transcoding...")
 
     def on_transcoding_progress(self, message):
@@ -499,6 +513,12 @@ class ControlPanelWidget(QWidget):
                             break
                 except (ValueError, IndexError):
                     pass
+            elif message.endswith("%"):
+                # ffmpeg progress, e.g. "Transcoding audio... 42%"
+                try:
+                    progress_value = int(message.rsplit(" ", 1)[-1].rstrip("%"))
+                except ValueError:
+                    pass
 
             self.feedback_manager.update_progress(
                 self.transcoding_progress_id, progress_value, message
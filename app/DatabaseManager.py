@@ -182,6 +182,7 @@ from app.db_utils import (
     get_all_recordings,
     get_recording_by_id,
     create_recording,
+    create_recordings,
     update_recording,
     delete_recording,
     search_recordings,
@@ -197,6 +198,7 @@ class DatabaseWorker(QThread):
     """Thread for DB operations."""
 
     operation_complete = pyqtSignal(object, object)  # op_id, result
+    operation_failed = pyqtSignal(object, str)  # op_id, error_message
     error_occurred = pyqtSignal(str, str)  # operation_name, error_message
     dataChanged = (
         pyqtSignal()
@@ -332,7 +334,7 @@ class DatabaseWorker(QThread):
 
                     # Log the operation being processed
                     logger.debug(
-                        f"Processing database operation: {op_type} (id: {op_id})"
+                        "Processing database operation: %s (id: %s)", op_type, op_id
                     )
 
                     try:
@@ -365,6 +367,7 @@ class DatabaseWorker(QThread):
                             "execute_query",
                             "create_table",
                             "create_recording",
+                            "create_recordings",
                             "update_recording",
                             "delete_recording",
                         )
@@ -394,7 +397,7 @@ class DatabaseWorker(QThread):
                             if is_modifying_query:
                                 data_modified = True
                                 logger.debug(
-                                    f"Modifying query detected: {query_lower[:100]}"
+                                    "Modifying query detected: %.100s", query_lower
                                 )
 
                                 # More specific logging about what's being modified
@@ -488,7 +491,7 @@ class DatabaseWorker(QThread):
                                         self.conn, op_args[0])
                                     data_modified = True
                                     logger.info(
-                                        f"Recording created with ID: {result}")
+                                        "Recording created with ID: %s", result)
                             except DuplicatePathError as dupe_error:
                                 # Special handling for duplicate path errors (don't log as error)
                                 self._log_error(
@@ -519,6 +522,28 @@ class DatabaseWorker(QThread):
                                         f"Failed to create recording: {create_error}"
                                     )
 
+                        elif op_type == "create_recordings":
+                            # Validate arguments
+                            if not op_args or len(op_args) < 1:
+                                raise ValueError(
+                                    "Missing recordings data for create_recordings operation"
+                                )
+
+                            try:
+                                result = create_recordings(
+                                    self.conn, op_args[0])
+                                data_modified = bool(result[0])
+                            except Exception as create_error:
+                                self._log_error(
+                                    "Error creating recordings",
+                                    create_error,
+                                    op_type,
+                                    emit_signal=False,
+                                )
+                                raise RuntimeError(
+                                    f"Failed to create recordings: {create_error}"
+                                )
+
                         elif op_type == "get_all_recordings":
                             try:
                                 result = get_all_recordings(self.conn)
@@ -567,7 +592,7 @@ class DatabaseWorker(QThread):
                                         self.conn, op_args[0], **op_kwargs)
                                     data_modified = True
                                     logger.info(
-                                        f"Recording updated with ID: {op_args[0]}"
+                                        "Recording updated with ID: %s", op_args[0]
                                     )
                             except Exception as update_error:
                                 self._log_error(
@@ -592,7 +617,7 @@ class DatabaseWorker(QThread):
                                     delete_recording(self.conn, op_args[0])
                                     data_modified = True
                                     logger.info(
-                                        f"Recording deleted with ID: {op_args[0]}"
+                                        "Recording deleted with ID: %s", op_args[0]
                                     )
                             except Exception as delete_error:
                                 self._log_error(
@@ -650,18 +675,22 @@ class DatabaseWorker(QThread):
                         )
                         # Explicitly set data_modified to False to be safe
                         data_modified = False
+                        self.operation_failed.emit(op_id, redact(str(e)))
                     except ValueError as e:
                         # Input validation errors
                         self._log_error("Validation error", e,
                                         op_type, level="warning")
+                        self.operation_failed.emit(op_id, redact(str(e)))
                     except RuntimeError as e:
                         # Operation execution errors
                         self._log_error("Runtime error", e, op_type)
+                        self.operation_failed.emit(op_id, redact(str(e)))
                     except Exception as e:
                         # Catch all other exceptions
                         self._log_error(
                             "Unexpected database operation error", e, op_type
                         )
+                        self.operation_failed.emit(op_id, redact(str(e)))
                     finally:
                         # Always mark the task as done, regardless of success or failure
                         if operation is not None:
@@ -816,6 +845,44 @@ class DatabaseManager(QObject):
         self.worker.add_operation(
             "create_recording", operation_id, [recording_data])
 
+    def create_recordings(self, recordings_data, callback=None):
+        """
+        Create many recordings in a single transaction.
+
+        Args:
+            recordings_data: List of recording_data tuples (see create_recording)
+            callback: Optional function called with (new_ids, duplicate_paths)
+        """
+        operation_id = f"create_recordings_{id(recordings_data)}"
+        if callback and callable(callback):
+
+            def _finalise():
+                try:
+                    self.worker.operation_complete.disconnect(handler)
+                except TypeError:
+                    pass
+                try:
+                    self.worker.error_occurred.disconnect(error_handler)
+                except TypeError:
+                    pass
+
+            def handler(op_id, _result):
+                if op_id == operation_id:
+                    _finalise()
+                    new_ids, duplicates = _result
+                    callback(new_ids, duplicates)
+
+            def error_handler(op_name, msg):
+                if op_name == "create_recordings":
+                    _finalise()
+
+            self.worker.operation_complete.connect(handler)
+            self.worker.error_occurred.connect(error_handler)
+
+        # Enqueue after connect
+        self.worker.add_operation(
+            "create_recordings", operation_id, [list(recordings_data)])
+
     def _on_worker_operation_complete(self, op_id, result):
         """Deliver create_recording callbacks on the main thread.
 
@@ -886,13 +953,15 @@ class DatabaseManager(QObject):
         self.worker.add_operation(
             "get_recording_by_id", operation_id, [recording_id])
 
-    def update_recording(self, recording_id, callback=None, **kwargs):
+    def update_recording(self, recording_id, callback=None, error_callback=None, **kwargs):
         """
         Update a recording in the database.
 
         Args:
             recording_id: ID of the recording to update
             callback: Optional function to call when operation completes
+            error_callback: Optional function called with the error message
+                if this update fails
             **kwargs: Fields to update and their values
         """
         operation_id = (
@@ -900,30 +969,41 @@ class DatabaseManager(QObject):
             if callback
             else f"update_recording_{recording_id}_no_callback"
         )
-        if callback and callable(callback):
+        if error_callback is not None:
+            operation_id += f"_error_{id(error_callback)}"
+        if (callback and callable(callback)) or error_callback is not None:
 
             def _finalise():
-                try:
-                    self.worker.operation_complete.disconnect(handler)
-                except TypeError:
-                    pass
-                try:
-                    self.worker.error_occurred.disconnect(error_handler)
-                except TypeError:
-                    pass
+                for signal, slot in (
+                    (self.worker.operation_complete, handler),
+                    (self.worker.error_occurred, error_handler),
+                    (self.worker.operation_failed, failure_handler),
+                ):
+                    try:
+                        signal.disconnect(slot)
+                    except TypeError:
+                        pass
 
             def handler(op_id, _result):
                 expected_prefix = f"update_recording_{recording_id}_"
                 if isinstance(op_id, str) and op_id.startswith(expected_prefix):
-                    callback()
+                    if callback:
+                        callback()
                     _finalise()
 
             def error_handler(op_name, msg):
                 if op_name == "update_recording":
                     _finalise()
 
+            def failure_handler(op_id, msg):
+                if op_id == operation_id:
+                    _finalise()
+                    if error_callback is not None:
+                        error_callback(msg)
+
             self.worker.operation_complete.connect(handler)
             self.worker.error_occurred.connect(error_handler)
+            self.worker.operation_failed.connect(failure_handler)
 
         # Enqueue after connect
         self.worker.add_operation(
@@ -15,6 +15,7 @@ import logging
 from app.path_utils import resource_path
 
 from app.constants import get_recordings_dir
+from app.file_utils import link_or_copy
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -283,17 +284,17 @@ class FileDropWidget(QWidget):
                 )  # Only show for operations taking > 500ms
                 progress.setValue(0)
 
-                # Since shutil.copy2 doesn't report progress, we'll just update in chunks
+                # Since copying doesn't report progress, we'll just update in chunks
                 progress.setValue(25)
                 QApplication.processEvents()
 
-                shutil.copy2(file_path, new_path)
+                link_or_copy(file_path, new_path)
 
                 progress.setValue(100)
                 QApplication.processEvents()
             else:
                 # For smaller files, just copy without progress dialog
-                shutil.copy2(file_path, new_path)
+                link_or_copy(file_path, new_path)
 
             # Emit signal with the new path
             logging.info(f"File processed successfully: {new_path}")
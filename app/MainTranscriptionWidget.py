@@ -10,7 +10,7 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QLineEdit,
 )
-from PyQt6.QtGui import QIcon
+from PyQt6.QtGui import QIcon, QTextCursor
 from PyQt6.QtCore import pyqtSignal, QSize, Qt, QTimer
 
 from app.models.recording import Recording
@@ -166,6 +166,7 @@ class MainTranscriptionWidget(ResponsiveWidget):
         self.gpt_controller.gpt_process_completed.connect(
             self.gpt_process_completed)
         self.gpt_controller.status_update.connect(self.status_update)
+        self.gpt_controller.gpt_partial_text.connect(self.on_gpt_partial_text)
         self.gpt_controller.recording_status_updated.connect(
             self.recording_status_updated
         )
@@ -729,6 +730,16 @@ class MainTranscriptionWidget(ResponsiveWidget):
             self.gpt_progress_id, 0, message  # Still indeterminate
         )
 
+    def on_gpt_partial_text(self, thread_key, text):
+        """Show streamed GPT output in the editor while the request runs."""
+        if thread_key == "smart_format":
+            return  # Partial HTML renders poorly; the final result replaces it
+        if self.view_mode is not ViewMode.PROCESSED:
+            self.mode_switch.setValue(1)  # 1 = PROCESSED
+            self.view_mode = ViewMode.PROCESSED
+        self.transcript_text.editor.setPlainText(text)
+        self.transcript_text.editor.moveCursor(QTextCursor.MoveOperation.End)
+
     def on_gpt4_processing_completed(self, processed_text):
         if not self.current_recording_data:
             return  # No recording selected
@@ -823,6 +834,13 @@ class MainTranscriptionWidget(ResponsiveWidget):
 
         self.status_update.emit("Ready")
 
+    @staticmethod
+    def _previous_formatted_html(recording_data, formatted_field):
+        """Return the stored smart-format HTML, or None if never formatted."""
+        if not recording_data:
+            return None
+        return recording_data.get(formatted_field) or None
+
     def start_smart_format_processing(self, text_to_format):
         """Apply smart formatting to the current text using GPT."""
         if not text_to_format.strip():
@@ -865,8 +883,17 @@ class MainTranscriptionWidget(ResponsiveWidget):
             self.smart_format_guard.__enter__()
             return guard
 
+        formatted_field = (
+            "processed_text_formatted"
+            if self.view_mode is ViewMode.PROCESSED
+            else "raw_transcript_formatted"
+        )
+        # Last formatted version lets the controller reformat only changes
+        previous_html = self._previous_formatted_html(
+            self.current_recording_data, formatted_field)
+
         # Define completion callback
-        def on_completion(formatted_text, is_html):
+        def on_completion(formatted_text, is_html=True):
             # Update editor with formatted text
             if is_html:
                 self.transcript_text.editor.setHtml(formatted_text)
@@ -881,12 +908,8 @@ class MainTranscriptionWidget(ResponsiveWidget):
             # Update database if current recording exists
             if self.current_recording_data:
                 recording_id = self.current_recording_data["id"]
-                field = (
-                    "processed_text_formatted"
-                    if self.view_mode is ViewMode.PROCESSED
-                    else "raw_transcript_formatted"
-                )
-                update_data = {field: formatted_text if is_html else None}
+                update_data = {
+                    formatted_field: formatted_text if is_html else None}
 
                 def on_update_complete():
                     self.current_recording_data.update(update_data)
@@ -898,10 +921,11 @@ class MainTranscriptionWidget(ResponsiveWidget):
 
         # Start formatting with controller
         success = self.gpt_controller.smart_format(
-            text_to_format=text_to_format,
+            text=text_to_format,
             config=self.config_manager.get_all(),
             busy_guard_callback=create_busy_guard,
             completion_callback=on_completion,
+            previous_html=previous_html,
         )
 
         # Handle failure
@@ -13,6 +13,7 @@ from PyQt6.QtWidgets import (
     QFileDialog,
     QToolBar,
     QStatusBar,
+    QInputDialog,
 )
 from PyQt6.QtGui import QIcon, QFont, QAction
 from app.RecordingListItem import RecordingListItem
@@ -22,6 +23,11 @@ from app.ui_utils.icon_utils import load_icon
 # Use ui_utils for messages
 from app.ui_utils import show_error_message, show_info_message, show_confirmation_dialog
 from app.DatabaseManager import DatabaseManager
+from app.ThreadManager import ThreadManager
+from app.controllers.batch_controller import BatchController
+from app.models.recording import Recording
+from app.utils import ConfigManager, PromptManager
+from app.threads.BulkImportThread import BulkImportThread
 from app.ResponsiveUI import ResponsiveWidget, ResponsiveSizePolicy
 from app.UnifiedFolderTreeView import UnifiedFolderTreeView
 
@@ -201,6 +207,18 @@ class RecentRecordingsWidget(ResponsiveWidget):
         # Batch processing (Keep worker reference)
         self.batch_worker = None
         self.progress_dialog = None
+        self.import_thread = None
+        self.import_progress_dialog = None
+
+        # GPT batch jobs (OpenAI Batch API); resume any left from last session
+        self.batch_controller = BatchController(self.db_manager, parent=self)
+        self.batch_controller.status_update.connect(self.show_status_message)
+        self.batch_controller.recording_status_updated.connect(
+            self.update_recording_status
+        )
+        QTimer.singleShot(
+            0, lambda: self.batch_controller.resume(ConfigManager.instance().get_all())
+        )
 
         # Load initial data
         self.load_recordings()
@@ -271,99 +289,87 @@ class RecentRecordingsWidget(ResponsiveWidget):
         if not selected_files:
             return
 
-        imported_count = 0
-        error_count = 0
-        # TODO: Add progress dialog for large imports
-        self.show_status_message(f"Importing {len(selected_files)} files...")
-
-        for file_path in selected_files:
-            try:
-                # Ensure the recordings directory exists in the user data location
-                from app.constants import get_recordings_dir
-                recordings_dir = get_recordings_dir()
-                os.makedirs(recordings_dir, exist_ok=True)
-
-                # Generate a unique destination path
-                dest_filename = os.path.basename(file_path)
-                name, ext = os.path.splitext(dest_filename)
-                counter = 1
-                dest_path = os.path.join(recordings_dir, dest_filename)
-                while os.path.exists(dest_path):
-                    dest_path = os.path.join(
-                        recordings_dir, f"{name}_{counter}{ext}")
-                    counter += 1
-
-                # Copy the file
-                import shutil
-
-                shutil.copy2(file_path, dest_path)
-                logger.info(f"Copied imported file to {dest_path}")
-
-                # Add the copied file to the database via the io_complete handler
-                # This assumes MainTranscriptionWidget is listening and will add it.
-                # A more direct way would be better.
-                # self.parent().on_new_file(dest_path) # Assuming parent is MainWindow
-                self.add_imported_file_to_db(dest_path)  # Add directly here
-
-                imported_count += 1
-            except Exception as e:
-                logger.error(
-                    f"Error importing {file_path}: {e}", exc_info=True)
-                error_count += 1
-                show_error_message(
-                    self,
-                    "Import Error",
-                    f"Failed to import {os.path.basename(file_path)}: {e}",
-                )
-
-        # Update status after import loop
-        if error_count == 0:
-            self.show_status_message(
-                f"Import complete: {imported_count} files added.", 5000
-            )
-        else:
-            self.show_status_message(
-                f"Import complete: {imported_count} added, {error_count} failed.", 5000
+        if self.import_thread and self.import_thread.isRunning():
+            show_info_message(
+                self, "Import In Progress", "Please wait for the current import to finish."
             )
+            return
 
-        self.refresh_recordings()  # Refresh list after import
-
-    def add_imported_file_to_db(self, file_path):
-        """Adds an imported file record to the database."""
-        try:
-            filename = os.path.basename(file_path)
-            date_created = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            # Calculate duration (potential performance hit for many files)
-            from app.file_utils import calculate_duration
-
-            # Returns "HH:MM:SS" or "MM:SS"
-            duration = calculate_duration(file_path)
-
-            recording_data = (filename, file_path,
-                              date_created, duration, "", "")
+        self.show_status_message(f"Importing {len(selected_files)} files...")
 
-            # Define callback (optional, can just refresh later)
-            def on_import_added(recording_id):
-                if recording_id:
-                    logger.info(
-                        f"Imported file '{filename}' added to DB with ID {recording_id}"
-                    )
-                else:
-                    logger.error(
-                        f"Failed to add imported file '{filename}' to DB")
+        self.import_progress_dialog = QProgressDialog(
+            f"Importing {len(selected_files)} files...",
+            "Cancel",
+            0,
+            len(selected_files),
+            self,
+        )
+        self.import_progress_dialog.setWindowTitle("Import Recordings")
+        self.import_progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self.import_progress_dialog.setAutoClose(False)
+        self.import_progress_dialog.setMinimumDuration(500)
+
+        # Copy/probe/transcode in parallel, then insert all rows in one batch
+        self.import_thread = BulkImportThread(selected_files)
+        self.import_progress_dialog.canceled.connect(self.import_thread.cancel)
+        self.import_thread.file_progress.connect(self.update_import_progress)
+        self.import_thread.error.connect(
+            lambda message: show_error_message(self, "Import Error", message)
+        )
+        self.import_thread.completed.connect(self.on_import_files_ready)
+        ThreadManager.instance().register_thread(self.import_thread)
+        self.import_thread.start()
+
+    def update_import_progress(self, done, total):
+        if self.import_progress_dialog:
+            self.import_progress_dialog.setValue(done)
+            self.import_progress_dialog.setLabelText(
+                f"Imported {done} of {total} files...")
+
+    def on_import_files_ready(self, records, failures):
+        """Insert imported files in one batch and report the outcome."""
+        if self.import_progress_dialog:
+            self.import_progress_dialog.close()
+            self.import_progress_dialog = None
+        self.import_thread = None
+
+        def on_recordings_created(new_ids, duplicates):
+            added = len(new_ids)
+            failed = len(failures)
+            if duplicates:
+                logger.warning(
+                    f"Skipped {len(duplicates)} imported files already in the database"
+                )
+            if failed == 0 and not duplicates:
+                self.show_status_message(
+                    f"Import complete: {added} files added.", 5000
+                )
+            else:
+                self.show_status_message(
+                    f"Import complete: {added} added, {failed} failed, "
+                    f"{len(duplicates)} duplicates skipped.",
+                    5000,
+                )
+            self.refresh_recordings()  # Refresh list after import
 
-            self.db_manager.create_recording(recording_data, on_import_added)
-        except Exception as e:
-            logger.error(
-                f"Error preparing imported file '{file_path}' for DB: {e}",
-                exc_info=True,
+        if failures:
+            # One aggregated dialog instead of one per failed file
+            details = "\n".join(
+                f"{os.path.basename(path)}: {error}" for path, error in failures[:20]
             )
+            if len(failures) > 20:
+                details += f"\n...and {len(failures) - 20} more"
             show_error_message(
                 self,
-                "Import DB Error",
-                f"Could not add '{os.path.basename(file_path)}' to database: {e}",
+                "Import Error",
+                f"Failed to import {len(failures)} file(s):\n{details}",
             )
 
+        if records:
+            self.db_manager.create_recordings(records, on_recordings_created)
+        else:
+            on_recordings_created([], [])
+
     # --- Signal Handlers ---
     def on_folder_selected(self, folder_id, folder_name):
         self.current_folder_id = folder_id
@@ -672,6 +678,8 @@ class RecentRecordingsWidget(ResponsiveWidget):
                             "filename": widget.get_filename(),
                             "file_path": widget.get_filepath(),
                             "raw_transcript": widget.get_raw_transcript(),  # Needed for GPT processing
+                            "date_created": widget.date_created,
+                            "duration": widget.duration,
                         }
                     )
 
@@ -681,6 +689,10 @@ class RecentRecordingsWidget(ResponsiveWidget):
             )
             return
 
+        if process_type == "process":
+            self.submit_gpt_batch(selected_data)
+            return
+
         action_text = (
             "Transcribe" if process_type == "transcribe" else "Process with GPT"
         )
@@ -707,6 +719,59 @@ class RecentRecordingsWidget(ResponsiveWidget):
         self.batch_worker.start()
         self.progress_dialog.show()
 
+    def submit_gpt_batch(self, selected_data):
+        """Queue selected recordings for offline GPT processing with a preset prompt.
+
+        Results arrive through the OpenAI Batch API, typically within hours,
+        and are saved to each recording as they come in.
+        """
+        prompts = PromptManager.instance().get_prompts()
+        if not prompts:
+            show_info_message(self, "No Prompts", "Add a preset prompt first.")
+            return
+        prompt_name, ok = QInputDialog.getItem(
+            self,
+            "Batch Process with GPT",
+            f"Prompt for {len(selected_data)} recording(s) "
+            "(results arrive within 24 hours):",
+            sorted(prompts),
+            0,
+            False,
+        )
+        if not ok:
+            return
+
+        recordings = [
+            Recording(
+                id=data["id"],
+                filename=data["filename"],
+                file_path=data["file_path"],
+                date_created=data["date_created"],
+                duration=data["duration"],
+                raw_transcript=data["raw_transcript"],
+            )
+            for data in selected_data
+        ]
+        job_id = self.batch_controller.submit(
+            recordings,
+            prompts[prompt_name]["text"],
+            ConfigManager.instance().get_all(),
+        )
+        if job_id:
+            show_info_message(
+                self,
+                "Batch Queued",
+                "Recordings were queued for batch processing. Results are "
+                "saved automatically, even if you restart the app.",
+            )
+        else:
+            show_error_message(
+                self,
+                "Batch Error",
+                "Could not queue the batch. Check that the recordings are "
+                "transcribed and that an OpenAI API key is set.",
+            )
+
     def cancel_batch_process(self):
         if self.batch_worker and self.batch_worker.isRunning():
             self.batch_worker.cancel()
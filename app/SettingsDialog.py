@@ -228,6 +228,26 @@ class SettingsDialog(QDialog):
         api_group_layout.addLayout(openai_layout)
         api_group_layout.addSpacing(10)
 
+        # Key for the OpenAI-compatible server in gpt_api_base_url, if any;
+        # the OpenAI key is never sent there
+        endpoint_layout = QVBoxLayout()
+        self.endpoint_api_key_label = QLabel("Custom Endpoint API Key:", self)
+        self.endpoint_api_key_edit = QLineEdit(self)
+        self.endpoint_api_key_edit.setEchoMode(QLineEdit.EchoMode.Password)
+        self.endpoint_api_key_edit.setContextMenuPolicy(
+            Qt.ContextMenuPolicy.NoContextMenu
+        )
+        self.endpoint_api_key_edit.setDragEnabled(False)
+        self.endpoint_api_key_info = QLabel(self)
+        self.endpoint_api_key_info.setWordWrap(True)
+        self.endpoint_api_key_info.setStyleSheet("color: gray; font-size: 10pt;")
+        endpoint_layout.addWidget(self.endpoint_api_key_label)
+        endpoint_layout.addWidget(self.endpoint_api_key_edit)
+        endpoint_layout.addWidget(self.endpoint_api_key_info)
+        api_group_layout.addLayout(endpoint_layout)
+        api_group_layout.addSpacing(10)
+        self._endpoint_url = ""
+
         # HF token entry
         hf_layout = QVBoxLayout()
         self.hf_api_key_label = QLabel("HuggingFace Access Token:", self)
@@ -730,6 +750,7 @@ class SettingsDialog(QDialog):
             openai_key = get_api_key("OPENAI_API_KEY") or ""
             self.hf_api_key_edit.setText(hf_key)
             self.openai_api_key_edit.setText(openai_key)
+            self._load_endpoint_api_key(config.get("gpt_api_base_url") or "")
 
             # Attempt to fetch models if API key is present
             if openai_key:
@@ -741,6 +762,30 @@ class SettingsDialog(QDialog):
                 self, "Configuration Error", f"Failed to load settings: {e}"
             )
 
+    def _load_endpoint_api_key(self, base_url: str):
+        """Show the key field for a non-OpenAI gpt_api_base_url, if set."""
+        from app.services.llm_endpoints import (
+            endpoint_api_key,
+            is_openai,
+            normalize_base_url,
+        )
+
+        custom = bool(base_url) and not is_openai(base_url)
+        self._endpoint_url = normalize_base_url(base_url) if custom else ""
+        self.endpoint_api_key_edit.setEnabled(custom)
+        self.endpoint_api_key_edit.setText(
+            (endpoint_api_key(base_url) or "") if custom else "")
+        if custom:
+            self.endpoint_api_key_info.setText(
+                f"Sent only to {self._endpoint_url}. Leave empty if the server "
+                "needs no key."
+            )
+        else:
+            self.endpoint_api_key_info.setText(
+                "Used when gpt_api_base_url points to a self-hosted or "
+                "third-party server. Your OpenAI key is never sent there."
+            )
+
     def save_settings(self):
         """Save settings."""
         # --- Save API Keys to Keyring ---
@@ -757,7 +802,17 @@ class SettingsDialog(QDialog):
             # Save OpenAI API key
             openai_success = set_api_key("OPENAI_API_KEY", openai_api_key)
 
-            if not (hf_success and openai_success):
+            # Save the custom endpoint's own key, if one is configured
+            endpoint_success = True
+            if self.endpoint_api_key_edit.isEnabled():
+                from app.services.llm_endpoints import endpoint_key_name
+
+                endpoint_success = set_api_key(
+                    endpoint_key_name(self._endpoint_url),
+                    self.endpoint_api_key_edit.text().strip(),
+                )
+
+            if not (hf_success and openai_success and endpoint_success):
                 from app.ui_utils import safe_error
 
                 safe_error(
@@ -853,6 +908,7 @@ class SettingsDialog(QDialog):
             # Keep the current API keys from the UI fields
             hf_key = self.hf_api_key_edit.text()
             openai_key = self.openai_api_key_edit.text()
+            endpoint_key = self.endpoint_api_key_edit.text()
 
             # Reset UI fields to default values from constants
             from app.constants import DEFAULT_CONFIG
@@ -882,6 +938,7 @@ class SettingsDialog(QDialog):
             # Restore API key UI fields (they weren't saved yet)
             self.hf_api_key_edit.setText(hf_key)
             self.openai_api_key_edit.setText(openai_key)
+            self.endpoint_api_key_edit.setText(endpoint_key)
 
             show_info_message(
                 self,
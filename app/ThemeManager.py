@@ -1,14 +1,39 @@
+import hashlib
 import json
 import os
 import logging
+import re
+import tempfile
 from PyQt6.QtGui import QColor, QPalette
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import pyqtSlot, QObject
+from app.constants import get_user_data_dir
 from app.path_utils import resource_path
 from app.utils import ConfigManager
 
 logger = logging.getLogger("transcribrr")
 
+STYLESHEET_CACHE_DIR = "stylesheet_cache"
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_PUNCTUATION_SPACE_RE = re.compile(r"\s*([{};])\s*")
+
+
+def _minify_stylesheet(stylesheet):
+    """Strip comments and redundant whitespace so Qt has less to parse."""
+    stylesheet = _COMMENT_RE.sub("", stylesheet)
+    stylesheet = " ".join(stylesheet.split())
+    return _PUNCTUATION_SPACE_RE.sub(r"\1", stylesheet)
+
+
+def _template_hash(func):
+    """Hash a stylesheet template's code constants (its literal CSS text).
+
+    Any edit to the template changes the hash, so stylesheets cached on
+    disk by an older version of the app are never reused.
+    """
+    return hashlib.sha1(repr(func.__code__.co_consts).encode("utf-8")).hexdigest()[:12]
+
 
 class ThemeManager(QObject):
     """Manage app themes."""
@@ -102,6 +127,10 @@ class ThemeManager(QObject):
         self.current_variables = {}
         self.current_stylesheet = ""
 
+        # Compiled stylesheets keyed by a hash of template, theme and variables
+        self._stylesheet_cache = {}
+        self._template_version = _template_hash(type(self)._generate_stylesheet)
+
         # Initialize ConfigManager and connect signal handler
         self.config_manager = ConfigManager.instance()
         self.config_manager.config_updated.connect(self._handle_config_update)
@@ -176,12 +205,102 @@ class ThemeManager(QObject):
         else:
             self.current_variables.update(self.light_variables)
 
-        # Generate stylesheet
-        self.current_stylesheet = self._generate_stylesheet()
+        # Compile (or reuse) the stylesheet and apply it
+        self.current_stylesheet = self._compiled_stylesheet()
+        self._apply_stylesheet(self.current_stylesheet)
+
+    def _stylesheet_key(self):
+        """Return the cache key for the current theme and variable set."""
+        payload = json.dumps(
+            {
+                "template": self._template_version,
+                "theme": self.current_theme,
+                "variables": self.current_variables,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _stylesheet_cache_path(self, key):
+        return os.path.join(
+            get_user_data_dir(),
+            STYLESHEET_CACHE_DIR,
+            f"{self.current_theme}-{self._template_version}-{key}.qss",
+        )
+
+    def _compiled_stylesheet(self):
+        """Return the minified stylesheet, compiling it at most once per key.
+
+        Lookups go memory, then disk, then generation; a freshly compiled
+        stylesheet is written to disk for the next launch.
+        """
+        key = self._stylesheet_key()
+        stylesheet = self._stylesheet_cache.get(key)
+        if stylesheet is not None:
+            return stylesheet
+
+        path = self._stylesheet_cache_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stylesheet = f.read()
+        except OSError:
+            stylesheet = None
+
+        if not stylesheet:
+            stylesheet = _minify_stylesheet(self._generate_stylesheet())
+            self._write_stylesheet_cache(path, stylesheet)
+
+        self._stylesheet_cache[key] = stylesheet
+        return stylesheet
+
+    def _write_stylesheet_cache(self, path, stylesheet):
+        """Atomically persist a compiled stylesheet and prune stale ones.
 
-        # Apply to application
-        if QApplication.instance():
-            QApplication.instance().setStyleSheet(self.current_stylesheet)
+        Entries for other variable sets are kept, so switching back and forth
+        reuses them; only those compiled from another template are removed.
+        """
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(stylesheet)
+                os.replace(tmp_path, path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+
+            # Compilations from another template version can't be used again
+            for name in os.listdir(directory):
+                stem, ext = os.path.splitext(name)
+                parts = stem.split("-")
+                if ext == ".qss" and (len(parts) != 3 or parts[1] != self._template_version):
+                    os.remove(os.path.join(directory, name))
+        except OSError as e:
+            logger.debug(f"Could not cache stylesheet at {path}: {e}")
+
+    def _apply_stylesheet(self, stylesheet):
+        """Apply stylesheet app-wide, repainting each visible window once.
+
+        Setting an identical stylesheet is skipped, since Qt would still
+        repolish every widget. Updates are suspended on visible top-level
+        windows while the style is swapped so each repaints a single time.
+        """
+        app = QApplication.instance()
+        if not app or app.styleSheet() == stylesheet:
+            return
+
+        windows = [
+            w for w in app.topLevelWidgets() if w.isVisible() and w.updatesEnabled()
+        ]
+        for window in windows:
+            window.setUpdatesEnabled(False)
+        try:
+            app.setStyleSheet(stylesheet)
+        finally:
+            for window in windows:
+                window.setUpdatesEnabled(True)
 
     def toggle_theme(self):
         """Toggle theme."""
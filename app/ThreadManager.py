@@ -1,13 +1,27 @@
 """Manage QThread lifecycle via singleton registry.
 
+Besides tracking threads for shutdown, ThreadManager schedules work:
+threads submitted with submit() wait in a per-pool priority queue and are
+started only when their pool (GPU, CPU-heavy or network work) has a free
+slot, so starting many jobs doesn't oversubscribe the machine. Within a
+priority, tasks with a deadline go first (earliest first), then the ones
+expected to be shortest.
+
 This module should be importable in environments without Qt installed
 (e.g., headless CI). We therefore attempt to import ``QThread`` from
 PyQt6 first, then fall back to PySide6, and finally to a minimal stub
 class so tests that mock thread objects can run without Qt.
 """
 
+import heapq
+import itertools
 import logging
-from typing import Dict, List, Optional
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
 
 # Try to import Qt's QThread, but gracefully fall back if unavailable.
 try:  # Prefer PyQt6 when available
@@ -21,6 +35,88 @@ except Exception:  # pragma: no cover - exercised in CI without Qt
 
 logger = logging.getLogger(__name__)
 
+# Worker pools by the resource they contend for
+POOL_GPU = "gpu"  # local model inference
+POOL_CPU = "cpu"  # transcoding and other CPU-heavy work
+POOL_NETWORK = "network"  # API requests and downloads
+
+DEFAULT_POOL_LIMITS = {
+    POOL_GPU: 1,
+    POOL_CPU: max(1, (os.cpu_count() or 2) // 2),
+    POOL_NETWORK: 4,
+}
+
+# Lower values start first; ties go to the earliest deadline, then the
+# lowest expected cost, then submission order
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+
+class CancellationToken:
+    """Cancels one submitted task, whether it is still queued or running."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Run callback on cancellation (immediately if already cancelled)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+
+@dataclass(order=True)
+class _Task:
+    priority: int
+    deadline: float
+    cost: float
+    sequence: int
+    thread: Any = field(compare=False)
+    pool: str = field(compare=False)
+    token: CancellationToken = field(compare=False)
+    submitted_at: float = field(compare=False)
+    started_at: Optional[float] = field(default=None, compare=False)
+
+
+@dataclass
+class _PoolStats:
+    submitted: int = 0
+    completed: int = 0
+    cancelled: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    started: int = 0
+    total_run: float = 0.0
+
+
+def _configured_limits() -> Dict[str, int]:
+    """Return pool limits from the thread_pool_limits setting, if any."""
+    try:
+        from app.utils import ConfigManager
+
+        limits = ConfigManager.instance().get("thread_pool_limits", {}) or {}
+        return {str(pool): max(1, int(limit)) for pool, limit in limits.items()}
+    except Exception as e:  # Qt unavailable or config not loaded
+        logger.debug(f"Using default thread pool limits: {e}")
+        return {}
+
 
 class ThreadManager:
     """Singleton for managing QThreads."""
@@ -49,8 +145,15 @@ class ThreadManager:
         cls._instance = ThreadManager()
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, pool_limits: Optional[Dict[str, int]] = None):
         self._active_threads: Dict[int, QThread] = {}
+        self._pool_limits = dict(DEFAULT_POOL_LIMITS)
+        self._pool_limits.update(pool_limits if pool_limits is not None else _configured_limits())
+        self._queues: Dict[str, List[_Task]] = {}
+        self._running: Dict[str, Dict[int, _Task]] = {}
+        self._stats: Dict[str, _PoolStats] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
         logger.debug("ThreadManager initialized")
 
     def register_thread(self, thread: QThread) -> None:
@@ -89,11 +192,166 @@ class ThreadManager:
                 f"Attempted to unregister non-registered thread: {thread.__class__.__name__} (id: {thread_id})"
             )
 
+    def submit(
+        self,
+        thread: QThread,
+        pool: str = POOL_CPU,
+        priority: int = PRIORITY_NORMAL,
+        *,
+        cost: float = 0.0,
+        deadline: Optional[float] = None,
+    ) -> CancellationToken:
+        """Register thread and start it once pool has a free slot.
+
+        cost is the expected runtime in seconds (shortest first among equal
+        priorities); deadline is a time.monotonic() value to start by,
+        which puts the task ahead of ones without a deadline.
+
+        Returns a token that cancels the task. A task cancelled while still
+        queued is started at once, outside the pool's limit, so its run()
+        takes the cancelled path and emits finished like any other thread.
+        """
+        token = CancellationToken()
+        task = _Task(
+            priority,
+            math.inf if deadline is None else deadline,
+            cost,
+            next(self._sequence),
+            thread,
+            pool,
+            token,
+            time.monotonic(),
+        )
+        self.register_thread(thread)
+        thread_id = id(thread)
+        thread.finished.connect(lambda: self._on_task_finished(pool, thread_id))
+
+        with self._lock:
+            heapq.heappush(self._queues.setdefault(pool, []), task)
+            self._stats.setdefault(pool, _PoolStats()).submitted += 1
+            depth = len(self._queues[pool])
+        logger.debug(
+            "Queued %s in %s pool (priority %d, depth %d)",
+            thread.__class__.__name__, pool, priority, depth,
+        )
+
+        token.add_callback(lambda: self._cancel_task(task))
+        self._dispatch(pool)
+        return token
+
+    def _dispatch(self, pool: str) -> None:
+        """Start queued tasks in pool while it has free slots."""
+        to_start = []
+        with self._lock:
+            queue = self._queues.get(pool, [])
+            running = self._running.setdefault(pool, {})
+            stats = self._stats.setdefault(pool, _PoolStats())
+            while queue and len(running) < self._pool_limits.get(pool, 1):
+                task = heapq.heappop(queue)
+                task.started_at = time.monotonic()
+                wait = task.started_at - task.submitted_at
+                stats.started += 1
+                stats.total_wait += wait
+                stats.max_wait = max(stats.max_wait, wait)
+                running[id(task.thread)] = task
+                to_start.append((task, wait))
+
+        for task, wait in to_start:
+            logger.debug(
+                "Starting %s in %s pool after %.0f ms in queue",
+                task.thread.__class__.__name__, pool, wait * 1000,
+            )
+            task.thread.start()
+
+    def _on_task_finished(self, pool: str, thread_id: int) -> None:
+        with self._lock:
+            task = self._running.get(pool, {}).pop(thread_id, None)
+            if task is None:
+                return  # Cancelled while queued; never held a slot
+            stats = self._stats[pool]
+            stats.completed += 1
+            stats.total_run += time.monotonic() - task.started_at
+        self._dispatch(pool)
+
+    def _cancel_task(self, task: _Task) -> None:
+        with self._lock:
+            queue = self._queues.get(task.pool, [])
+            queued = task in queue
+            if queued:
+                queue.remove(task)
+                heapq.heapify(queue)
+                self._stats[task.pool].cancelled += 1
+
+        if hasattr(task.thread, "cancel"):
+            task.thread.cancel()
+        if queued:
+            logger.debug(
+                "Cancelled queued %s in %s pool",
+                task.thread.__class__.__name__, task.pool,
+            )
+            task.started_at = time.monotonic()
+            task.thread.start()
+
+    def is_queued(self, thread: QThread) -> bool:
+        """Return whether thread was submitted and is waiting for a slot."""
+        with self._lock:
+            return any(
+                task.thread is thread
+                for queue in self._queues.values()
+                for task in queue
+            )
+
+    def set_pool_limit(self, pool: str, limit: int) -> None:
+        """Change how many tasks pool may run at once."""
+        with self._lock:
+            self._pool_limits[pool] = max(1, int(limit))
+        self._dispatch(pool)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Return concurrency, queue depth and latency figures per pool.
+
+        Waits are the time from submit() until a task started; run times
+        cover tasks that have finished.
+        """
+        now = time.monotonic()
+        result = {}
+        with self._lock:
+            for pool in sorted(set(self._pool_limits) | set(self._stats)):
+                stats = self._stats.get(pool, _PoolStats())
+                queue = self._queues.get(pool, [])
+                result[pool] = {
+                    "limit": self._pool_limits.get(pool, 1),
+                    "running": len(self._running.get(pool, {})),
+                    "queued": len(queue),
+                    "submitted": stats.submitted,
+                    "completed": stats.completed,
+                    "cancelled": stats.cancelled,
+                    "avg_wait_ms": (
+                        stats.total_wait / stats.started * 1000 if stats.started else 0.0
+                    ),
+                    "max_wait_ms": stats.max_wait * 1000,
+                    "oldest_queued_ms": (
+                        (now - min(t.submitted_at for t in queue)) * 1000 if queue else 0.0
+                    ),
+                    "avg_run_ms": (
+                        stats.total_run / stats.completed * 1000 if stats.completed else 0.0
+                    ),
+                }
+        return result
+
     def get_active_threads(self) -> List[QThread]:
         return list(self._active_threads.values())
 
     def cancel_all_threads(self, wait_timeout: int = 5000) -> None:
         """Cancel all active threads."""
+        # Queued tasks are dropped rather than started just to exit
+        with self._lock:
+            dropped = sum(len(queue) for queue in self._queues.values())
+            for queue in self._queues.values():
+                queue.clear()
+        if dropped:
+            logger.info(f"Dropped {dropped} queued tasks")
+
         threads = self.get_active_threads()
         thread_count = len(threads)
 
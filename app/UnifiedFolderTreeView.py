@@ -173,7 +173,7 @@ class UnifiedFolderTreeView(QTreeView):
         self._is_loading = True  # Flag to prevent signals during load
         self._load_token += 1  # Increment token to invalidate any pending callbacks
         current_token = self._load_token  # Store current token for callbacks
-        logger.debug(f"Using load token: {current_token}")
+        logger.debug("Using load token: %s", current_token)
 
         # Clean up existing widgets to prevent memory leaks
         self._cleanup_widgets()
@@ -181,7 +181,7 @@ class UnifiedFolderTreeView(QTreeView):
         # Clear existing data
         self.source_model.clear_model()
         logger.debug(
-            f"Cleared source model, entries before: {len(self.id_to_widget)}")
+            "Cleared source model, entries before: %s", len(self.id_to_widget))
         self.id_to_widget.clear()
         logger.debug("Cleared id_to_widget mapping")
 
@@ -191,7 +191,7 @@ class UnifiedFolderTreeView(QTreeView):
             logger.debug("No expanded folder IDs provided, using default [-1]")
         else:
             logger.debug(
-                f"Using provided expanded folder IDs: {expanded_folder_ids}")
+                "Using provided expanded folder IDs: %s", expanded_folder_ids)
 
         # Add root item for unorganized recordings
         root_folder = {
@@ -205,11 +205,11 @@ class UnifiedFolderTreeView(QTreeView):
 
         # Load root folders
         root_folders = self.folder_manager.get_all_root_folders()
-        logger.info(f"Found {len(root_folders)} root folders")
+        logger.info("Found %s root folders", len(root_folders))
 
         for folder in sorted(root_folders, key=lambda f: f["name"].lower()):
             logger.debug(
-                f"Processing root folder: {folder['name']} (ID: {folder['id']})"
+                "Processing root folder: %s (ID: %s)", folder['name'], folder['id']
             )
             folder_item = self.source_model.add_folder_item(folder, root_item)
 
@@ -218,14 +218,14 @@ class UnifiedFolderTreeView(QTreeView):
             is_expanded = folder["id"] in expanded_folder_ids
             self.setExpanded(folder_index, is_expanded)
             logger.debug(
-                f"Set expansion state for folder {folder['name']}: {is_expanded}"
+                "Set expansion state for folder %s: %s", folder['name'], is_expanded
             )
 
             # Recursively add child folders
             self._load_nested_folders(folder_item, folder, expanded_folder_ids)
 
             # Load recordings for this folder
-            logger.debug(f"Requesting recordings for folder ID {folder['id']}")
+            logger.debug("Requesting recordings for folder ID %s", folder['id'])
             self._load_recordings_for_folder(
                 folder["id"], folder_item, current_token)
 
@@ -241,7 +241,7 @@ class UnifiedFolderTreeView(QTreeView):
         # Restore selection if provided
         if select_item_id is not None and item_type is not None:
             logger.debug(
-                f"Attempting to restore selection: {item_type} with ID {select_item_id}"
+                "Attempting to restore selection: %s with ID %s", item_type, select_item_id
             )
             item = self.source_model.get_item_by_id(select_item_id, item_type)
             if item:
@@ -249,7 +249,7 @@ class UnifiedFolderTreeView(QTreeView):
                 self.setCurrentIndex(index)
                 self.scrollTo(index)
                 logger.debug(
-                    f"Restored selection to {item_type} {select_item_id}")
+                    "Restored selection to %s %s", item_type, select_item_id)
 
                 # Ensure parents are expanded
                 parent_index = index.parent()
@@ -263,10 +263,10 @@ class UnifiedFolderTreeView(QTreeView):
 
         # Check model content after loading
         logger.info(
-            f"Tree structure loaded with {self.source_model.rowCount()} top-level items"
+            "Tree structure loaded with %s top-level items", self.source_model.rowCount()
         )
         logger.info(
-            f"Widget map contains {len(self.id_to_widget)} recording widgets")
+            "Widget map contains %s recording widgets", len(self.id_to_widget))
 
         # Reset the loading flag
         self._is_loading = False
@@ -282,7 +282,7 @@ class UnifiedFolderTreeView(QTreeView):
 
     def _cleanup_widgets(self):
         """Clean up widget references to prevent memory leaks."""
-        logger.debug(f"Cleaning up {len(self.id_to_widget)} recording widgets")
+        logger.debug("Cleaning up %s recording widgets", len(self.id_to_widget))
         # Remove all indexed widgets from the view
         for rec_id, widget in self.id_to_widget.items():
             try:
@@ -308,19 +308,19 @@ class UnifiedFolderTreeView(QTreeView):
         """Recursively load nested folders."""
         if not parent_folder.get("children"):
             logger.debug(
-                f"No children for folder {parent_folder.get('name')} (ID: {parent_folder.get('id')})"
+                "No children for folder %s (ID: %s)", parent_folder.get('name'), parent_folder.get('id')
             )
             return
 
         logger.debug(
-            f"Loading {len(parent_folder['children'])} nested folders for parent {parent_folder.get('name')} (ID: {parent_folder.get('id')})"
+            "Loading %s nested folders for parent %s (ID: %s)", len(parent_folder['children']), parent_folder.get('name'), parent_folder.get('id')
         )
 
         for child_folder in sorted(
             parent_folder["children"], key=lambda f: f["name"].lower()
         ):
             logger.debug(
-                f"Processing child folder: {child_folder['name']} (ID: {child_folder['id']})"
+                "Processing child folder: %s (ID: %s)", child_folder['name'], child_folder['id']
             )
             child_item = self.source_model.add_folder_item(
                 child_folder, parent_item)
@@ -334,13 +334,13 @@ class UnifiedFolderTreeView(QTreeView):
             )
             self.setExpanded(child_index, is_expanded)
             logger.debug(
-                f"Set expansion state for folder {child_folder['name']}: {is_expanded}"
+                "Set expansion state for folder %s: %s", child_folder['name'], is_expanded
             )
 
             # Load recordings for this folder
             current_token = self._load_token  # Get current token for consistency
             logger.debug(
-                f"Requesting recordings for folder ID {child_folder['id']}")
+                "Requesting recordings for folder ID %s", child_folder['id'])
             self._load_recordings_for_folder(
                 child_folder["id"], child_item, current_token
             )
@@ -352,7 +352,7 @@ class UnifiedFolderTreeView(QTreeView):
     def _load_recordings_for_folder(self, folder_id, folder_item, current_token):
         """Load recordings for a specific folder."""
         logger.debug(
-            f"Loading recordings for folder ID {folder_id} with token {current_token}"
+            "Loading recordings for folder ID %s with token %s", folder_id, current_token
         )
 
         # Load recordings from database
@@ -370,10 +370,10 @@ class UnifiedFolderTreeView(QTreeView):
                             "Disconnected unassigned recordings callback")
                     except (TypeError, RuntimeError, AttributeError) as e:
                         # Ignore errors if already disconnected
-                        logger.debug(f"Could not disconnect callback: {e}")
+                        logger.debug("Could not disconnect callback: %s", e)
 
                 logger.info(
-                    f"Callback for unassigned recordings, success={success}, received {len(recordings) if recordings else 0} recordings"
+                    "Callback for unassigned recordings, success=%s, received %s recordings", success, len(recordings) if recordings else 0
                 )
 
                 if not success:
@@ -395,7 +395,7 @@ class UnifiedFolderTreeView(QTreeView):
                     return
 
                 logger.info(
-                    f"Processing {len(recordings)} unassigned recordings")
+                    "Processing %s unassigned recordings", len(recordings))
 
                 # Sort recordings by date (newest first)
                 try:
@@ -419,7 +419,7 @@ class UnifiedFolderTreeView(QTreeView):
                     # Check if already exists in the model (single source of truth)
                     if self.source_model.get_item_by_id(rec_id, "recording"):
                         logger.debug(
-                            f"Skipping recording ID {rec_id}, already exists in model"
+                            "Skipping recording ID %s, already exists in model", rec_id
                         )
                         skipped_count += 1
                         continue
@@ -457,7 +457,7 @@ class UnifiedFolderTreeView(QTreeView):
 
                     added_count += 1
                     logger.debug(
-                        f"Added unassigned recording ID {rec_id}: {rec[1]}")
+                        "Added unassigned recording ID %s: %s", rec_id, rec[1])
 
                 # Force layout update to accommodate widgets
                 # Schedule a delayed update to allow geometries to settle
@@ -465,7 +465,7 @@ class UnifiedFolderTreeView(QTreeView):
                 QTimer.singleShot(0, self.viewport().update)
 
                 logger.info(
-                    f"Added {added_count} unassigned recordings, skipped {skipped_count}"
+                    "Added %s unassigned recordings, skipped %s", added_count, skipped_count
                 )
                 _disconnect_callback()
 
@@ -485,13 +485,13 @@ class UnifiedFolderTreeView(QTreeView):
                             _add_folder_recordings
                         )
                         logger.debug(
-                            f"Disconnected callback for folder {folder_id}")
+                            "Disconnected callback for folder %s", folder_id)
                     except (TypeError, RuntimeError, AttributeError) as e:
                         # Ignore errors if already disconnected
-                        logger.debug(f"Could not disconnect callback: {e}")
+                        logger.debug("Could not disconnect callback: %s", e)
 
-                logger.info(
-                    f"Callback for folder {folder_id}, success={success}, received {len(recordings) if recordings else 0} recordings"
+                logger.debug(
+                    "Callback for folder %s, success=%s, received %s recordings", folder_id, success, len(recordings) if recordings else 0
                 )
 
                 if not success:
@@ -509,12 +509,12 @@ class UnifiedFolderTreeView(QTreeView):
                     return
 
                 if not recordings:
-                    logger.info(f"No recordings found in folder {folder_id}")
+                    logger.debug("No recordings found in folder %s", folder_id)
                     _disconnect_callback()
                     return
 
-                logger.info(
-                    f"Processing {len(recordings)} recordings for folder {folder_id}"
+                logger.debug(
+                    "Processing %s recordings for folder %s", len(recordings), folder_id
                 )
 
                 # Sort recordings by date (newest first)
@@ -540,7 +540,7 @@ class UnifiedFolderTreeView(QTreeView):
                     # Check if already exists in the model (single source of truth)
                     if self.source_model.get_item_by_id(rec_id, "recording"):
                         logger.debug(
-                            f"Skipping recording ID {rec_id} in folder {folder_id}, already exists in model"
+                            "Skipping recording ID %s in folder %s, already exists in model", rec_id, folder_id
                         )
                         skipped_count += 1
                         continue
@@ -578,7 +578,7 @@ class UnifiedFolderTreeView(QTreeView):
 
                     added_count += 1
                     logger.debug(
-                        f"Added recording ID {rec_id} to folder {folder_id}: {rec[1]}"
+                        "Added recording ID %s to folder %s: %s", rec_id, folder_id, rec[1]
                     )
 
                 # Force layout update to accommodate widgets
@@ -586,14 +586,14 @@ class UnifiedFolderTreeView(QTreeView):
                 QTimer.singleShot(0, self.updateGeometries)
                 QTimer.singleShot(0, self.viewport().update)
 
-                logger.info(
-                    f"Added {added_count} recordings to folder {folder_id}, skipped {skipped_count}"
+                logger.debug(
+                    "Added %s recordings to folder %s, skipped %s", added_count, folder_id, skipped_count
                 )
                 _disconnect_callback()
 
             # Get recordings for this folder
-            logger.info(
-                f"Requesting recordings for folder {folder_id} from folder manager"
+            logger.debug(
+                "Requesting recordings for folder %s from folder manager", folder_id
             )
             self.folder_manager.get_recordings_in_folder(
                 folder_id, _add_folder_recordings
@@ -20,7 +20,8 @@ import logging
 from collections import deque
 import tempfile
 import time
-# numpy imported lazily when needed for audio level calculation
+import math
+# numpy imported lazily by LevelMeter when recording starts
 from app.SVGToggleButton import SVGToggleButton
 from app.path_utils import resource_path
 from app.ui_utils.icon_utils import load_icon
@@ -33,6 +34,73 @@ from app.constants import get_recordings_dir
 logger = logging.getLogger("transcribrr")
 
 
+# Level meter tuning: the recording loop publishes at most this often, and
+# levels are mapped from dBFS onto the meter with this floor.
+LEVEL_UPDATE_INTERVAL = 1.0 / 15  # seconds
+METER_FLOOR_DB = -60.0
+
+
+class LevelMeter:
+    """Compute RMS and peak levels (dBFS) for 16-bit PCM buffers.
+
+    Samples are converted into a preallocated float32 scratch buffer so the
+    per-read cost is a couple of vectorised passes with no allocations.
+    Levels accumulate between publishes; process() only returns a reading
+    once per ``interval`` seconds, which caps GUI-thread signal traffic.
+    """
+
+    def __init__(self, frames_per_buffer, channels=1, interval=LEVEL_UPDATE_INTERVAL):
+        import numpy as np  # Lazy import; callers handle ImportError
+
+        self._np = np
+        self.interval = interval
+        self._scratch = np.empty(frames_per_buffer * channels, dtype=np.float32)
+        self._sum_sq = 0.0
+        self._count = 0
+        self._peak = 0.0
+        self._last_publish = 0.0
+
+    def process(self, data, now=None):
+        """Accumulate a raw buffer; return (rms_db, peak_db) when due."""
+        np = self._np
+        samples = np.frombuffer(data, dtype=np.int16)  # View, no copy
+        n = samples.size
+        if n == 0:
+            return None
+        if n > self._scratch.size:
+            self._scratch = np.empty(n, dtype=np.float32)
+        buf = self._scratch[:n]
+        np.multiply(samples, 1.0 / 32768.0, out=buf, casting="unsafe")
+        self._sum_sq += float(np.dot(buf, buf))
+        self._count += n
+        np.abs(buf, out=buf)
+        self._peak = max(self._peak, float(buf.max()))
+
+        now = time.monotonic() if now is None else now
+        if now - self._last_publish < self.interval:
+            return None
+        self._last_publish = now
+
+        rms = (self._sum_sq / self._count) ** 0.5
+        reading = (self.to_dbfs(rms), self.to_dbfs(self._peak))
+        self._sum_sq = 0.0
+        self._count = 0
+        self._peak = 0.0
+        return reading
+
+    @staticmethod
+    def to_dbfs(amplitude):
+        """Convert a 0.0-1.0 amplitude to dBFS, clamped at the meter floor."""
+        if amplitude <= 0.0:
+            return METER_FLOOR_DB
+        return max(METER_FLOOR_DB, 20.0 * math.log10(amplitude))
+
+    @staticmethod
+    def to_meter(db):
+        """Map dBFS onto the 0.0-1.0 meter scale."""
+        return min(max((db - METER_FLOOR_DB) / -METER_FLOOR_DB, 0.0), 1.0)
+
+
 class AudioLevelMeter(QWidget):
 
     def __init__(self, parent=None):
@@ -43,16 +111,25 @@ class AudioLevelMeter(QWidget):
         self.decay_rate = 0.05  # Level decay rate when not recording
         self.setStyleSheet("background-color: transparent;")
 
+        # Decay only runs while there is something to animate; it is started
+        # by set_level() and stops itself once both levels reach zero.
         self.decay_timer = QTimer(self)
+        self.decay_timer.setInterval(50)
         self.decay_timer.timeout.connect(self.decay_levels)
-        self.decay_timer.start(50)
 
-    def set_level(self, level):
+    def set_level(self, level, peak=None):
         self.level = min(max(level, 0.0), 1.0)
-        self.peak_level = max(self.peak_level, self.level)
+        if peak is None:
+            peak = self.level
+        self.peak_level = max(self.peak_level, min(max(peak, 0.0), 1.0))
+        if (self.level > 0 or self.peak_level > 0) and not self.decay_timer.isActive():
+            self.decay_timer.start()
         self.update()
 
     def decay_levels(self):
+        if self.level <= 0 and self.peak_level <= 0:
+            self.decay_timer.stop()
+            return
         if self.level > 0:
             self.level = max(0, self.level - self.decay_rate)
         if self.peak_level > 0:
@@ -93,7 +170,7 @@ class AudioLevelMeter(QWidget):
 
 class RecordingThread(QThread):
 
-    update_level = pyqtSignal(float)
+    update_level = pyqtSignal(float, float)  # RMS, peak on the 0.0-1.0 meter scale
     update_time = pyqtSignal(int)
     error = pyqtSignal(str)
 
@@ -138,6 +215,13 @@ class RecordingThread(QThread):
             self.elapsed_time = 0
             last_time_update = time.time()
 
+            try:
+                meter = LevelMeter(self.frames_per_buffer, self.channels)
+            except ImportError:
+                # If numpy is not available, skip level visualization
+                logger.debug("numpy not available for audio level visualization")
+                meter = None
+
             # Main recording loop with robust error handling
             while self.is_recording:
                 if not self.is_paused:
@@ -154,26 +238,16 @@ class RecordingThread(QThread):
 
                         self.frames.append(data)
 
-                        # Calculate audio level for visualization
-                        if len(data) > 0:
+                        # Meter levels; published at a capped rate
+                        if meter is not None:
                             try:
-                                # Lazy import numpy only when calculating audio levels
-                                import numpy as np
-                                audio_array = np.frombuffer(
-                                    data, dtype=np.int16)
-                                max_amplitude = (
-                                    np.max(np.abs(audio_array))
-                                    if len(audio_array) > 0
-                                    else 0
-                                )
-                                normalized_level = (
-                                    max_amplitude / 32768.0
-                                )  # Normalize to 0.0-1.0
-                                self.update_level.emit(normalized_level)
-                            except ImportError:
-                                # If numpy is not available, skip level visualization
-                                logger.debug("numpy not available for audio level visualization")
-                                pass
+                                reading = meter.process(data)
+                                if reading is not None:
+                                    rms_db, peak_db = reading
+                                    self.update_level.emit(
+                                        LevelMeter.to_meter(rms_db),
+                                        LevelMeter.to_meter(peak_db),
+                                    )
                             except Exception as viz_error:
                                 # Non-critical error, just log it
                                 logger.warning(
@@ -1,4 +1,4 @@
-from app.secure import SensitiveLogFilter
+from app.log_utils import setup_logging as setup_queue_logging, stop_logging
 from .constants import LOG_FORMAT, APP_NAME, get_user_data_dir, get_log_file
 from .ThreadManager import ThreadManager
 from .ResponsiveUI import ResponsiveUIManager, ResponsiveEventFilter
@@ -10,7 +10,8 @@ from .utils import (
     ensure_ffmpeg_available,
 )
 from .path_utils import resource_path
-from .ui_utils.icon_utils import load_icon
+from .ui_utils.icon_utils import load_icon, prerender_icons
+from .threads.ModelPrefetchThread import start_model_prefetch
 from .MainWindow import MainWindow
 from PyQt6.QtSvg import QSvgRenderer
 from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal, pyqtSlot, QRect
@@ -27,6 +28,7 @@ from PyQt6.QtWidgets import (
 import sys
 import os
 import logging
+import multiprocessing
 import traceback
 import warnings
 from typing import Tuple, Dict, Any, List
@@ -44,27 +46,12 @@ def setup_logging():
     """Setup logging configuration - called at runtime, not import time."""
     global logger
     
-    # Configure logging - now all paths come from constants
-    # Root logging may have been configured by app.utils already (imported by
-    # many modules).  Add handlers only if not present to avoid duplicate log
-    # lines.
-    if not logging.getLogger().handlers:
-        logging.basicConfig(
-            level=logging.INFO,
-            format=LOG_FORMAT,
-            handlers=[
-                logging.StreamHandler(),
-                logging.FileHandler(get_log_file()),
-            ],
-        )
+    # Route logging through the queue listener (a no-op if app.utils already
+    # did); redaction, formatting and file I/O happen on the listener thread
+    setup_queue_logging(fmt=LOG_FORMAT, log_file=get_log_file())
 
-    # Apply sensitive data redaction filter to the root logger
-    root_logger = logging.getLogger()
-    root_logger.addFilter(SensitiveLogFilter())
-    
     # Now get the application‑level logger
     logger = logging.getLogger(APP_NAME)
-    logger.info("Secure logging filter initialized")
     logger.info(
         f"Application starting. User data directory: {get_user_data_dir()}")
     
@@ -522,6 +509,14 @@ def on_initialization_done(
     QTimer.singleShot(800, lambda: (
         main_window.show(), splash.finish(main_window)))
 
+    # Fill the icon disk cache once the window is up, so later launches
+    # (and first use of each view) skip SVG rendering
+    QTimer.singleShot(2000, prerender_icons)
+
+    # Opt-in: load and warm up the local model once the UI has settled, so
+    # the first transcription runs at full speed
+    QTimer.singleShot(5000, start_model_prefetch)
+
 
 @pyqtSlot(str)
 def on_initialization_error(error_message, main_window, splash):
@@ -731,7 +726,7 @@ def cleanup_application():
     try:
         # Lazy import - only if ModelManager was actually used
         from app.services.transcription_service import ModelManager
-        ModelManager.instance().release_memory()
+        ModelManager.instance().release_memory(force=True)
         logger.info("Released model resources")
     except ImportError:
         # ModelManager not available - ML dependencies not installed
@@ -739,6 +734,14 @@ def cleanup_application():
     except Exception as e:
         logger.error(f"Error releasing model resources: {e}")
 
+    # Close pooled HTTP connections
+    try:
+        from app.services.http_client import close_all
+
+        close_all()
+    except Exception as e:
+        logger.error(f"Error closing HTTP clients: {e}")
+
     # Wait for the startup thread to finish if it's still running
     if startup_thread and startup_thread.isRunning():
         logger.info("Waiting for startup thread to finish...")
@@ -757,6 +760,9 @@ def cleanup_application():
     except Exception as e:
         logger.error(f"Error saving configuration: {e}")
 
+    # Flush queued log records; later messages are written synchronously
+    stop_logging()
+
 
 def main() -> int:
     """Entry point used by packaged builds.
@@ -764,6 +770,8 @@ def main() -> int:
     Briefcase/pyinstaller wrappers import `app.__main__:main`. Keep this thin and
     delegate to the real runner to avoid duplicating logic.
     """
+    # Frozen builds re-execute this entry point for process pool workers
+    multiprocessing.freeze_support()
     return run_application()
 
 
@@ -0,0 +1,218 @@
+"""Container header parsing for fast, decode-free duration lookup.
+
+Supports WAV (RIFF), FLAC, MP3 (Xing/Info/VBRI or CBR estimate) and
+MP4/M4A (mvhd box). Each reader returns the duration in seconds, or None
+when the header is missing or not understood so callers can fall back to
+a slower probe.
+"""
+
+import os
+import struct
+import logging
+from typing import BinaryIO, Optional
+
+logger = logging.getLogger("transcribrr")
+
+# MPEG audio bitrates in kbps keyed by (is MPEG-1, layer), indexed by header bits
+_MP3_BITRATES = {
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+# Sample rates by MPEG version bits (0=2.5, 2=2, 3=1)
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    0: [11025, 12000, 8000],
+}
+# How far past the ID3 tag to look for the first frame sync
+_MP3_SYNC_SEARCH = 64 * 1024
+
+
+def read_wav_duration(f: BinaryIO) -> Optional[float]:
+    """Return duration from the RIFF fmt and data chunks."""
+    header = f.read(12)
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        return None
+    byte_rate = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return None
+        chunk_id, size = struct.unpack("<4sI", chunk)
+        if chunk_id == b"fmt ":
+            fmt = f.read(size)
+            if len(fmt) < 16:
+                return None
+            byte_rate = struct.unpack("<I", fmt[8:12])[0]
+            if size % 2:
+                f.seek(1, os.SEEK_CUR)
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            # Streamed WAVs may leave the size unset; trust the file length
+            remaining = os.fstat(f.fileno()).st_size - f.tell()
+            if size in (0, 0xFFFFFFFF) or size > remaining:
+                size = remaining
+            return size / byte_rate
+        else:
+            f.seek(size + (size % 2), os.SEEK_CUR)
+
+
+def read_flac_duration(f: BinaryIO) -> Optional[float]:
+    """Return duration from the FLAC STREAMINFO block."""
+    header = f.read(8)
+    if len(header) < 8 or header[:4] != b"fLaC" or header[4] & 0x7F != 0:
+        return None
+    info = f.read(18)
+    if len(info) < 18:
+        return None
+    packed = int.from_bytes(info[10:18], "big")
+    sample_rate = packed >> 44
+    total_samples = packed & 0xFFFFFFFFF
+    if not sample_rate or not total_samples:
+        return None
+    return total_samples / sample_rate
+
+
+def _skip_id3v2(f: BinaryIO) -> int:
+    """Return the offset just past a leading ID3v2 tag (0 if none)."""
+    header = f.read(10)
+    if len(header) == 10 and header[:3] == b"ID3":
+        size = 0
+        for byte in header[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if header[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def read_mp3_duration(f: BinaryIO) -> Optional[float]:
+    """Return duration from a Xing/Info/VBRI header, else a CBR estimate."""
+    file_size = os.fstat(f.fileno()).st_size
+    start = _skip_id3v2(f)
+    f.seek(start)
+    buf = f.read(_MP3_SYNC_SEARCH)
+
+    for i in range(len(buf) - 4):
+        if buf[i] != 0xFF or buf[i + 1] & 0xE0 != 0xE0:
+            continue
+        b1, b2, b3 = buf[i + 1], buf[i + 2], buf[i + 3]
+        version = (b1 >> 3) & 0x03
+        layer = 4 - ((b1 >> 1) & 0x03)
+        bitrate_index = b2 >> 4
+        rate_index = (b2 >> 2) & 0x03
+        if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+            continue
+        mpeg1 = version == 3
+        bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+        sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+        mono = (b3 >> 6) == 3
+        if layer == 1:
+            samples_per_frame = 384
+        elif layer == 2 or mpeg1:
+            samples_per_frame = 1152
+        else:
+            samples_per_frame = 576
+
+        # Xing/Info header sits after the side information
+        if mpeg1:
+            side_info = 17 if mono else 32
+        else:
+            side_info = 9 if mono else 17
+        xing = i + 4 + side_info
+        tag = buf[xing:xing + 4]
+        if tag in (b"Xing", b"Info") and len(buf) >= xing + 12:
+            flags = struct.unpack(">I", buf[xing + 4:xing + 8])[0]
+            if flags & 0x1:
+                frames = struct.unpack(">I", buf[xing + 8:xing + 12])[0]
+                return frames * samples_per_frame / sample_rate
+
+        # VBRI header sits at a fixed offset of 32 bytes after the frame header
+        vbri = i + 4 + 32
+        if buf[vbri:vbri + 4] == b"VBRI" and len(buf) >= vbri + 18:
+            frames = struct.unpack(">I", buf[vbri + 14:vbri + 18])[0]
+            return frames * samples_per_frame / sample_rate
+
+        # Constant bitrate: derive from the audio payload size
+        audio_bytes = file_size - start - i
+        if file_size >= 128:
+            f.seek(-128, os.SEEK_END)
+            if f.read(3) == b"TAG":  # trailing ID3v1 tag
+                audio_bytes -= 128
+        return audio_bytes * 8 / bitrate if audio_bytes > 0 else None
+
+    return None
+
+
+def _find_box(f: BinaryIO, end: int, box_type: bytes) -> Optional[int]:
+    """Return the end offset of box_type between f.tell() and end."""
+    while f.tell() + 8 <= end:
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        size, kind = struct.unpack(">I4s", header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack(">Q", f.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - f.tell() + header_size
+        if size < header_size:
+            return None
+        box_end = f.tell() - header_size + size
+        if kind == box_type:
+            return box_end
+        f.seek(box_end)
+    return None
+
+
+def read_mp4_duration(f: BinaryIO) -> Optional[float]:
+    """Return duration from the MP4/M4A movie header (moov/mvhd)."""
+    file_size = os.fstat(f.fileno()).st_size
+    moov_end = _find_box(f, file_size, b"moov")
+    if moov_end is None or _find_box(f, moov_end, b"mvhd") is None:
+        return None
+    version = f.read(4)[:1]
+    if version == b"\x01":
+        data = f.read(28)
+        if len(data) < 28:
+            return None
+        timescale, duration = struct.unpack(">IQ", data[16:28])
+    else:
+        data = f.read(16)
+        if len(data) < 16:
+            return None
+        timescale, duration = struct.unpack(">II", data[8:16])
+    if not timescale:
+        return None
+    return duration / timescale
+
+
+_READERS = {
+    ".wav": read_wav_duration,
+    ".flac": read_flac_duration,
+    ".mp3": read_mp3_duration,
+    ".m4a": read_mp4_duration,
+    ".mp4": read_mp4_duration,
+    ".mov": read_mp4_duration,
+}
+
+
+def read_header_duration(file_path: str) -> Optional[float]:
+    """Return duration in seconds parsed from the file header, or None."""
+    reader = _READERS.get(os.path.splitext(file_path)[1].lower())
+    if reader is None:
+        return None
+    try:
+        with open(file_path, "rb") as f:
+            duration = reader(f)
+    except (OSError, struct.error, KeyError, IndexError) as e:
+        logger.debug(f"Header parse failed for {file_path}: {e}")
+        return None
+    if duration is None or duration <= 0:
+        return None
+    return duration
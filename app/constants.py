@@ -153,9 +153,31 @@ DEFAULT_CONFIG = {
     "max_tokens": 16000,
     "temperature": 1.0,
     "speaker_detection_enabled": False,
+    "speaker_word_alignment": False,  # split chunks at word timestamps on speaker changes
     "transcription_language": "english",
     "theme": "light",
     "hardware_acceleration_enabled": True,
+    "model_keep_warm_seconds": 300,  # keep local models loaded between jobs
+    "model_prefetch_enabled": False,  # load and warm up the local model when idle
+    "thread_pool_limits": {},  # e.g. {"gpu": 1, "cpu": 2, "network": 4}; empty = defaults
+    "asr_batch_size": 0,  # local pipeline batch size; 0 = tune to free memory
+    "cpu_int8_quantization": False,  # int8 linear layers for local models on CPU
+    "cpu_torch_compile": False,  # torch.compile the encoder on CPU (slow first run)
+    "icon_disk_cache": True,  # keep rendered SVG icons as PNGs between launches
+    "http_pool_size": 10,
+    "http2_enabled": True,
+    "openai_requests_per_minute": 0,  # 0 = learn from response headers
+    "openai_tokens_per_minute": 0,
+    "gpt_cache_enabled": True,
+    "gpt_cache_bypass_sampled": False,  # skip the cache when temperature > 0
+    "gpt_cache_ttl_days": 30,
+    "gpt_cache_max_entries": 500,
+    # OpenAI-compatible servers (llama.cpp, vLLM, Ollama); empty = OpenAI
+    "gpt_api_base_url": "",
+    "smart_format_api_base_url": "",  # empty = same as gpt_api_base_url
+    "smart_format_model": "gpt-4o-mini",
+    "llm_endpoint_concurrency": {},  # {base URL: max parallel requests}
+    "batch_poll_interval": 60,  # seconds between Batch API status checks
 }
 
 DEFAULT_PROMPTS = {
@@ -5,7 +5,7 @@ module import time (important for headless CI). Controllers are imported
 on-demand via attribute access.
 """
 
-__all__ = ["TranscriptionController", "GPTController"]
+__all__ = ["TranscriptionController", "GPTController", "BatchController"]
 
 
 def __getattr__(name: str):  # pragma: no cover - trivial accessor
@@ -17,4 +17,8 @@ def __getattr__(name: str):  # pragma: no cover - trivial accessor
         from .gpt_controller import GPTController
 
         return GPTController
+    if name == "BatchController":
+        from .batch_controller import BatchController
+
+        return BatchController
     raise AttributeError(f"module 'app.controllers' has no attribute {name!r}")
@@ -30,6 +30,9 @@ except Exception:  # pragma: no cover - exercised in CI without Qt
             return _Signal()
 
 from app.models.recording import Recording
+from app.services.incremental_format import mark_document
+from app.services.llm_endpoints import endpoint_api_key, endpoint_key_name, is_local
+from app.services.rate_limiter import RATE_PRIORITY_INTERACTIVE
 
 # Thread class shim: make attribute available even if thread module can't import
 try:
@@ -38,7 +41,12 @@ except Exception:  # pragma: no cover - CI without Qt/requests
     class GPT4ProcessingThread:  # type: ignore
         pass
 
-from app.ThreadManager import ThreadManager
+from app.ThreadManager import (
+    POOL_NETWORK,
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    ThreadManager,
+)
 from app.secure import get_api_key
 
 logger = logging.getLogger("transcribrr")
@@ -53,6 +61,7 @@ class GPTController(QObject):
     gpt_process_stopped = pyqtSignal()
     status_update = pyqtSignal(str)  # Generic status update signal
     recording_status_updated = pyqtSignal(int, dict)  # Signal for recording updates (ID, data)
+    gpt_partial_text = pyqtSignal(str, str)  # Streamed text so far (thread key, text)
 
     def __init__(self, db_manager, parent=None):
         super().__init__(parent)
@@ -66,6 +75,34 @@ class GPTController(QObject):
         self.get_api_key = get_api_key
         self._Thread = GPT4ProcessingThread
 
+    @staticmethod
+    def _endpoint_options(config: Dict[str, Any], task_key: Optional[str] = None) -> Dict[str, Any]:
+        """Return thread kwargs routing a task to its configured endpoint.
+
+        task_key names a per-task base URL setting (e.g. smart formatting on
+        a local server) that overrides gpt_api_base_url. Empty means OpenAI.
+        """
+        base_url = (config.get(task_key) if task_key else None) or config.get(
+            "gpt_api_base_url"
+        )
+        return {"api_base_url": base_url} if base_url else {}
+
+    def _require_api_key(self, options: Dict[str, Any], operation: str) -> Optional[str]:
+        """Return the endpoint's API key, "" for keyless local servers, None if missing.
+
+        The OpenAI key is only returned for api.openai.com; other endpoints
+        get their own key (see llm_endpoints.endpoint_key_name).
+        """
+        base_url = options.get("api_base_url")
+        api_key = endpoint_api_key(base_url, self.get_api_key)
+        if api_key:
+            return api_key
+        if base_url and is_local(base_url):
+            return ""
+        self.logger.error(
+            f"API key {endpoint_key_name(base_url)} missing for {operation}")
+        return None
+
     def process(
         self,
         recording: Recording,
@@ -85,9 +122,9 @@ class GPTController(QObject):
             return False
 
         # Get API key
-        api_key = self.get_api_key("OPENAI_API_KEY")
-        if not api_key:
-            self.logger.error("OpenAI API key missing for GPT processing")
+        endpoint = self._endpoint_options(config)
+        api_key = self._require_api_key(endpoint, "GPT processing")
+        if api_key is None:
             return False
 
         # Extract config values
@@ -108,6 +145,7 @@ class GPTController(QObject):
             max_tokens=max_tokens,
             temperature=temperature,
             openai_api_key=api_key,
+            **endpoint,
         )
 
         # Connect signals
@@ -119,6 +157,9 @@ class GPTController(QObject):
         thread.update_progress.connect(self._on_process_progress)
         thread.error.connect(self._on_process_error)
         thread.finished.connect(lambda: self._on_process_finished("process"))
+        thread.partial_text.connect(
+            lambda text: self._on_partial_text("process", text)
+        )
 
         # Store thread
         self.threads["process"] = {"thread": thread, "busy_guard": busy_guard}
@@ -127,8 +168,10 @@ class GPTController(QObject):
         self.status_update.emit("Starting GPT processing...")
         self.gpt_process_started.emit()
 
-        # Start thread
-        thread.start()
+        # Queue for a network slot; starts at once if one is free
+        self.threads["process"]["token"] = ThreadManager.instance().submit(
+            thread, pool=POOL_NETWORK, priority=PRIORITY_NORMAL
+        )
 
         return True
 
@@ -138,21 +181,28 @@ class GPTController(QObject):
         config: Dict[str, Any],
         busy_guard_callback: Callable,
         completion_callback: Optional[Callable] = None,
+        previous_html: Optional[str] = None,
     ) -> bool:
-        """Format text with GPT for display."""
+        """Format text with GPT for display.
+
+        Pass the last formatted HTML for this text as previous_html to format
+        incrementally: only paragraphs changed since then are sent. With no
+        previous HTML (None) the whole text is formatted in one request. The
+        output carries block markers either way, for next time.
+        """
         # Validate inputs
         if not text:
             self.logger.error("No text provided for smart formatting")
             return False
 
         # Get API key
-        api_key = self.get_api_key("OPENAI_API_KEY")
-        if not api_key:
-            self.logger.error("OpenAI API key missing for smart formatting")
+        endpoint = self._endpoint_options(config, "smart_format_api_base_url")
+        api_key = self._require_api_key(endpoint, "smart formatting")
+        if api_key is None:
             return False
 
         # Use cheaper model with lower temperature for format task
-        gpt_model = "gpt-4o-mini"
+        gpt_model = config.get("smart_format_model") or "gpt-4o-mini"
         temperature = 0.3
 
         # Create busy indicator
@@ -169,6 +219,9 @@ class GPTController(QObject):
             "Here is the text to format:"
         )
 
+        if previous_html is not None:
+            endpoint["previous_html"] = previous_html
+
         # Create thread
         thread = self._Thread(
             transcript=text,
@@ -177,6 +230,7 @@ class GPTController(QObject):
             max_tokens=16000,
             temperature=temperature,
             openai_api_key=api_key,
+            **endpoint,
         )
 
         # Connect signals
@@ -186,6 +240,9 @@ class GPTController(QObject):
         thread.update_progress.connect(self._on_process_progress)
         thread.error.connect(self._on_process_error)
         thread.finished.connect(lambda: self._on_process_finished("smart_format"))
+        thread.partial_text.connect(
+            lambda text: self._on_partial_text("smart_format", text)
+        )
 
         # Store thread
         self.threads["smart_format"] = {"thread": thread, "busy_guard": busy_guard}
@@ -193,8 +250,10 @@ class GPTController(QObject):
         # Emit signal
         self.status_update.emit("Formatting text...")
 
-        # Start thread
-        thread.start()
+        # Queue for a network slot; starts at once if one is free
+        self.threads["smart_format"]["token"] = ThreadManager.instance().submit(
+            thread, pool=POOL_NETWORK, priority=PRIORITY_HIGH
+        )
 
         return True
 
@@ -223,9 +282,9 @@ class GPTController(QObject):
             return False
 
         # Get API key
-        api_key = self.get_api_key("OPENAI_API_KEY")
-        if not api_key:
-            self.logger.error("OpenAI API key missing for refinement")
+        endpoint = self._endpoint_options(config)
+        api_key = self._require_api_key(endpoint, "refinement")
+        if api_key is None:
             return False
 
         # Extract config values
@@ -262,6 +321,9 @@ class GPTController(QObject):
             max_tokens=max_tokens,
             temperature=temperature,
             openai_api_key=api_key,
+            # The user is waiting on refinements; serve them before other work
+            priority=RATE_PRIORITY_INTERACTIVE,
+            **endpoint,
         )
 
         # Connect signals
@@ -273,6 +335,9 @@ class GPTController(QObject):
         thread.update_progress.connect(self._on_process_progress)
         thread.error.connect(self._on_process_error)
         thread.finished.connect(lambda: self._on_process_finished("refinement"))
+        thread.partial_text.connect(
+            lambda text: self._on_partial_text("refinement", text)
+        )
 
         # Store thread
         self.threads["refinement"] = {"thread": thread, "busy_guard": busy_guard}
@@ -280,8 +345,10 @@ class GPTController(QObject):
         # Emit signal
         self.status_update.emit("Refining text...")
 
-        # Start thread
-        thread.start()
+        # Queue for a network slot; starts at once if one is free
+        self.threads["refinement"]["token"] = ThreadManager.instance().submit(
+            thread, pool=POOL_NETWORK, priority=PRIORITY_HIGH
+        )
 
         return True
 
@@ -316,6 +383,9 @@ class GPTController(QObject):
         self, result: str, completion_callback: Optional[Callable] = None
     ) -> None:
         """Handle completed smart formatting."""
+        # Whole-document results get the block markers incremental runs add
+        result = mark_document(result)
+
         # Emit signals
         self.status_update.emit("Formatting complete")
 
@@ -353,6 +423,10 @@ class GPTController(QObject):
         """Handle progress updates from GPT thread."""
         self.status_update.emit(message)
 
+    def _on_partial_text(self, thread_key: str, text: str) -> None:
+        """Forward streamed text so the UI can show the response as it arrives."""
+        self.gpt_partial_text.emit(thread_key, text)
+
     def _on_process_error(self, error_message: str) -> None:
         """Handle GPT processing errors."""
         self.status_update.emit(f"GPT processing failed: {error_message}")
@@ -370,7 +444,13 @@ class GPTController(QObject):
         if thread_key in self.threads:
             thread_info = self.threads[thread_key]
             thread = thread_info["thread"]
-            if thread and thread.isRunning():
+            if thread and (
+                thread.isRunning() or ThreadManager.instance().is_queued(thread)
+            ):
                 self.logger.info(f"Canceling {thread_key} thread...")
-                thread.cancel()
+                token = thread_info.get("token")
+                if token is not None:
+                    token.cancel()
+                else:
+                    thread.cancel()
                 self.status_update.emit(f"Canceling {thread_key}...")
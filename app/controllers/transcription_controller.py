@@ -38,7 +38,13 @@ except Exception:  # pragma: no cover - CI without Qt/torch
     class TranscriptionThread:  # type: ignore
         pass
 
-from app.ThreadManager import ThreadManager
+try:
+    from app.threads.ModelPrefetchThread import cancel_model_prefetch
+except Exception:  # pragma: no cover - CI without Qt
+    def cancel_model_prefetch() -> None:  # type: ignore
+        pass
+
+from app.ThreadManager import POOL_CPU, POOL_GPU, POOL_NETWORK, ThreadManager
 from app.secure import get_api_key
 from app.constants import ERROR_INVALID_FILE, SUCCESS_TRANSCRIPTION
 
@@ -67,6 +73,8 @@ class TranscriptionController(QObject):
             self._parent = parent  # Preserve reference for tests if needed
         self.db_manager = db_manager
         self.transcription_thread = None
+        self.cancel_token = None
+        self.estimate = None  # Estimate for the current job, if there's history
 
     def start(
         self,
@@ -95,9 +103,18 @@ class TranscriptionController(QObject):
             return False
 
         # Emit signal
-        self.status_update.emit("Starting transcription...")
+        self.estimate = self._estimate(thread_args)
+        if self.estimate is not None:
+            self.status_update.emit(
+                f"Starting transcription ({self.estimate.describe()})..."
+            )
+        else:
+            self.status_update.emit("Starting transcription...")
         self.transcription_process_started.emit()
 
+        # A real job takes over from the idle prefetch (keeping what it loaded)
+        cancel_model_prefetch()
+
         # Create and launch transcription thread
         self.transcription_thread = TranscriptionThread(**thread_args)
 
@@ -113,11 +130,12 @@ class TranscriptionController(QObject):
         self.transcription_thread.finished.connect(
             self._on_transcription_finished)
 
-        # Register thread with ThreadManager
-        ThreadManager.instance().register_thread(self.transcription_thread)
-
-        # Start thread
-        self.transcription_thread.start()
+        # Queue in the pool for the resource it needs; starts when one is free
+        self.cancel_token = ThreadManager.instance().submit(
+            self.transcription_thread,
+            pool=self._pool_for(thread_args),
+            cost=self.estimate.seconds if self.estimate is not None else 0.0,
+        )
 
         return True
 
@@ -185,6 +203,31 @@ class TranscriptionController(QObject):
             "hardware_acceleration_enabled": hardware_acceleration_enabled,
         }
 
+    @staticmethod
+    def _estimate(thread_args: Dict[str, Any]) -> Optional[Any]:
+        """Predict the job's runtime from earlier jobs; None without history."""
+        try:
+            from app.services.time_estimator import predict_transcription
+
+            return predict_transcription(
+                thread_args["file_path"],
+                thread_args["transcription_method"],
+                thread_args["transcription_quality"],
+                thread_args["hardware_acceleration_enabled"],
+            )
+        except Exception as e:
+            logger.debug(f"No transcription time estimate: {e}")
+            return None
+
+    @staticmethod
+    def _pool_for(thread_args: Dict[str, Any]) -> str:
+        """Return the worker pool a transcription with these arguments uses."""
+        if thread_args["transcription_method"] == "api":
+            return POOL_NETWORK
+        if thread_args["hardware_acceleration_enabled"]:
+            return POOL_GPU
+        return POOL_CPU
+
     def _on_transcription_progress(self, message: str) -> None:
         """Handle progress updates from transcription thread."""
         self.status_update.emit(message)  # Forward to status bar
@@ -246,6 +289,7 @@ class TranscriptionController(QObject):
         """Called when transcription thread finishes, regardless of success."""
         # Clean up thread reference
         self.transcription_thread = None
+        self.cancel_token = None
         logger.info("Transcription thread finished.")
 
         # Inform listeners that the UI is ready again
@@ -253,7 +297,13 @@ class TranscriptionController(QObject):
 
     def cancel(self) -> None:
         """Cancel current transcription if running."""
-        if self.transcription_thread and self.transcription_thread.isRunning():
+        thread = self.transcription_thread
+        if thread and (
+            thread.isRunning() or ThreadManager.instance().is_queued(thread)
+        ):
             logger.info("Canceling transcription...")
-            self.transcription_thread.cancel()
+            if self.cancel_token is not None:
+                self.cancel_token.cancel()
+            else:
+                thread.cancel()
             self.status_update.emit("Canceling transcription...")
@@ -274,6 +274,70 @@ def create_recording(conn: sqlite3.Connection, recording_data: Tuple) -> int:
         raise
 
 
+# SQLite builds before 3.32 cap bound parameters at 999 per statement
+MAX_QUERY_PARAMS = 900
+
+
+def create_recordings(
+    conn: sqlite3.Connection, recordings_data: List[Tuple]
+) -> Tuple[List[int], List[str]]:
+    """Insert many recordings in one transaction.
+
+    Each item has the same layout as for create_recording. Rows whose
+    file_path already exists (in the table or earlier in the batch) are
+    skipped. Returns (new ids, skipped duplicate paths).
+    """
+    rows = []
+    for recording_data in recordings_data:
+        if len(recording_data) < 4:
+            raise ValueError(
+                "Recording data must contain at least filename, file_path, date_created, duration"
+            )
+        row = list(recording_data)[:7]
+        row += [None] * (7 - len(row))
+        rows.append(tuple(row))
+
+    sql = f"""INSERT INTO {TABLE_RECORDINGS}(
+        {FIELD_FILENAME}, {FIELD_FILE_PATH}, {FIELD_DATE_CREATED},
+        {FIELD_DURATION}, {FIELD_RAW_TRANSCRIPT}, {FIELD_PROCESSED_TEXT},
+        original_source_identifier
+    ) VALUES(?,?,?,?,?,?,?)"""
+
+    try:
+        cursor = conn.cursor()
+        paths = [row[1] for row in rows]
+        existing = set()
+        for start in range(0, len(paths), MAX_QUERY_PARAMS):
+            chunk = paths[start:start + MAX_QUERY_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(
+                f"SELECT {FIELD_FILE_PATH} FROM {TABLE_RECORDINGS} "
+                f"WHERE {FIELD_FILE_PATH} IN ({placeholders})",
+                chunk,
+            )
+            existing.update(path for (path,) in cursor.fetchall())
+
+        new_ids = []
+        duplicates = []
+        for row in rows:
+            if row[1] in existing:
+                duplicates.append(row[1])
+                continue
+            cursor.execute(sql, row)
+            new_ids.append(cursor.lastrowid)
+            existing.add(row[1])
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"Error creating recordings batch: {e}", exc_info=True)
+        raise
+
+    logger.info(
+        f"Created {len(new_ids)} recordings, skipped {len(duplicates)} duplicate paths"
+    )
+    return new_ids, duplicates
+
+
 def update_recording(conn: sqlite3.Connection, recording_id: int, **kwargs) -> None:
     """Update recording."""
     if not kwargs:
@@ -0,0 +1,374 @@
+"""FFmpeg/ffprobe subprocess helpers for probing, transcoding and audio extraction."""
+
+import os
+import json
+import shutil
+import logging
+import platform
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Configure module-level logger
+logger = logging.getLogger("transcribrr")
+
+# Audio codecs that can be stream-copied into a container of the given
+# extension without re-encoding.
+COPYABLE_CODECS = {
+    "mp3": "mp3",
+    "aac": "m4a",
+    "alac": "m4a",
+    "flac": "flac",
+    "vorbis": "ogg",
+    "opus": "ogg",
+}
+
+# Containers and codecs accepted as-is by both the local pipeline and the API.
+DIRECT_USE_CODECS = {
+    ".mp3": ("mp3",),
+    ".m4a": ("aac", "alac"),
+    ".flac": ("flac",),
+    ".ogg": ("vorbis", "opus"),
+    ".wav": (),  # any PCM codec, see is_directly_usable
+}
+
+# Encoder arguments per target extension; other targets use ffmpeg defaults.
+ENCODER_ARGS = {
+    "mp3": ["-c:a", "libmp3lame", "-q:a", "2"],
+    "m4a": ["-c:a", "aac", "-b:a", "192k"],
+    "wav": ["-c:a", "pcm_s16le"],
+}
+
+# Seconds to wait for ffmpeg to exit after terminate() before killing it.
+TERMINATE_TIMEOUT = 5
+
+
+class FFmpegError(RuntimeError):
+    """Raised when an ffmpeg/ffprobe invocation fails."""
+
+
+class FFmpegCancelled(FFmpegError):
+    """Raised when an ffmpeg process is terminated on request."""
+
+
+def find_ffmpeg() -> Optional[str]:
+    """Return ffmpeg executable path or None."""
+    return shutil.which("ffmpeg")
+
+
+def find_ffprobe() -> Optional[str]:
+    """Return ffprobe executable path or None."""
+    return shutil.which("ffprobe")
+
+
+def _startupinfo():
+    """Return STARTUPINFO hiding the console window on Windows."""
+    if platform.system() != "Windows":
+        return None
+    startupinfo = subprocess.STARTUPINFO()  # type: ignore
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW  # type: ignore
+    startupinfo.wShowWindow = 0  # SW_HIDE
+    return startupinfo
+
+
+@dataclass
+class MediaInfo:
+    """Stream metadata reported by ffprobe for a media file."""
+
+    codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    duration: Optional[float] = None
+    bit_rate: Optional[int] = None
+    has_video: bool = False
+
+    @property
+    def has_audio(self) -> bool:
+        return self.codec is not None
+
+
+# Probe results keyed by (absolute path, size, mtime_ns), least recently
+# used first; bounded so a long session doesn't keep every file ever seen
+PROBE_CACHE_MAX_ENTRIES = 512
+_probe_cache: "OrderedDict[Tuple[str, int, int], MediaInfo]" = OrderedDict()
+_probe_cache_lock = threading.Lock()
+
+
+def file_signature(file_path: str) -> Optional[Tuple[str, int, int]]:
+    """Return (absolute path, size, mtime_ns) identifying a file version."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return os.path.abspath(file_path), st.st_size, st.st_mtime_ns
+
+
+def get_cached_media_info(file_path: str) -> Optional[MediaInfo]:
+    """Return a stored probe result if the file is unchanged since probing."""
+    key = file_signature(file_path)
+    if key is None:
+        return None
+    with _probe_cache_lock:
+        info = _probe_cache.get(key)
+        if info is not None:
+            _probe_cache.move_to_end(key)
+        return info
+
+
+def cache_media_info(file_path: str, info: MediaInfo) -> None:
+    """Store a probe result for file_path (e.g. a copy of a probed file)."""
+    key = file_signature(file_path)
+    if key is None:
+        return
+    with _probe_cache_lock:
+        _probe_cache[key] = info
+        _probe_cache.move_to_end(key)
+        while len(_probe_cache) > PROBE_CACHE_MAX_ENTRIES:
+            _probe_cache.popitem(last=False)
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_probe_output(data: dict) -> MediaInfo:
+    """Build MediaInfo from ffprobe ``-show_streams -show_format`` JSON."""
+    streams = data.get("streams") or []
+    fmt = data.get("format") or {}
+    audio = next((st for st in streams if st.get("codec_type") == "audio"), {})
+    # Cover art is reported as a single-frame video stream; ignore it
+    has_video = any(
+        st.get("codec_type") == "video"
+        and not (st.get("disposition") or {}).get("attached_pic")
+        for st in streams
+    )
+    duration = _to_float(audio.get("duration"))
+    if duration is None:
+        duration = _to_float(fmt.get("duration"))
+    bit_rate = _to_int(audio.get("bit_rate"))
+    if bit_rate is None:
+        bit_rate = _to_int(fmt.get("bit_rate"))
+    return MediaInfo(
+        codec=audio.get("codec_name"),
+        sample_rate=_to_int(audio.get("sample_rate")),
+        channels=_to_int(audio.get("channels")),
+        duration=duration,
+        bit_rate=bit_rate,
+        has_video=has_video,
+    )
+
+
+def probe_media(file_path: str) -> Optional[MediaInfo]:
+    """Return MediaInfo for file_path via ffprobe, or None if unavailable."""
+    cached = get_cached_media_info(file_path)
+    if cached is not None:
+        return cached
+
+    ffprobe = find_ffprobe()
+    if not ffprobe:
+        return None
+
+    cmd = [
+        ffprobe,
+        "-v", "error",
+        "-show_streams",
+        "-show_format",
+        "-of", "json",
+        file_path,
+    ]
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=30,
+            check=False,
+            startupinfo=_startupinfo(),
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"ffprobe failed for {file_path}: {e}")
+        return None
+
+    if result.returncode != 0:
+        logger.warning(f"ffprobe returned {result.returncode} for {file_path}")
+        return None
+
+    try:
+        info = parse_probe_output(json.loads(result.stdout or "{}"))
+    except ValueError:
+        return None
+
+    cache_media_info(file_path, info)
+    return info
+
+
+def is_directly_usable(file_path: str, info: Optional[MediaInfo]) -> bool:
+    """Return True if the file can be transcribed as-is without transcoding."""
+    if info is None or not info.has_audio or info.has_video:
+        return False
+    ext = os.path.splitext(file_path)[1].lower()
+    codec = info.codec.lower()
+    allowed = DIRECT_USE_CODECS.get(ext, ())
+    return codec in allowed or (ext == ".wav" and codec.startswith("pcm_"))
+
+
+def copy_target_format(codec: Optional[str]) -> Optional[str]:
+    """Return container extension a codec can be stream-copied into."""
+    if not codec:
+        return None
+    return COPYABLE_CODECS.get(codec.lower())
+
+
+def build_command(
+    ffmpeg: str, source_path: str, target_path: str, stream_copy: bool
+) -> List[str]:
+    """Build an ffmpeg command writing the first audio stream to target."""
+    cmd = [
+        ffmpeg,
+        "-hide_banner",
+        "-nostdin",
+        "-y",
+        "-loglevel", "error",
+        "-i", source_path,
+        "-map", "0:a:0",
+        "-vn",
+        "-sn",
+        "-dn",
+    ]
+    if stream_copy:
+        cmd += ["-c:a", "copy"]
+    else:
+        ext = os.path.splitext(target_path)[1].lstrip(".").lower()
+        cmd += ENCODER_ARGS.get(ext, [])
+    cmd += ["-progress", "pipe:1", "-nostats", target_path]
+    return cmd
+
+
+def parse_progress_line(line: str) -> Optional[float]:
+    """Return output position in seconds from a ``-progress`` line, if any."""
+    key, sep, value = line.strip().partition("=")
+    if not sep:
+        return None
+    # out_time_ms is reported in microseconds despite its name
+    if key in ("out_time_us", "out_time_ms"):
+        try:
+            return max(0.0, int(value) / 1_000_000)
+        except ValueError:
+            return None
+    return None
+
+
+class FFmpegProcess:
+    """Run a single ffmpeg command with progress reporting and cancellation."""
+
+    def __init__(self, cmd: List[str], duration: Optional[float] = None):
+        self.cmd = cmd
+        self.duration = duration if duration and duration > 0 else None
+        self._process: Optional[subprocess.Popen] = None
+        self._terminated = False
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """Run ffmpeg to completion; raise FFmpegError or FFmpegCancelled."""
+        with tempfile.TemporaryFile() as stderr_file:
+            with self._lock:
+                if self._terminated:
+                    raise FFmpegCancelled("ffmpeg cancelled before start")
+                self._process = subprocess.Popen(
+                    self.cmd,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_file,
+                    text=True,
+                    startupinfo=_startupinfo(),
+                )
+            process = self._process
+
+            last_percent = -1
+            assert process.stdout is not None
+            for line in process.stdout:
+                if cancel_check and cancel_check():
+                    self.terminate()
+                    break
+                position = parse_progress_line(line)
+                if position is None or not self.duration or not progress_callback:
+                    continue
+                percent = min(99, int(position * 100 / self.duration))
+                if percent != last_percent:
+                    last_percent = percent
+                    progress_callback(percent)
+
+            returncode = process.wait()
+
+            if self._terminated:
+                raise FFmpegCancelled("ffmpeg process terminated")
+
+            if returncode != 0:
+                stderr_file.seek(0)
+                detail = stderr_file.read().decode("utf-8", "replace").strip()
+                raise FFmpegError(
+                    f"ffmpeg exited with code {returncode}: {detail[-500:]}"
+                )
+
+        if progress_callback:
+            progress_callback(100)
+
+    def terminate(self) -> None:
+        """Terminate the running ffmpeg process, killing it if it lingers."""
+        with self._lock:
+            self._terminated = True
+            process = self._process
+        if process is None or process.poll() is not None:
+            return
+        logger.info("Terminating ffmpeg process.")
+        try:
+            process.terminate()
+            process.wait(timeout=TERMINATE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            logger.warning("ffmpeg did not exit after terminate; killing it.")
+            process.kill()
+        except OSError as e:
+            logger.warning(f"Failed to terminate ffmpeg: {e}")
+
+
+def decode_audio(file_path: str, sampling_rate: int = 16000):
+    """Decode a media file to mono float32 samples (a NumPy array).
+
+    Mirrors what the transformers pipeline does for a file path, so the
+    caller can feed the audio to it piece by piece.
+    """
+    import numpy as np
+
+    ffmpeg = find_ffmpeg()
+    if not ffmpeg:
+        raise FFmpegError("ffmpeg not found")
+    cmd = [
+        ffmpeg, "-nostdin", "-hide_banner", "-loglevel", "error",
+        "-i", file_path, "-vn", "-ac", "1", "-ar", str(sampling_rate),
+        "-f", "f32le", "-",
+    ]
+    proc = subprocess.run(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        startupinfo=_startupinfo(),
+    )
+    if proc.returncode != 0:
+        detail = proc.stderr.decode("utf-8", "replace").strip()
+        raise FFmpegError(f"ffmpeg exited with code {proc.returncode}: {detail[-500:]}")
+    return np.frombuffer(proc.stdout, dtype=np.float32)
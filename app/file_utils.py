@@ -5,6 +5,8 @@ import shutil
 import tempfile
 import datetime
 import logging
+import threading
+from collections import OrderedDict
 from typing import Optional, Tuple, List
 import wave
 
@@ -16,10 +18,27 @@ from app.constants import (
     MAX_FILE_SIZE_MB,
     get_recordings_dir,
 )
+from app.audio_headers import read_header_duration
+from app.ffmpeg_utils import (
+    FFmpegProcess,
+    build_command,
+    copy_target_format,
+    file_signature,
+    find_ffmpeg,
+    get_cached_media_info,
+    is_directly_usable,
+    probe_media,
+)
 
 # Configure logging
 logger = logging.getLogger("transcribrr")
 
+# Durations in seconds keyed by (absolute path, size, mtime_ns), least
+# recently used first; a changed file gets a new key and the old one ages out
+DURATION_CACHE_MAX_ENTRIES = 1024
+_duration_cache: "OrderedDict[Tuple[str, int, int], float]" = OrderedDict()
+_duration_cache_lock = threading.Lock()
+
 
 def get_file_type(file_path: str) -> FileType:
     """Return file type based on extension."""
@@ -108,75 +127,175 @@ def safe_copy_file(source_path: str, target_dir: str = None) -> Optional[str]:
         return None
 
 
+def link_or_copy(source_path: str, target_path: str) -> str:
+    """Hard-link source to target, falling back to a copy across devices."""
+    try:
+        os.link(source_path, target_path)
+        logger.info(f"Hard-linked {source_path} to {target_path}")
+    except OSError:
+        shutil.copy2(source_path, target_path)
+        logger.info(f"File copied from {source_path} to {target_path}")
+    return target_path
+
+
+def import_media_file(source_path: str, dest_stem: str) -> Tuple[str, str]:
+    """Bring a media file into the library; return (new path, duration).
+
+    Supported audio is hard-linked or copied to ``dest_stem`` plus its
+    original extension. Anything else is converted with ffmpeg, stream-copying
+    mp3/aac tracks and encoding the rest to mp3. Without ffprobe/ffmpeg the
+    file is copied unchanged. Runs in worker processes during bulk import.
+    """
+    ext = os.path.splitext(source_path)[1].lower()
+    info = probe_media(source_path)
+    if info is not None and not info.has_audio:
+        raise ValueError("File contains no audio track")
+
+    ffmpeg = find_ffmpeg()
+    if info is None or ffmpeg is None or is_directly_usable(source_path, info):
+        dest_path = link_or_copy(source_path, dest_stem + ext)
+    else:
+        copy_format = copy_target_format(info.codec)
+        stream_copy = copy_format in ("mp3", "m4a")
+        dest_path = f"{dest_stem}.{copy_format if stream_copy else 'mp3'}"
+        try:
+            FFmpegProcess(
+                build_command(ffmpeg, source_path, dest_path, stream_copy),
+                duration=info.duration,
+            ).run()
+        except Exception:
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            raise
+
+    if info is not None and info.duration is not None:
+        duration = str(datetime.timedelta(seconds=int(info.duration)))
+    else:
+        duration = calculate_duration(dest_path)
+    return dest_path, duration
+
+
 def get_timestamp_string() -> str:
     """Return timestamp string."""
     return datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
 
 
-def calculate_duration(file_path: str) -> str:
-    """Return media duration string."""
-    try:
-        file_type = get_file_type(file_path)
+def _decode_duration(file_path: str) -> Optional[float]:
+    """Return duration in seconds by decoding the file (slow fallback)."""
+    file_type = get_file_type(file_path)
 
-        if file_type == FileType.AUDIO:
-            # Prefer pydub for audio duration (no heavy moviepy dependency)
-            try:
-                from pydub import AudioSegment
-
-                audio = AudioSegment.from_file(file_path)
-                duration_in_seconds = len(audio) / 1000.0
-                audio = None
-            except ImportError:
-                # Fallback to moviepy if pydub not available
-                try:
-                    from moviepy.editor import AudioFileClip  # type: ignore
-
-                    clip = AudioFileClip(file_path)
-                    duration_in_seconds = clip.duration
-                    clip.close()
-                except ImportError as mp_err:
-                    logger.error(
-                        f"Audio duration check failed "
-                        f"(pydub or moviepy required): {mp_err}"
-                    )
-                    return "00:00:00"
-            except Exception as e:
-                # Other errors with pydub, try moviepy fallback
-                try:
-                    from moviepy.editor import AudioFileClip  # type: ignore
-
-                    clip = AudioFileClip(file_path)
-                    duration_in_seconds = clip.duration
-                    clip.close()
-                except Exception as mp_err:
-                    logger.error(
-                        f"Audio duration check failed: {e}, "
-                        f"moviepy also failed: {mp_err}"
-                    )
-                    return "00:00:00"
-        elif file_type == FileType.VIDEO:
-            # Use moviepy for video if available
+    if file_type == FileType.AUDIO:
+        # Prefer pydub for audio duration (no heavy moviepy dependency)
+        try:
+            from pydub import AudioSegment
+
+            audio = AudioSegment.from_file(file_path)
+            duration_in_seconds = len(audio) / 1000.0
+            audio = None
+        except ImportError:
+            # Fallback to moviepy if pydub not available
             try:
-                from moviepy.editor import VideoFileClip  # type: ignore
+                from moviepy.editor import AudioFileClip  # type: ignore
 
-                clip = VideoFileClip(file_path)
+                clip = AudioFileClip(file_path)
                 duration_in_seconds = clip.duration
                 clip.close()
-            except ImportError as imp_err:
+            except ImportError as mp_err:
                 logger.error(
-                    f"Video duration check requires moviepy "
-                    f"(not installed): {imp_err}"
+                    f"Audio duration check failed "
+                    f"(pydub or moviepy required): {mp_err}"
                 )
-                return "00:00:00"
+                return None
+        except Exception as e:
+            # Other errors with pydub, try moviepy fallback
+            try:
+                from moviepy.editor import AudioFileClip  # type: ignore
+
+                clip = AudioFileClip(file_path)
+                duration_in_seconds = clip.duration
+                clip.close()
             except Exception as mp_err:
                 logger.error(
-                    f"Video duration check failed: {mp_err}"
+                    f"Audio duration check failed: {e}, "
+                    f"moviepy also failed: {mp_err}"
                 )
-                return "00:00:00"
-        else:
+                return None
+    elif file_type == FileType.VIDEO:
+        # Use moviepy for video if available
+        try:
+            from moviepy.editor import VideoFileClip  # type: ignore
+
+            clip = VideoFileClip(file_path)
+            duration_in_seconds = clip.duration
+            clip.close()
+        except ImportError as imp_err:
+            logger.error(
+                f"Video duration check requires moviepy "
+                f"(not installed): {imp_err}"
+            )
+            return None
+        except Exception as mp_err:
             logger.error(
-                f"Unsupported file type for duration calculation: {file_path}")
-            return "00:00:00"
+                f"Video duration check failed: {mp_err}"
+            )
+            return None
+    else:
+        logger.error(
+            f"Unsupported file type for duration calculation: {file_path}")
+        return None
+
+    return duration_in_seconds
+
+
+def probe_duration(file_path: str) -> Optional[float]:
+    """Return duration in seconds from metadata only, without decoding."""
+    # Reuse the ffprobe result from import when the file is unchanged
+    info = get_cached_media_info(file_path)
+    if info is not None and info.duration is not None:
+        return info.duration
+
+    duration = read_header_duration(file_path)
+    if duration is not None:
+        return duration
+
+    info = probe_media(file_path)
+    if info is not None:
+        return info.duration
+    return None
+
+
+def _cached_duration(key: Tuple[str, int, int]) -> Optional[float]:
+    with _duration_cache_lock:
+        duration = _duration_cache.get(key)
+        if duration is not None:
+            _duration_cache.move_to_end(key)
+        return duration
+
+
+def _store_duration(key: Tuple[str, int, int], duration: float) -> None:
+    with _duration_cache_lock:
+        _duration_cache[key] = duration
+        _duration_cache.move_to_end(key)
+        while len(_duration_cache) > DURATION_CACHE_MAX_ENTRIES:
+            _duration_cache.popitem(last=False)
+
+
+def calculate_duration(file_path: str) -> str:
+    """Return media duration string."""
+    try:
+        key = file_signature(file_path)
+        duration_in_seconds = _cached_duration(key) if key else None
+
+        if duration_in_seconds is None:
+            duration_in_seconds = probe_duration(file_path)
+            if duration_in_seconds is None:
+                logger.info(
+                    f"No duration in metadata for {file_path}, decoding file")
+                duration_in_seconds = _decode_duration(file_path)
+            if duration_in_seconds is None:
+                return "00:00:00"
+            if key:
+                _store_duration(key, duration_in_seconds)
 
         # Format the duration as HH:MM:SS
         duration_str = str(datetime.timedelta(
@@ -0,0 +1,135 @@
+"""Non-blocking logging pipeline.
+
+Loggers only enqueue records: a QueueHandler on the root logger hands them
+to a QueueListener thread, which redacts, formats and writes them to the
+console and a rotating log file. Logging from the UI thread or a worker
+never waits on disk I/O or the redaction regex.
+
+Message formatting is deferred too, so hot paths should pass %-style
+arguments (``logger.debug("Loaded %d items", n)``) rather than f-strings.
+Only strings, numbers and None are deferred; other arguments may change or
+belong to another thread by the time the listener runs, so those messages
+are merged when the record is enqueued.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from collections.abc import Mapping
+from typing import Optional
+
+from app.secure import SensitiveLogFilter
+
+LOG_MAX_BYTES = 5 * 1024 * 1024  # 5 MB per log file
+LOG_BACKUP_COUNT = 3  # keep up to 15 MB total
+DEFAULT_LOG_FORMAT = (
+    "%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s"
+)
+
+# Argument types that can't change before the listener formats the message
+_DEFERRABLE_ARG_TYPES = (str, bytes, int, float, type(None))
+
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread.
+
+    The stock handler merges msg and args before enqueueing; here messages
+    whose arguments are all strings, numbers or None are left unmerged, so
+    unused debug arguments and the redaction regex cost the logging thread
+    nothing. Any other argument is formatted now, while it still holds the
+    value it had when logged. Tracebacks are always rendered here, as the
+    stock handler does, since the exception's frames can change later.
+    """
+
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        args = record.args
+        values = args.values() if isinstance(args, Mapping) else (args or ())
+        if not isinstance(record.msg, str) or not all(
+            isinstance(value, _DEFERRABLE_ARG_TYPES) for value in values
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(
+    level: int = logging.INFO,
+    fmt: str = DEFAULT_LOG_FORMAT,
+    log_file: Optional[str] = None,
+) -> QueueListener:
+    """Route root logging through a queue; return the running listener.
+
+    Safe to call more than once: later calls return the existing listener.
+    Handlers already attached to the root logger are moved behind the queue.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        root = logging.getLogger()
+        handlers = list(root.handlers)
+        for handler in handlers:
+            root.removeHandler(handler)
+        if not handlers:
+            handlers.append(logging.StreamHandler())
+            if log_file:
+                handlers.append(
+                    RotatingFileHandler(
+                        log_file,
+                        maxBytes=LOG_MAX_BYTES,
+                        backupCount=LOG_BACKUP_COUNT,
+                        encoding="utf-8",
+                    )
+                )
+
+        # Filters on the handlers (not the loggers) run on the listener thread,
+        # and catch records from every logger, not just ones logged at root
+        formatter = logging.Formatter(fmt)
+        redaction = SensitiveLogFilter()
+        for handler in handlers:
+            if handler.formatter is None:
+                handler.setFormatter(formatter)
+            handler.addFilter(redaction)
+
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        root.addHandler(DeferredQueueHandler(log_queue))
+        root.setLevel(level)
+
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+        return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread.
+
+    The handlers are reattached to the root logger, so anything logged
+    during shutdown is still written (synchronously).
+    """
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+        if listener is None:
+            return
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, DeferredQueueHandler):
+                root.removeHandler(handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.flush()
+            root.addHandler(handler)
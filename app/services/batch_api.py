@@ -0,0 +1,285 @@
+"""OpenAI Batch API support for bulk GPT processing.
+
+Processing hundreds of transcripts with the same prompt is cheaper and
+gentler on rate limits through the Batch API than through one chat
+completion per recording. A job is packaged as a JSONL file with one
+chat completion request per recording, uploaded, and submitted as a
+batch; the server runs it within 24 hours. Jobs are recorded in a small
+JSON file in the database directory so polling can resume after the app
+restarts, and results are applied to recordings once the output is ready.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass, field, fields
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.constants import get_database_dir
+from app.services.llm_endpoints import normalize_base_url
+
+logger = logging.getLogger("transcribrr")
+
+CHAT_COMPLETIONS_PATH = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+REQUEST_TIMEOUT = (10, 120)  # (connect, read) seconds
+
+# Batch statuses reported by the API
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+_CUSTOM_ID_PREFIX = "recording-"
+
+
+def custom_id_for(recording_id: int) -> str:
+    return f"{_CUSTOM_ID_PREFIX}{recording_id}"
+
+
+def recording_id_for(custom_id: str) -> Optional[int]:
+    """Return the recording ID encoded in a custom_id, or None."""
+    if not custom_id or not custom_id.startswith(_CUSTOM_ID_PREFIX):
+        return None
+    try:
+        return int(custom_id[len(_CUSTOM_ID_PREFIX):])
+    except ValueError:
+        return None
+
+
+def build_batch_jsonl(
+    items: Iterable[Tuple[int, str]],
+    prompt: str,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+) -> str:
+    """Return Batch API input with one chat request per (recording_id, transcript).
+
+    Messages match what GPT4ProcessingThread sends for a single recording,
+    so batch results are interchangeable with interactive ones.
+    """
+    lines = []
+    for recording_id, transcript in items:
+        request = {
+            "custom_id": custom_id_for(recording_id),
+            "method": "POST",
+            "url": CHAT_COMPLETIONS_PATH,
+            "body": {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": transcript},
+                ],
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+            },
+        }
+        lines.append(json.dumps(request, ensure_ascii=False))
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def parse_batch_output(
+    content: str,
+) -> Tuple[Dict[int, str], Dict[int, str]]:
+    """Parse a Batch API output or error file.
+
+    Returns (results, errors), both keyed by recording ID: the completion
+    text for each successful request and a message for each failed one.
+    """
+    results: Dict[int, str] = {}
+    errors: Dict[int, str] = {}
+    for line_number, line in enumerate(content.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed batch output line {line_number}: {e}")
+            continue
+        recording_id = recording_id_for(entry.get("custom_id", ""))
+        if recording_id is None:
+            logger.warning(f"Skipping batch output line {line_number}: unknown custom_id")
+            continue
+
+        response = entry.get("response") or {}
+        status = response.get("status_code")
+        error = entry.get("error")
+        if not error and status is not None and status >= 400:
+            error = (response.get("body") or {}).get("error") or f"HTTP {status}"
+        if error:
+            message = error.get("message") if isinstance(error, dict) else None
+            errors[recording_id] = message or str(error)
+            continue
+        try:
+            text = response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            errors[recording_id] = "Response contained no completion"
+            continue
+        results[recording_id] = text or ""
+    return results, errors
+
+
+class BatchClient:
+    """Minimal client for the /files and /batches endpoints."""
+
+    def __init__(self, api_key: Optional[str], base_url: Optional[str] = None):
+        self.api_key = api_key
+        self.base_url = normalize_base_url(base_url)
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    def _request(self, method: str, path: str, **kwargs):
+        from app.services.http_client import get_session
+
+        response = get_session().request(
+            method, f"{self.base_url}{path}", headers=self._headers(),
+            timeout=REQUEST_TIMEOUT, **kwargs,
+        )
+        response.raise_for_status()
+        return response
+
+    def upload_file(self, content: str, filename: str = "batch.jsonl") -> str:
+        """Upload batch input and return its file ID."""
+        response = self._request(
+            "POST", "/files",
+            data={"purpose": "batch"},
+            files={"file": (filename, content.encode("utf-8"), "application/jsonl")},
+        )
+        return response.json()["id"]
+
+    def create_batch(self, input_file_id: str,
+                     metadata: Optional[Dict[str, str]] = None) -> Dict:
+        payload = {
+            "input_file_id": input_file_id,
+            "endpoint": CHAT_COMPLETIONS_PATH,
+            "completion_window": COMPLETION_WINDOW,
+        }
+        if metadata:
+            payload["metadata"] = metadata
+        return self._request("POST", "/batches", json=payload).json()
+
+    def get_batch(self, batch_id: str) -> Dict:
+        return self._request("GET", f"/batches/{batch_id}").json()
+
+    def cancel_batch(self, batch_id: str) -> Dict:
+        return self._request("POST", f"/batches/{batch_id}/cancel").json()
+
+    def download_file(self, file_id: str) -> str:
+        response = self._request("GET", f"/files/{file_id}/content")
+        response.encoding = response.encoding or "utf-8"
+        return response.text
+
+
+@dataclass
+class BatchJob:
+    """A submitted (or about to be submitted) batch and its progress."""
+
+    job_id: str
+    recording_ids: List[int]
+    model: str
+    base_url: str
+    created_at: float
+    status: str = "pending"  # pending = not yet submitted
+    batch_id: Optional[str] = None
+    input_file_id: Optional[str] = None
+    output_file_id: Optional[str] = None
+    error_file_id: Optional[str] = None
+    completed_requests: int = 0
+    failed_requests: int = 0
+    applied: bool = False  # results written to the recordings
+    error: Optional[str] = None
+    input_jsonl: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "BatchJob":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    def update_from_batch(self, batch: Dict) -> None:
+        """Copy status, file IDs and request counts from a batch object."""
+        self.batch_id = batch.get("id", self.batch_id)
+        self.status = batch.get("status", self.status)
+        self.output_file_id = batch.get("output_file_id") or self.output_file_id
+        self.error_file_id = batch.get("error_file_id") or self.error_file_id
+        counts = batch.get("request_counts") or {}
+        self.completed_requests = counts.get("completed", self.completed_requests)
+        self.failed_requests = counts.get("failed", self.failed_requests)
+        batch_errors = (batch.get("errors") or {}).get("data") or []
+        if batch_errors:
+            self.error = "; ".join(
+                e.get("message", "") for e in batch_errors if isinstance(e, dict))
+
+
+def new_job(recording_ids: List[int], model: str, base_url: Optional[str],
+            input_jsonl: str) -> BatchJob:
+    return BatchJob(
+        job_id=uuid.uuid4().hex,
+        recording_ids=list(recording_ids),
+        model=model,
+        base_url=normalize_base_url(base_url),
+        created_at=time.time(),
+        input_jsonl=input_jsonl,
+    )
+
+
+class BatchJobStore:
+    """Jobs persisted as JSON so polling survives restarts; thread-safe."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(get_database_dir(), "batch_jobs.json")
+        self._lock = Lock()
+
+    def _read(self) -> Dict[str, BatchJob]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read batch jobs from {self.path}: {e}")
+            return {}
+        return {job["job_id"]: BatchJob.from_dict(job) for job in data.get("jobs", [])}
+
+    def _write(self, jobs: Dict[str, BatchJob]) -> None:
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"jobs": [asdict(job) for job in jobs.values()]}, f, indent=2)
+            os.replace(tmp_path, self.path)  # atomic, so a crash can't truncate it
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def all(self) -> List[BatchJob]:
+        with self._lock:
+            return list(self._read().values())
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        with self._lock:
+            return self._read().get(job_id)
+
+    def save(self, job: BatchJob) -> None:
+        with self._lock:
+            jobs = self._read()
+            jobs[job.job_id] = job
+            self._write(jobs)
+
+    def remove(self, job_id: str) -> None:
+        with self._lock:
+            jobs = self._read()
+            if jobs.pop(job_id, None) is not None:
+                self._write(jobs)
+
+    def unfinished(self) -> List[BatchJob]:
+        """Jobs still to submit, poll, or apply results for."""
+        return [job for job in self.all() if not job.applied]
@@ -0,0 +1,184 @@
+"""Pick ASR pipeline batch sizes from the memory actually available.
+
+A batch of 30-second chunks needs activation memory on top of the model
+weights. The tuner measures free memory on the target device (free VRAM
+device-wide for CUDA, so memory held by other processes counts; available
+RAM for CPU and Apple's unified memory), assumes each batch item needs a
+fixed share of the model's size, and takes the largest power of two that
+fits. When a batch still runs out of memory the caller halves it and
+reports the OOM here; that ceiling is kept per machine, model and device
+in a JSON file in the user data directory so later jobs start below it.
+"""
+
+import json
+import logging
+import os
+import platform
+import tempfile
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from app.constants import get_user_data_dir
+
+logger = logging.getLogger("transcribrr")
+
+DEFAULT_BATCH_SIZE = 8  # used when free memory can't be measured
+MAX_BATCH_SIZE = 16
+MEMORY_HEADROOM = 0.8  # use at most this share of the free memory
+ITEM_MEMORY_FRACTION = 0.25  # activation memory per item, relative to model size
+MIN_ITEM_BYTES = 256 * 1024**2
+
+
+def is_out_of_memory(error: BaseException) -> bool:
+    """Return True for CUDA/MPS/CPU allocation failures."""
+    if isinstance(error, MemoryError) or error.__class__.__name__ == "OutOfMemoryError":
+        return True
+    return "out of memory" in str(error).lower()
+
+
+def free_memory_bytes(device: str) -> Optional[int]:
+    """Return memory free for new allocations on device, or None if unknown."""
+    try:
+        if device.startswith("cuda"):
+            import torch
+
+            free, _total = torch.cuda.mem_get_info()
+            return int(free)
+        import psutil
+
+        return int(psutil.virtual_memory().available)
+    except Exception as e:
+        logger.debug(f"Could not measure free memory on {device}: {e}")
+        return None
+
+
+def model_size_bytes(model: Any) -> Optional[int]:
+    """Return the size of a torch model's weights, or None if unknown."""
+    try:
+        return int(sum(p.numel() * p.element_size() for p in model.parameters()))
+    except Exception:
+        return None
+
+
+def pick_batch_size(
+    free_bytes: Optional[int],
+    model_bytes: Optional[int],
+    ceiling: int = MAX_BATCH_SIZE,
+) -> int:
+    """Return the largest power-of-two batch that fits in free_bytes.
+
+    free_bytes is measured with the model already loaded, so only the
+    per-item activation memory has to fit.
+    """
+    ceiling = max(1, min(ceiling, MAX_BATCH_SIZE))
+    if free_bytes is None:
+        return min(DEFAULT_BATCH_SIZE, ceiling)
+    per_item = max(MIN_ITEM_BYTES, int((model_bytes or 0) * ITEM_MEMORY_FRACTION))
+    fits = int(free_bytes * MEMORY_HEADROOM) // per_item
+    batch = 1
+    while batch * 2 <= min(fits, ceiling):
+        batch *= 2
+    return batch
+
+
+def machine_fingerprint(device: str) -> str:
+    """Identify the machine and accelerator tuned values were measured on."""
+    parts = [platform.node(), platform.machine()]
+    if device.startswith("cuda"):
+        try:
+            import torch
+
+            props = torch.cuda.get_device_properties(0)
+            parts += [props.name, str(props.total_memory)]
+        except Exception:
+            pass
+    return "|".join(parts)
+
+
+class BatchTuner:
+    """Batch sizes per (model, device), with OOM ceilings kept on disk."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(get_user_data_dir(), "batch_tuning.json")
+        self._lock = Lock()
+        self._data: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _entries(self) -> Dict[str, Dict[str, Any]]:
+        """Load the tuning file on first use. Caller holds _lock."""
+        if self._data is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except FileNotFoundError:
+                self._data = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read batch tuning from {self.path}: {e}")
+                self._data = {}
+        return self._data
+
+    def _write(self) -> None:
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _key(model_id: str, device: str) -> str:
+        return f"{machine_fingerprint(device)}|{model_id}|{device}"
+
+    def entry(self, model_id: str, device: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._entries().get(self._key(model_id, device), {}))
+
+    def batch_size(self, model_id: str, device: str, model: Any = None) -> int:
+        """Return the batch size to use now for model_id on device."""
+        ceiling = self.entry(model_id, device).get("max_batch_size", MAX_BATCH_SIZE)
+        batch = pick_batch_size(
+            free_memory_bytes(device), model_size_bytes(model), ceiling
+        )
+        logger.debug("Batch size %d for %s on %s (ceiling %d)", batch, model_id, device, ceiling)
+        return batch
+
+    def _update(self, model_id: str, device: str, **values: Any) -> None:
+        with self._lock:
+            entries = self._entries()
+            entries.setdefault(self._key(model_id, device), {}).update(values)
+            try:
+                self._write()
+            except OSError as e:
+                logger.warning(f"Could not save batch tuning: {e}")
+
+    def record_oom(self, model_id: str, device: str, batch_size: int) -> int:
+        """Lower the ceiling after batch_size ran out of memory; return the next size."""
+        smaller = max(1, batch_size // 2)
+        logger.warning(
+            f"Out of memory at batch size {batch_size} for {model_id} on {device}; "
+            f"retrying with {smaller}"
+        )
+        self._update(model_id, device, max_batch_size=smaller)
+        return smaller
+
+    def record_success(self, model_id: str, device: str, batch_size: int) -> None:
+        """Remember the batch size that last completed a job."""
+        if self.entry(model_id, device).get("last_good_batch_size") != batch_size:
+            self._update(model_id, device, last_good_batch_size=batch_size)
+
+
+_tuner: Optional[BatchTuner] = None
+_tuner_lock = Lock()
+
+
+def get_batch_tuner() -> BatchTuner:
+    """Return the process-wide tuner."""
+    global _tuner
+    with _tuner_lock:
+        if _tuner is None:
+            _tuner = BatchTuner()
+        return _tuner
@@ -0,0 +1,135 @@
+"""Process-wide pooled HTTP clients for OpenAI traffic.
+
+Creating a client per request pays a fresh TCP and TLS handshake every
+time. This module hands out shared, thread-safe clients instead:
+
+* get_session() - a requests.Session with a keep-alive connection pool,
+  used by the GPT processing threads.
+* get_httpx_client() - an httpx.Client for the OpenAI SDK (Whisper API),
+  negotiating HTTP/2 when the optional 'h2' package is installed.
+
+Pool sizes come from the "http_pool_size" setting unless configure() is
+called first.
+"""
+
+import logging
+from threading import Lock
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("transcribrr")
+
+DEFAULT_POOL_SIZE = 10  # connections kept alive per host
+POOL_CONNECTIONS = 4  # distinct hosts with a cached pool
+KEEPALIVE_EXPIRY = 60.0  # seconds an idle httpx connection stays open
+
+_lock = Lock()
+_session: Optional[requests.Session] = None
+_httpx_client: Any = None
+_pool_size: Optional[int] = None
+_http2: Optional[bool] = None
+
+
+def _settings() -> tuple:
+    """Return (pool_size, http2) from configure() or the app config."""
+    pool_size, http2 = _pool_size, _http2
+    if pool_size is None or http2 is None:
+        try:
+            from app.utils import ConfigManager
+
+            config = ConfigManager.instance()
+            if pool_size is None:
+                pool_size = config.get("http_pool_size", DEFAULT_POOL_SIZE)
+            if http2 is None:
+                http2 = config.get("http2_enabled", True)
+        except Exception as e:  # Qt unavailable or config not loaded
+            logger.debug(f"Using default HTTP pool settings: {e}")
+    try:
+        pool_size = max(1, int(pool_size))
+    except (TypeError, ValueError):
+        pool_size = DEFAULT_POOL_SIZE
+    return pool_size, True if http2 is None else bool(http2)
+
+
+def configure(pool_size: Optional[int] = None,
+              http2: Optional[bool] = None) -> None:
+    """Override pool settings; existing clients are rebuilt on next use."""
+    global _pool_size, _http2
+    with _lock:
+        _pool_size = pool_size
+        _http2 = http2
+    close_all()
+
+
+def http2_available() -> bool:
+    """Return True when httpx can negotiate HTTP/2 (needs the 'h2' package)."""
+    try:
+        import h2  # type: ignore  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_session() -> requests.Session:
+    """Return the shared requests session, creating it on first use."""
+    global _session
+    with _lock:
+        if _session is None:
+            pool_size, _ = _settings()
+            session = requests.Session()
+            # Retries are handled by callers, which know what is safe to resend
+            adapter = HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=pool_size,
+                max_retries=0,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+            logger.debug(f"Created shared HTTP session (pool size {pool_size})")
+        return _session
+
+
+def get_httpx_client() -> Any:
+    """Return the shared httpx client, or None if httpx isn't installed."""
+    global _httpx_client
+    with _lock:
+        if _httpx_client is None:
+            try:
+                import httpx  # type: ignore
+            except ImportError:
+                return None
+            pool_size, http2 = _settings()
+            http2 = http2 and http2_available()
+            _httpx_client = httpx.Client(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=pool_size * POOL_CONNECTIONS,
+                    max_keepalive_connections=pool_size,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                ),
+                # Match the OpenAI SDK defaults: long reads for transcription
+                timeout=httpx.Timeout(600.0, connect=10.0),
+                follow_redirects=True,
+            )
+            logger.debug(
+                f"Created shared httpx client (pool size {pool_size}, "
+                f"HTTP/2 {'on' if http2 else 'off'})"
+            )
+        return _httpx_client
+
+
+def close_all() -> None:
+    """Close the shared clients; the next get_* call creates new ones."""
+    global _session, _httpx_client
+    with _lock:
+        session, _session = _session, None
+        client, _httpx_client = _httpx_client, None
+    for resource in (session, client):
+        if resource is not None:
+            try:
+                resource.close()
+            except Exception as e:
+                logger.warning(f"Error closing shared HTTP client: {e}")
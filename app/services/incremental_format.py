@@ -0,0 +1,266 @@
+"""Paragraph-level diffing for incremental smart formatting.
+
+Smart formatting output is stored as a sequence of HTML blocks, each
+preceded by a marker comment listing hashes of the text lines the block
+renders to:
+
+    <!--tf:1a2b3c4d5e6f.0f9e8d7c6b5a--><h3>Intro</h3><p>Hello ...</p>
+
+The editor shows that HTML, so the next smart format request arrives as
+its plain text. Lines are matched against the stored blocks: runs that
+match a block exactly reuse its HTML, and only the remaining lines are
+sent to the model, grouped into small blocks that can be formatted in
+parallel. Qt ignores HTML comments, so the markers are invisible.
+
+The first format of a text has nothing to diff against and is sent whole,
+so the model sees the entire document; mark_document then splits its
+output at top-level block elements and adds the markers.
+"""
+
+import hashlib
+import html
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.services.text_chunker import estimate_tokens
+
+BLOCK_TOKENS = 400  # target size of a block sent for formatting
+
+_MARKER_RE = re.compile(r"<!--tf:([0-9a-f.]*)-->")
+_WHITESPACE_RE = re.compile(r"\s+")
+_FENCE_RE = re.compile(r"^\s*```(?:html)?\s*\n?|\n?\s*```\s*$", re.IGNORECASE)
+_WRAPPER_RE = re.compile(
+    r"</?(?:html|body)[^>]*>|<head>.*?</head>|<!DOCTYPE[^>]*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_BLOCK_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6",
+    "blockquote", "pre", "tr", "table", "hr",
+}
+
+
+@dataclass
+class FormatBlock:
+    """Consecutive input lines and their formatted HTML (None = to format)."""
+
+    lines: List[str]
+    html: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+def line_hash(line: str) -> str:
+    """Hash a line with whitespace normalised, as a short hex digest."""
+    normalized = _WHITESPACE_RE.sub(" ", line).strip()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+def split_lines(text: str) -> List[str]:
+    """Return the non-blank lines of text (one per editor paragraph)."""
+    return [line for line in text.splitlines() if line.strip()]
+
+
+class _TextExtractor(HTMLParser):
+    """Approximate QTextDocument.toPlainText(): one line per block element."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("style", "script", "head"):
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in ("style", "script", "head"):
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            # Source newlines inside a paragraph render as spaces
+            self.parts.append(data.replace("\n", " "))
+
+
+def html_to_lines(fragment: str) -> List[str]:
+    """Return the non-blank text lines an HTML fragment renders to."""
+    parser = _TextExtractor()
+    parser.feed(fragment)
+    parser.close()
+    return split_lines("".join(parser.parts))
+
+
+def clean_fragment(response: str) -> str:
+    """Strip code fences and document wrappers from a model's HTML reply."""
+    text = _FENCE_RE.sub("", response.strip())
+    return _WRAPPER_RE.sub("", text).strip()
+
+
+def parse_blocks(formatted_html: Optional[str]) -> Dict[Tuple[str, ...], str]:
+    """Map line-hash tuples to their HTML in a previously formatted document."""
+    blocks: Dict[Tuple[str, ...], str] = {}
+    if not formatted_html:
+        return blocks
+    matches = list(_MARKER_RE.finditer(formatted_html))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(formatted_html)
+        hashes = tuple(h for h in match.group(1).split(".") if h)
+        if hashes:
+            blocks[hashes] = formatted_html[match.end():end].strip()
+    return blocks
+
+
+def has_markers(formatted_html: Optional[str]) -> bool:
+    """Return True if formatted_html carries block markers to diff against."""
+    return bool(formatted_html) and _MARKER_RE.search(formatted_html) is not None
+
+
+class _TopLevelSplitter(HTMLParser):
+    """Record offsets where top-level block elements start."""
+
+    _VOID_TAGS = {"br", "hr", "img", "meta", "link", "input", "col", "wbr"}
+
+    def __init__(self, source: str):
+        super().__init__(convert_charrefs=True)
+        self.cuts: List[int] = []
+        self._depth = 0
+        self._line_starts = [0]
+        for line in source.splitlines(keepends=True):
+            self._line_starts.append(self._line_starts[-1] + len(line))
+
+    def _offset(self) -> int:
+        line, column = self.getpos()
+        return self._line_starts[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        if self._depth == 0 and tag in _BLOCK_TAGS:
+            self.cuts.append(self._offset())
+        if tag not in self._VOID_TAGS:
+            self._depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if self._depth == 0 and tag in _BLOCK_TAGS:
+            self.cuts.append(self._offset())
+
+    def handle_endtag(self, tag):
+        if tag not in self._VOID_TAGS:
+            self._depth = max(0, self._depth - 1)
+
+
+def split_top_level(fragment: str) -> List[str]:
+    """Split an HTML fragment before each top-level block element."""
+    splitter = _TopLevelSplitter(fragment)
+    splitter.feed(fragment)
+    splitter.close()
+    cuts = [cut for cut in splitter.cuts if cut > 0]
+    bounds = [0] + cuts + [len(fragment)]
+    pieces = [fragment[start:end].strip() for start, end in zip(bounds, bounds[1:])]
+    return [piece for piece in pieces if piece]
+
+
+def mark_document(formatted_html: str) -> str:
+    """Add block markers to a whole-document format result.
+
+    Output that already has markers (from an incremental run) is returned
+    unchanged.
+    """
+    if not formatted_html or has_markers(formatted_html):
+        return formatted_html
+    blocks: List[FormatBlock] = []
+    for piece in split_top_level(clean_fragment(formatted_html)):
+        lines = html_to_lines(piece)
+        if blocks and not lines:
+            # Spacing elements (<br>, <hr>) belong with the block before them
+            blocks[-1].html += piece
+            continue
+        blocks.append(FormatBlock(lines, piece))
+    return render_blocks(blocks) if blocks else formatted_html
+
+
+def _group(lines: List[str], max_tokens: int,
+           count: Callable[[str], int]) -> List[FormatBlock]:
+    """Pack changed lines into blocks of roughly max_tokens each."""
+    blocks: List[FormatBlock] = []
+    current: List[str] = []
+    size = 0
+    for line in lines:
+        tokens = count(line)
+        if current and size + tokens > max_tokens:
+            blocks.append(FormatBlock(current))
+            current, size = [], 0
+        current.append(line)
+        size += tokens
+    if current:
+        blocks.append(FormatBlock(current))
+    return blocks
+
+
+def plan_blocks(
+    text: str,
+    previous_html: Optional[str],
+    max_tokens: int = BLOCK_TOKENS,
+    count: Optional[Callable[[str], int]] = None,
+) -> List[FormatBlock]:
+    """Split text into blocks, reusing formatted HTML for unchanged runs.
+
+    Returned blocks are in document order; those with html=None still need
+    formatting.
+    """
+    count = count or estimate_tokens
+    previous = parse_blocks(previous_html)
+    by_first: Dict[str, List[Tuple[str, ...]]] = {}
+    for hashes in previous:
+        by_first.setdefault(hashes[0], []).append(hashes)
+    # Try longer blocks first so a block isn't shadowed by a prefix of itself
+    for candidates in by_first.values():
+        candidates.sort(key=len, reverse=True)
+
+    lines = split_lines(text)
+    hashes = [line_hash(line) for line in lines]
+    blocks: List[FormatBlock] = []
+    changed: List[str] = []
+    i = 0
+    while i < len(lines):
+        match = next(
+            (
+                candidate
+                for candidate in by_first.get(hashes[i], [])
+                if tuple(hashes[i:i + len(candidate)]) == candidate
+            ),
+            None,
+        )
+        if match is None:
+            changed.append(lines[i])
+            i += 1
+            continue
+        blocks.extend(_group(changed, max_tokens, count))
+        changed = []
+        blocks.append(FormatBlock(lines[i:i + len(match)], previous[match]))
+        i += len(match)
+    blocks.extend(_group(changed, max_tokens, count))
+    return blocks
+
+
+def render_blocks(blocks: List[FormatBlock]) -> str:
+    """Join formatted blocks into HTML, marking each with its line hashes.
+
+    Hashes describe the lines each block renders to, which is what the
+    editor will hand back on the next request.
+    """
+    parts = []
+    for block in blocks:
+        fragment = block.html if block.html is not None else (
+            "".join(f"<p>{html.escape(line)}</p>" for line in block.lines)
+        )
+        rendered = html_to_lines(fragment)
+        marker = ".".join(line_hash(line) for line in rendered)
+        parts.append(f"<!--tf:{marker}-->{fragment}")
+    return "\n".join(parts)
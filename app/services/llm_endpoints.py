@@ -0,0 +1,180 @@
+"""OpenAI-compatible chat endpoints: URLs, concurrency slots and health checks.
+
+Besides api.openai.com, GPT requests can go to any server implementing the
+OpenAI chat completions API (llama.cpp server, vLLM, Ollama). Remote
+endpoints must use HTTPS; plain HTTP is only accepted for loopback and
+private-network hosts. Each endpoint gets its own concurrency limit, so a
+single-slot local server isn't flooded by parallel chunk requests.
+
+The OpenAI API key is only ever sent to api.openai.com. Any other endpoint
+uses its own optional key, stored with app.secure under
+endpoint_key_name(base_url), or no Authorization header at all.
+"""
+
+import ipaddress
+import logging
+import time
+from contextlib import contextmanager
+from threading import BoundedSemaphore, Lock
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger("transcribrr")
+
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+OPENAI_HOST = "api.openai.com"
+OPENAI_KEY_NAME = "OPENAI_API_KEY"
+ENDPOINT_KEY_PREFIX = "LLM_API_KEY:"
+DEFAULT_REMOTE_CONCURRENCY = 8
+DEFAULT_LOCAL_CONCURRENCY = 1  # llama.cpp and Ollama serve one request per slot
+HEALTH_TIMEOUT = 3.0  # seconds
+HEALTH_TTL = 30.0  # seconds a health check result is reused
+SLOT_POLL_INTERVAL = 0.25  # seconds between cancellation checks
+
+_semaphores: Dict[str, BoundedSemaphore] = {}
+_health: Dict[str, Tuple[float, bool, str]] = {}
+_lock = Lock()
+
+
+def normalize_base_url(base_url: Optional[str]) -> str:
+    """Return base_url without a trailing slash, defaulting to OpenAI."""
+    return (base_url or "").strip().rstrip("/") or OPENAI_BASE_URL
+
+
+def chat_completions_url(base_url: Optional[str]) -> str:
+    return f"{normalize_base_url(base_url)}/chat/completions"
+
+
+def is_local(base_url: Optional[str]) -> bool:
+    """Return True for loopback, private-network and .local hosts."""
+    host = urlparse(normalize_base_url(base_url)).hostname or ""
+    if host == "localhost" or host.endswith(".local"):
+        return True
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return address.is_loopback or address.is_private
+
+
+def is_openai(base_url: Optional[str]) -> bool:
+    """Return True if base_url is OpenAI's own API."""
+    parsed = urlparse(normalize_base_url(base_url))
+    return parsed.scheme == "https" and parsed.hostname == OPENAI_HOST
+
+
+def endpoint_key_name(base_url: Optional[str]) -> str:
+    """Return the app.secure key name holding base_url's API key."""
+    if is_openai(base_url):
+        return OPENAI_KEY_NAME
+    return ENDPOINT_KEY_PREFIX + normalize_base_url(base_url)
+
+
+def endpoint_api_key(
+    base_url: Optional[str],
+    get_key: Optional[Callable[[str], Optional[str]]] = None,
+) -> Optional[str]:
+    """Return the API key to send to base_url, or None if it has none.
+
+    get_key defaults to app.secure.get_api_key.
+    """
+    if get_key is None:
+        from app.secure import get_api_key as get_key
+    try:
+        return get_key(endpoint_key_name(base_url)) or None
+    except Exception as e:  # keyring unavailable
+        logger.warning(f"Could not read the API key for {normalize_base_url(base_url)}: {e}")
+        return None
+
+
+def validate_base_url(base_url: Optional[str]) -> str:
+    """Return the normalised URL, or raise ValueError if it isn't allowed."""
+    url = normalize_base_url(base_url)
+    scheme = urlparse(url).scheme
+    if scheme == "https":
+        return url
+    if scheme == "http" and is_local(url):
+        return url
+    raise ValueError("API URL must use HTTPS for security")
+
+
+def _configured_concurrency(url: str) -> int:
+    default = DEFAULT_LOCAL_CONCURRENCY if is_local(url) else DEFAULT_REMOTE_CONCURRENCY
+    try:
+        from app.utils import ConfigManager
+
+        limits = ConfigManager.instance().get("llm_endpoint_concurrency", {}) or {}
+        value = limits.get(url, limits.get(url + "/", default))
+        return max(1, int(value))
+    except Exception as e:  # Qt unavailable, config not loaded or bad value
+        logger.debug(f"Using default concurrency for {url}: {e}")
+        return default
+
+
+@contextmanager
+def endpoint_slot(
+    base_url: Optional[str],
+    cancel_check: Optional[Callable[[], bool]] = None,
+) -> Iterator[bool]:
+    """Hold one of the endpoint's concurrent request slots.
+
+    Yields True once a slot is held, or False if cancel_check() became true
+    while waiting for one.
+    """
+    url = normalize_base_url(base_url)
+    with _lock:
+        semaphore = _semaphores.get(url)
+        if semaphore is None:
+            semaphore = BoundedSemaphore(_configured_concurrency(url))
+            _semaphores[url] = semaphore
+    while not semaphore.acquire(timeout=SLOT_POLL_INTERVAL):
+        if cancel_check is not None and cancel_check():
+            yield False
+            return
+    try:
+        yield True
+    finally:
+        semaphore.release()
+
+
+def check_health(
+    base_url: Optional[str],
+    api_key: Optional[str] = None,
+    use_cached: bool = True,
+) -> Tuple[bool, str]:
+    """Return (healthy, message) from a GET of the endpoint's /models list.
+
+    Results are cached for HEALTH_TTL seconds so repeated requests don't
+    each pay a round trip.
+    """
+    url = normalize_base_url(base_url)
+    now = time.monotonic()
+    if use_cached:
+        with _lock:
+            cached = _health.get(url)
+        if cached and now - cached[0] < HEALTH_TTL:
+            return cached[1], cached[2]
+
+    import requests
+
+    from app.services.http_client import get_session
+
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+    try:
+        response = get_session().get(
+            f"{url}/models", headers=headers, timeout=HEALTH_TIMEOUT)
+        try:
+            healthy = response.status_code < 500
+            message = f"HTTP {response.status_code}"
+        finally:
+            response.close()
+    except requests.exceptions.RequestException as e:
+        healthy, message = False, str(e)
+
+    if healthy:
+        logger.debug(f"LLM endpoint {url} is healthy ({message})")
+    else:
+        logger.warning(f"LLM endpoint {url} failed health check: {message}")
+    with _lock:
+        _health[url] = (now, healthy, message)
+    return healthy, message
@@ -0,0 +1,247 @@
+"""Client-side rate limiting for OpenAI requests.
+
+A RateLimiter holds two token buckets, requests per minute and tokens per
+minute, shared by every thread calling the same model. Callers acquire()
+before sending, which blocks until both buckets allow the request; waiting
+callers are served strictly by priority, then arrival order. Limits start
+from the configured values (or unlimited) and are corrected from the
+x-ratelimit-* headers of each response, and a 429 pauses the whole
+limiter for the server's Retry-After.
+"""
+
+import email.utils
+import heapq
+import itertools
+import logging
+import random
+import re
+import time
+from threading import Condition, Lock
+from typing import Callable, Dict, Mapping, Optional
+
+logger = logging.getLogger("transcribrr")
+
+# Lower values are served first
+RATE_PRIORITY_INTERACTIVE = 0
+RATE_PRIORITY_NORMAL = 5
+RATE_PRIORITY_BATCH = 10
+
+POLL_INTERVAL = 0.25  # seconds between cancellation checks while waiting
+MAX_BACKOFF = 60.0  # seconds
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse an x-ratelimit-reset-* value such as "1s", "6m0s" or "20ms"."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)  # plain seconds
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        return None
+    return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Return the server-requested delay in seconds, or None."""
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(float(value) / 1000.0, 0.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None,
+                  base: float = 2.0, cap: float = MAX_BACKOFF) -> float:
+    """Return a jittered delay before retry number attempt (0-based).
+
+    A server-supplied Retry-After is honoured with a little jitter added so
+    that waiting clients don't all resend at the same instant; otherwise
+    the delay grows exponentially with "equal jitter".
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, min(1.0, retry_after * 0.1 + 0.1))
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class TokenBucket:
+    """A bucket refilling to capacity over one minute; None means unlimited."""
+
+    def __init__(self, capacity: Optional[float], clock: Callable[[], float]):
+        self._clock = clock
+        self.capacity = capacity
+        self.level = capacity or 0.0
+        self._updated = clock()
+
+    def _refill(self, now: float) -> None:
+        if self.capacity is not None:
+            rate = self.capacity / 60.0
+            self.level = min(self.capacity, self.level + (now - self._updated) * rate)
+        self._updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until amount can be consumed (0 if available now)."""
+        if self.capacity is None or amount <= 0:
+            return 0.0
+        self._refill(now)
+        # Requests larger than the bucket go through once it is full
+        needed = min(amount, self.capacity) - self.level
+        return max(needed / (self.capacity / 60.0), 0.0)
+
+    def consume(self, amount: float, now: float) -> None:
+        if self.capacity is not None and amount > 0:
+            self._refill(now)
+            self.level -= amount
+
+    def sync(self, limit: Optional[float], remaining: Optional[float],
+             now: float) -> None:
+        """Adopt the server's view of the limit and what's left of it."""
+        self._refill(now)
+        if limit:
+            if self.capacity is None:
+                self.level = limit
+            self.capacity = limit
+        if self.capacity is not None and remaining is not None:
+            # Only ever lower our level: the headers predate requests that
+            # other threads have sent since, which we already counted
+            self.level = min(self.level, max(remaining, 0.0))
+
+
+class RateLimiter:
+    """Requests- and tokens-per-minute limiter with priority ordering."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        self._cond = Condition(Lock())
+        self._requests = TokenBucket(requests_per_minute or None, clock)
+        self._tokens = TokenBucket(tokens_per_minute or None, clock)
+        self._blocked_until = 0.0
+        self._waiters: list = []
+        self._counter = itertools.count()
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        return max(
+            self._blocked_until - now,
+            self._requests.delay(1, now),
+            self._tokens.delay(tokens, now),
+        )
+
+    def acquire(
+        self,
+        tokens: int = 0,
+        priority: int = RATE_PRIORITY_NORMAL,
+        cancel_check: Optional[Callable[[], bool]] = None,
+    ) -> bool:
+        """Block until a request costing tokens may be sent.
+
+        Returns False if cancel_check() became true while waiting.
+        """
+        ticket = (priority, next(self._counter))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    if cancel_check is not None and cancel_check():
+                        return False
+                    now = self._clock()
+                    if self._waiters[0] == ticket:
+                        wait = self._wait_time(tokens, now)
+                        if wait <= 0:
+                            self._requests.consume(1, now)
+                            self._tokens.consume(tokens, now)
+                            return True
+                        self._cond.wait(min(wait, POLL_INTERVAL))
+                    else:
+                        self._cond.wait(POLL_INTERVAL)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Correct the buckets from x-ratelimit-* response headers."""
+
+        def number(name: str) -> Optional[float]:
+            try:
+                return float(headers.get(name))  # type: ignore[arg-type]
+            except (TypeError, ValueError):
+                return None
+
+        with self._cond:
+            now = self._clock()
+            for bucket, kind in ((self._requests, "requests"),
+                                 (self._tokens, "tokens")):
+                limit = number(f"x-ratelimit-limit-{kind}")
+                remaining = number(f"x-ratelimit-remaining-{kind}")
+                reset = parse_reset_duration(
+                    headers.get(f"x-ratelimit-reset-{kind}"))
+                if limit is None and remaining is None:
+                    continue
+                bucket.sync(limit, remaining, now)
+                if remaining is not None and remaining <= 0 and reset:
+                    # Exhausted: nothing goes out until the server resets
+                    self._blocked_until = max(self._blocked_until, now + reset)
+            self._cond.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for seconds, e.g. after a 429 response."""
+        with self._cond:
+            self._blocked_until = max(
+                self._blocked_until, self._clock() + seconds)
+            logger.info(f"Rate limited; pausing requests for {seconds:.1f}s")
+            self._cond.notify_all()
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = Lock()
+
+
+def _configured_limits() -> tuple:
+    """Return (requests/min, tokens/min) from the app config; 0 = learn."""
+    try:
+        from app.utils import ConfigManager
+
+        config = ConfigManager.instance()
+        return (
+            config.get("openai_requests_per_minute", 0),
+            config.get("openai_tokens_per_minute", 0),
+        )
+    except Exception as e:  # Qt unavailable or config not loaded
+        logger.debug(f"Using header-derived rate limits only: {e}")
+        return 0, 0
+
+
+def get_rate_limiter(name: str) -> RateLimiter:
+    """Return the process-wide limiter for name (OpenAI limits are per model)."""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            rpm, tpm = _configured_limits()
+            limiter = RateLimiter(rpm or None, tpm or None)
+            _limiters[name] = limiter
+        return limiter
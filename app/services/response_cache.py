@@ -0,0 +1,223 @@
+"""Persistent cache of GPT responses.
+
+Completions are stored in a small SQLite file next to the main database,
+keyed by a hash of the request (endpoint, messages, model, temperature,
+max_tokens).
+Entries expire after a TTL and the least recently used ones are evicted
+once the cache grows past its size limit.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from app.constants import get_database_dir
+from app.services.llm_endpoints import normalize_base_url
+
+logger = logging.getLogger("transcribrr")
+
+DEFAULT_TTL_DAYS = 30
+DEFAULT_MAX_ENTRIES = 500
+
+
+def make_key(
+    messages: List[Dict[str, str]],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    api_base_url: Optional[str] = None,
+) -> str:
+    """Return a stable hash identifying a chat completion request.
+
+    The endpoint is part of the key: the same model name served by a local
+    server and by OpenAI gives different answers.
+    """
+    payload = json.dumps(
+        {
+            "base_url": normalize_base_url(api_base_url),
+            "messages": messages,
+            "model": model,
+            "temperature": float(temperature),
+            "max_tokens": int(max_tokens),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed TTL/LRU cache of completion text; safe across threads."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float = DEFAULT_TTL_DAYS * 86400,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the cache database on first use. Caller holds _lock."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=10.0, isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed "
+                "ON responses (accessed_at)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row and now - row[1] <= self.ttl_seconds:
+                    conn.execute(
+                        "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                        (now, key),
+                    )
+                    self.hits += 1
+                    return row[0]
+                if row:  # Expired
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache lookup failed: {e}")
+            self.misses += 1
+            return None
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """Store response under key, evicting expired and excess entries."""
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.execute("BEGIN")
+                    conn.execute(
+                        "INSERT OR REPLACE INTO responses "
+                        "(key, model, response, created_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, model, response, now, now),
+                    )
+                    conn.execute(
+                        "DELETE FROM responses WHERE created_at < ?",
+                        (now - self.ttl_seconds,),
+                    )
+                    conn.execute(
+                        "DELETE FROM responses WHERE key IN ("
+                        "SELECT key FROM responses "
+                        "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,),
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache store failed: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            try:
+                self._connection().execute("DELETE FROM responses")
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache clear failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for this session and the entry count."""
+        with self._lock:
+            try:
+                entries = self._connection().execute(
+                    "SELECT COUNT(*) FROM responses").fetchone()[0]
+            except sqlite3.Error:
+                entries = None
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": entries,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def cache_enabled_for(temperature: float) -> bool:
+    """Return whether requests at temperature should use the cache.
+
+    Controlled by the gpt_cache_enabled setting; gpt_cache_bypass_sampled
+    skips the cache for sampled (temperature > 0) requests, for users who
+    want a fresh variation each time.
+    """
+    try:
+        from app.utils import ConfigManager
+
+        config = ConfigManager.instance()
+        if not config.get("gpt_cache_enabled", True):
+            return False
+        if temperature > 0 and config.get("gpt_cache_bypass_sampled", False):
+            return False
+    except Exception as e:  # Qt unavailable or config not loaded
+        logger.debug(f"Using default response cache policy: {e}")
+    return True
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide cache, sized from the app config."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            ttl_days, max_entries = DEFAULT_TTL_DAYS, DEFAULT_MAX_ENTRIES
+            try:
+                from app.utils import ConfigManager
+
+                config = ConfigManager.instance()
+                ttl_days = config.get("gpt_cache_ttl_days", ttl_days)
+                max_entries = config.get("gpt_cache_max_entries", max_entries)
+            except Exception as e:  # Qt unavailable or config not loaded
+                logger.debug(f"Using default response cache settings: {e}")
+            _cache = ResponseCache(
+                os.path.join(get_database_dir(), "gpt_cache.sqlite"),
+                ttl_seconds=float(ttl_days) * 86400,
+                max_entries=int(max_entries),
+            )
+        return _cache
@@ -0,0 +1,227 @@
+"""Assign diarization speakers to transcript chunks.
+
+Diarization yields speaker turns; ASR yields timestamped chunks (segments
+or, with word timestamps, single words). Each chunk is labelled with the
+speaker whose turns overlap it the most. Turns are sorted once and the
+candidates for each chunk are found by binary search over turn starts and
+a running maximum of turn ends, so alignment costs O((n + m) log m) for n
+chunks and m turns instead of comparing every pair. Overlapping turns
+(people talking over each other) are handled: overlap is summed per
+speaker. Chunks falling in a pause are given the nearest speaker if one
+is within a short tolerance.
+
+NumPy vectorises the whole pass when available; a bisect-based fallback
+gives identical results without it.
+"""
+
+import bisect
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("transcribrr")
+
+UNKNOWN_SPEAKER = "Unknown"
+NEAREST_TOLERANCE = 1.0  # seconds; max gap to a turn for a chunk in a pause
+MIN_CHUNK_DURATION = 1e-3  # seconds; zero-length chunks are treated as points
+
+Turn = Tuple[float, float, str]
+
+
+def _numpy():
+    """Return NumPy, or None when it isn't installed (or is stubbed out)."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy if hasattr(numpy, "searchsorted") else None
+
+
+def merge_turns(segments: Iterable[Turn]) -> List[Turn]:
+    """Sort (start, end, speaker) turns and merge consecutive same-speaker ones."""
+    merged: List[Turn] = []
+    for start, end, label in sorted(segments, key=lambda s: (s[0], s[1])):
+        if merged and merged[-1][2] == label:
+            prev_start, prev_end, _ = merged[-1]
+            merged[-1] = (prev_start, max(prev_end, end), label)
+        else:
+            merged.append((start, end, label))
+    return merged
+
+
+def chunk_intervals(chunks: Sequence[Dict[str, Any]]) -> List[Tuple[float, float]]:
+    """Return (start, end) per chunk, filling in missing timestamps.
+
+    The pipeline leaves the end of the final chunk as None; a missing start
+    continues from the previous chunk.
+    """
+    intervals = []
+    previous_end = 0.0
+    for chunk in chunks:
+        timestamp = chunk.get("timestamp") or (None, None)
+        start = timestamp[0] if timestamp[0] is not None else previous_end
+        end = timestamp[1] if len(timestamp) > 1 and timestamp[1] is not None else start
+        end = max(end, start + MIN_CHUNK_DURATION)
+        intervals.append((float(start), float(end)))
+        previous_end = end
+    return intervals
+
+
+def _assign_numpy(np, intervals, turns, tolerance) -> List[str]:
+    labels = sorted({label for _, _, label in turns})
+    codes = {label: i for i, label in enumerate(labels)}
+    t_starts = np.array([t[0] for t in turns], dtype=float)
+    t_ends = np.array([t[1] for t in turns], dtype=float)
+    t_codes = np.array([codes[t[2]] for t in turns], dtype=np.int64)
+    bounds = np.array(intervals, dtype=float).reshape(-1, 2)
+    c_starts, c_ends = bounds[:, 0], bounds[:, 1]
+    n, m, n_labels = len(intervals), len(turns), len(labels)
+
+    # Turns [lo, hi) can overlap a chunk: they start before it ends, and
+    # (by the running max) not every turn before lo ended before it started
+    max_ends = np.maximum.accumulate(t_ends)
+    hi = np.searchsorted(t_starts, c_ends, side="left")
+    lo = np.searchsorted(max_ends, c_starts, side="right")
+    counts = np.maximum(hi - lo, 0)
+
+    # One row per (chunk, candidate turn) pair
+    chunk_idx = np.repeat(np.arange(n), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    turn_idx = np.repeat(lo, counts) + offsets
+    overlap = np.clip(
+        np.minimum(t_ends[turn_idx], c_ends[chunk_idx])
+        - np.maximum(t_starts[turn_idx], c_starts[chunk_idx]),
+        0.0, None,
+    )
+    scores = np.bincount(
+        chunk_idx * n_labels + t_codes[turn_idx], weights=overlap,
+        minlength=n * n_labels,
+    ).reshape(n, n_labels)
+    best = scores.argmax(axis=1)
+    matched = scores.max(axis=1) > 0
+
+    # Chunks in a pause: nearest of the turn reaching furthest before the
+    # chunk and the first turn starting after it
+    holder = np.maximum.accumulate(
+        np.where(t_ends >= max_ends, np.arange(m), 0))
+    prev_idx = np.clip(hi - 1, 0, m - 1)
+    gap_prev = np.where(hi > 0, c_starts - max_ends[prev_idx], np.inf)
+    next_idx = np.clip(hi, 0, m - 1)
+    gap_next = np.where(hi < m, t_starts[next_idx] - c_ends, np.inf)
+    nearest = np.where(gap_prev <= gap_next, t_codes[holder[prev_idx]],
+                       t_codes[next_idx])
+    near_enough = np.minimum(gap_prev, gap_next) <= tolerance
+
+    unknown = n_labels  # index of UNKNOWN_SPEAKER in the lookup below
+    chosen = np.where(matched, best, np.where(near_enough, nearest, unknown))
+    lookup = labels + [UNKNOWN_SPEAKER]
+    return [lookup[code] for code in chosen.tolist()]
+
+
+def _assign_python(intervals, turns, tolerance) -> List[str]:
+    labels = sorted({label for _, _, label in turns})
+    t_starts = [t[0] for t in turns]
+    max_ends, holders = [], []
+    for i, (_, end, _) in enumerate(turns):
+        if not max_ends or end >= max_ends[-1]:
+            max_ends.append(end)
+            holders.append(i)
+        else:
+            max_ends.append(max_ends[-1])
+            holders.append(holders[-1])
+
+    result = []
+    for c_start, c_end in intervals:
+        hi = bisect.bisect_left(t_starts, c_end)
+        lo = bisect.bisect_right(max_ends, c_start)
+        scores: Dict[str, float] = {}
+        for start, end, label in turns[lo:hi]:
+            overlap = min(end, c_end) - max(start, c_start)
+            if overlap > 0:
+                scores[label] = scores.get(label, 0.0) + overlap
+        if scores:
+            top = max(scores.values())
+            result.append(next(lb for lb in labels if scores.get(lb) == top))
+            continue
+        gap_prev = c_start - max_ends[hi - 1] if hi > 0 else float("inf")
+        gap_next = t_starts[hi] - c_end if hi < len(turns) else float("inf")
+        if min(gap_prev, gap_next) > tolerance:
+            result.append(UNKNOWN_SPEAKER)
+        elif gap_prev <= gap_next:
+            result.append(turns[holders[hi - 1]][2])
+        else:
+            result.append(turns[hi][2])
+    return result
+
+
+def assign_speakers(
+    intervals: Sequence[Tuple[float, float]],
+    turns: Sequence[Turn],
+    tolerance: float = NEAREST_TOLERANCE,
+) -> List[str]:
+    """Return the speaker with maximal overlap for each (start, end) interval.
+
+    turns must be sorted by start, as returned by merge_turns().
+    """
+    if not intervals:
+        return []
+    if not turns:
+        return [UNKNOWN_SPEAKER] * len(intervals)
+    np = _numpy()
+    if np is not None:
+        return _assign_numpy(np, intervals, turns, tolerance)
+    return _assign_python(intervals, turns, tolerance)
+
+
+def _words(chunks: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Flatten chunks carrying a "words" list; word-level chunks pass through."""
+    words = []
+    for chunk in chunks:
+        words.extend(chunk.get("words") or [chunk])
+    return words
+
+
+def align_chunks(
+    chunks: Sequence[Dict[str, Any]],
+    turns: Sequence[Turn],
+    split_words: bool = False,
+) -> List[Dict[str, Any]]:
+    """Return copies of chunks labelled with a "speaker" key.
+
+    With split_words, chunks are split at word timestamps (chunks that are
+    single words, or that carry a "words" list) and regrouped into one
+    chunk per run of words from the same speaker, so a chunk straddling a
+    change of turn is divided where the speaker actually changes.
+    """
+    items = _words(chunks) if split_words else list(chunks)
+    intervals = chunk_intervals(items)
+    speakers = assign_speakers(intervals, turns)
+    if not split_words:
+        return [dict(chunk, speaker=speaker) for chunk, speaker in zip(items, speakers)]
+
+    utterances: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    for word, (start, end), speaker in zip(items, intervals, speakers):
+        text = (word.get("text") or "").strip()
+        if current is not None and current["speaker"] == speaker:
+            if text:
+                current["text"] = f"{current['text']} {text}".strip()
+            current["timestamp"] = (current["timestamp"][0], end)
+            continue
+        current = {"text": text, "timestamp": (start, end), "speaker": speaker}
+        utterances.append(current)
+    return utterances
+
+
+def word_alignment_enabled() -> bool:
+    """Return whether local transcription should align speakers per word.
+
+    Controlled by the speaker_word_alignment setting; word timestamps cost
+    some extra decoding time, so it's off by default.
+    """
+    try:
+        from app.utils import ConfigManager
+
+        return bool(ConfigManager.instance().get("speaker_word_alignment", False))
+    except Exception as e:  # Qt unavailable or config not loaded
+        logger.debug(f"Using segment-level speaker alignment: {e}")
+        return False
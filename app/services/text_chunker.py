@@ -0,0 +1,158 @@
+"""Token-aware transcript chunking for prompts that exceed a model's context.
+
+Transcripts are split on speaker turns/paragraphs first, then sentences,
+and only cut mid-sentence when a single sentence is larger than a chunk.
+Token counts use tiktoken when installed and a character heuristic
+otherwise.
+"""
+
+import re
+import logging
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger("transcribrr")
+
+# Context window sizes in tokens; unknown models use DEFAULT_CONTEXT_TOKENS.
+MODEL_CONTEXT_TOKENS = {
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4.1": 1000000,
+    "gpt-4.1-mini": 1000000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+}
+DEFAULT_CONTEXT_TOKENS = 128000
+
+# Rough characters per token for English text when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+# Per-message overhead of the chat format, plus headroom for estimate error
+MESSAGE_OVERHEAD_TOKENS = 16
+SAFETY_MARGIN = 0.9
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])\s+")
+
+_encoder = None
+_encoder_loaded = False
+
+
+def _get_encoder():
+    """Return a tiktoken encoder, or None when tiktoken isn't installed."""
+    global _encoder, _encoder_loaded
+    if not _encoder_loaded:
+        _encoder_loaded = True
+        try:
+            import tiktoken  # type: ignore
+
+            _encoder = tiktoken.get_encoding("o200k_base")
+        except Exception as e:  # ImportError or missing encoding data
+            logger.debug(f"tiktoken unavailable, estimating tokens: {e}")
+            _encoder = None
+    return _encoder
+
+
+def estimate_tokens(text: str) -> int:
+    """Return the (estimated) token count of text."""
+    if not text:
+        return 0
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def context_limit(model: str) -> int:
+    """Return the context window of model, matching dated variants by prefix."""
+    if model in MODEL_CONTEXT_TOKENS:
+        return MODEL_CONTEXT_TOKENS[model]
+    # e.g. "gpt-4o-2024-08-06" -> "gpt-4o"; prefer the longest matching name
+    for name in sorted(MODEL_CONTEXT_TOKENS, key=len, reverse=True):
+        if model.startswith(name + "-"):
+            return MODEL_CONTEXT_TOKENS[name]
+    return DEFAULT_CONTEXT_TOKENS
+
+
+def input_budget(model: str, max_output_tokens: int, prompt: str = "") -> int:
+    """Return how many transcript tokens fit in one request to model."""
+    limit = int(context_limit(model) * SAFETY_MARGIN)
+    # Output tokens share the context window with the input
+    reserved = min(max_output_tokens, limit // 2)
+    overhead = estimate_tokens(prompt) + 2 * MESSAGE_OVERHEAD_TOKENS
+    return max(limit - reserved - overhead, 0)
+
+
+def _split_oversized(text: str, max_tokens: int,
+                     count: Callable[[str], int]) -> List[str]:
+    """Split a single sentence that exceeds max_tokens on word boundaries."""
+    pieces: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for word in text.split():
+        tokens = count(word + " ")
+        if current and current_tokens + tokens > max_tokens:
+            pieces.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def split_text(
+    text: str,
+    max_tokens: int,
+    count: Optional[Callable[[str], int]] = None,
+) -> List[str]:
+    """Split text into chunks of at most max_tokens, keeping boundaries natural.
+
+    Speaker turns and paragraphs (blank-line separated) are kept whole when
+    possible; larger ones are split into sentences, and only sentences
+    longer than a chunk are cut between words.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    count = count or estimate_tokens
+    if count(text) <= max_tokens:
+        return [text] if text.strip() else []
+
+    # Break the text into (unit, tokens) pairs that each fit in a chunk
+    units: List[Tuple[str, int]] = []
+    for paragraph in _PARAGRAPH_RE.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        tokens = count(paragraph)
+        if tokens <= max_tokens:
+            units.append((paragraph, tokens))
+            continue
+        for sentence in _SENTENCE_RE.split(paragraph):
+            tokens = count(sentence)
+            if tokens <= max_tokens:
+                units.append((sentence, tokens))
+            else:
+                units.extend(
+                    (piece, count(piece))
+                    for piece in _split_oversized(sentence, max_tokens, count)
+                )
+
+    # Greedily pack units into chunks, re-joining paragraphs with blank
+    # lines. Token counts are summed rather than re-counting the growing
+    # chunk, which would make packing quadratic in the transcript length.
+    separator = "\n\n"
+    separator_tokens = count(separator)
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for unit, tokens in units:
+        added = tokens + (separator_tokens if current else 0)
+        if current and current_tokens + added > max_tokens:
+            chunks.append(separator.join(current))
+            current, current_tokens = [unit], tokens
+        else:
+            current.append(unit)
+            current_tokens += added
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
@@ -0,0 +1,265 @@
+"""Self-calibrating transcription time estimates.
+
+Every completed transcription is recorded in a small SQLite file next to
+the main database: audio duration, method, model, device class and how
+long the job took. Per configuration, runtime is fitted as a fixed
+overhead plus a rate per second of audio, and predictions come with an
+80% interval from how far past runs strayed from the fit. With only a
+few runs the fit falls back to a plain rate and a wide interval.
+"""
+
+import logging
+import math
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.constants import get_database_dir
+
+logger = logging.getLogger("transcribrr")
+
+DEVICE_API = "api"
+DEVICE_CPU = "cpu"
+DEVICE_GPU = "gpu"
+
+FIT_HISTORY = 50  # most recent runs per configuration used for the fit
+MAX_RUNS_PER_CONFIG = 200  # older runs are pruned on insert
+MIN_FIT_RUNS = 3  # fewer runs give a rate-only fit
+FALLBACK_SPREAD = 0.5  # relative spread assumed before there is enough data
+Z_80 = 1.2816  # two-sided 80% interval
+
+Config = Tuple[str, str, str]  # (method, model, device class)
+
+
+def device_class(method: str, device: Optional[str] = None) -> str:
+    """Collapse a torch device name to the class runs are grouped by."""
+    if method.lower().strip() == "api":
+        return DEVICE_API
+    if not device or device == DEVICE_CPU:
+        return DEVICE_CPU
+    return DEVICE_GPU
+
+
+@dataclass(frozen=True)
+class Estimate:
+    """Predicted runtime in seconds with an 80% interval."""
+
+    seconds: float
+    low: float
+    high: float
+    runs: int
+
+    def describe(self) -> str:
+        from app.utils import format_time_duration
+
+        return (
+            f"about {format_time_duration(self.seconds)} "
+            f"({format_time_duration(self.low)}-{format_time_duration(self.high)})"
+        )
+
+
+@dataclass(frozen=True)
+class RuntimeFit:
+    """runtime = overhead + rate * audio_seconds, with relative spread."""
+
+    overhead: float
+    rate: float
+    spread: float
+    runs: int
+
+    def predict(self, audio_seconds: float) -> Estimate:
+        seconds = self.overhead + self.rate * max(0.0, audio_seconds)
+        half = Z_80 * self.spread * seconds * math.sqrt(1 + 1 / self.runs)
+        return Estimate(seconds, max(0.0, seconds - half), seconds + half, self.runs)
+
+
+def fit_runtime(runs: Sequence[Tuple[float, float]]) -> Optional[RuntimeFit]:
+    """Fit (audio_seconds, runtime_seconds) pairs; None without usable runs."""
+    runs = [(a, r) for a, r in runs if a > 0 and r > 0]
+    n = len(runs)
+    if not n:
+        return None
+
+    overhead = 0.0
+    rate = sum(r for _, r in runs) / sum(a for a, _ in runs)
+    if n >= MIN_FIT_RUNS:
+        mean_a = sum(a for a, _ in runs) / n
+        mean_r = sum(r for _, r in runs) / n
+        var_a = sum((a - mean_a) ** 2 for a, _ in runs)
+        if var_a > 0:
+            slope = sum((a - mean_a) * (r - mean_r) for a, r in runs) / var_a
+            intercept = mean_r - slope * mean_a
+            # A negative overhead or rate means too little spread in the
+            # durations to separate the two; keep the plain rate then
+            if slope > 0 and intercept >= 0:
+                overhead, rate = intercept, slope
+
+    if n < MIN_FIT_RUNS:
+        spread = FALLBACK_SPREAD
+    else:
+        errors = [r / (overhead + rate * a) - 1 for a, r in runs]
+        spread = math.sqrt(sum(e * e for e in errors) / (n - 1))
+    return RuntimeFit(overhead, rate, spread, n)
+
+
+class TimeEstimator:
+    """SQLite-backed record of transcription runtimes; safe across threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._fits: Dict[Config, Optional[RuntimeFit]] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use. Caller holds _lock."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=10.0, isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS transcription_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    method TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    device TEXT NOT NULL,
+                    audio_seconds REAL NOT NULL,
+                    runtime_seconds REAL NOT NULL,
+                    finished_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_runs_config "
+                "ON transcription_runs (method, model, device, id)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def record(
+        self,
+        method: str,
+        model: str,
+        device: str,
+        audio_seconds: float,
+        runtime_seconds: float,
+    ) -> None:
+        """Store a completed run and refit its configuration on next use."""
+        if audio_seconds <= 0 or runtime_seconds <= 0:
+            return
+        config = (method, model, device)
+        with self._lock:
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.execute("BEGIN")
+                    conn.execute(
+                        "INSERT INTO transcription_runs "
+                        "(method, model, device, audio_seconds, runtime_seconds, finished_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        config + (audio_seconds, runtime_seconds, time.time()),
+                    )
+                    conn.execute(
+                        "DELETE FROM transcription_runs WHERE id IN ("
+                        "SELECT id FROM transcription_runs "
+                        "WHERE method = ? AND model = ? AND device = ? "
+                        "ORDER BY id DESC LIMIT -1 OFFSET ?)",
+                        config + (MAX_RUNS_PER_CONFIG,),
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Could not record transcription time: {e}")
+            self._fits.pop(config, None)
+
+    def runs(self, method: str, model: str, device: str) -> List[Tuple[float, float]]:
+        """Return recent (audio_seconds, runtime_seconds) for a configuration."""
+        with self._lock:
+            return self._runs((method, model, device))
+
+    def _runs(self, config: Config) -> List[Tuple[float, float]]:
+        try:
+            return self._connection().execute(
+                "SELECT audio_seconds, runtime_seconds FROM transcription_runs "
+                "WHERE method = ? AND model = ? AND device = ? "
+                "ORDER BY id DESC LIMIT ?",
+                config + (FIT_HISTORY,),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read transcription times: {e}")
+            return []
+
+    def fit(self, method: str, model: str, device: str) -> Optional[RuntimeFit]:
+        config = (method, model, device)
+        with self._lock:
+            if config not in self._fits:
+                self._fits[config] = fit_runtime(self._runs(config))
+            return self._fits[config]
+
+    def predict(
+        self,
+        method: str,
+        model: str,
+        devices: Iterable[str],
+        audio_seconds: float,
+    ) -> Optional[Estimate]:
+        """Predict runtime on the first of devices that has history."""
+        for device in devices:
+            fit = self.fit(method, model, device)
+            if fit is not None:
+                return fit.predict(audio_seconds)
+        return None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._fits.clear()
+
+
+_estimator: Optional[TimeEstimator] = None
+_estimator_lock = Lock()
+
+
+def get_time_estimator() -> TimeEstimator:
+    """Return the process-wide estimator."""
+    global _estimator
+    with _estimator_lock:
+        if _estimator is None:
+            _estimator = TimeEstimator(
+                os.path.join(get_database_dir(), "transcription_times.sqlite")
+            )
+        return _estimator
+
+
+def predict_transcription(
+    file_path: str,
+    method: str,
+    model: str,
+    hardware_acceleration_enabled: bool = True,
+) -> Optional[Estimate]:
+    """Predict how long transcribing file_path will take, if there's history.
+
+    With hardware acceleration on, GPU history is preferred but CPU runs
+    are used when that's all there is (e.g. no GPU in the machine).
+    """
+    from app.file_utils import probe_duration
+
+    audio_seconds = probe_duration(file_path)
+    if not audio_seconds:
+        return None
+    method = method.lower().strip()
+    if device_class(method) == DEVICE_API:
+        devices = [DEVICE_API]
+    elif hardware_acceleration_enabled:
+        devices = [DEVICE_GPU, DEVICE_CPU]
+    else:
+        devices = [DEVICE_CPU]
+    return get_time_estimator().predict(method, model, devices, audio_seconds)
@@ -1,9 +1,19 @@
-from ..utils import language_to_iso
+from ..utils import format_time_duration, language_to_iso
 import os
 import logging
+import threading
 import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, List, Dict, Any, Union, Tuple, Callable
 
+from app.services.speaker_alignment import (
+    Turn,
+    align_chunks,
+    merge_turns,
+    word_alignment_enabled,
+)
+from app.services.windowed_asr import WindowProgress
+
 # Expose OpenAI symbol for tests to patch; lazily import at runtime.
 OpenAI = None  # type: ignore
 
@@ -19,6 +29,17 @@ warnings.filterwarnings(
 # Configure logging
 logger = logging.getLogger("transcribrr")
 
+DIARIZATION_MODEL_ID = "pyannote/speaker-diarization"
+DEFAULT_KEEP_WARM_SECONDS = 300
+PIPELINE_CHUNK_LENGTH_S = 30
+MIN_FREE_GPU_GB = 2.0  # below this, local inference runs on the CPU
+
+_diarization_lock = threading.Lock()
+
+
+class _DiarizationCancelled(Exception):
+    """Raised inside the diarization pipeline once its job is abandoned."""
+
 
 def _torch_mps_available() -> bool:
     """Return True if torch backends.mps reports availability.
@@ -62,8 +83,28 @@ def _torch_cuda_available() -> bool:
         return False
 
 
+def _format_window_progress(progress: WindowProgress) -> str:
+    """Describe a WindowProgress for the status line."""
+    message = (
+        f"Transcribing: {progress.percent}% "
+        f"({format_time_duration(progress.audio_done_s)} / "
+        f"{format_time_duration(progress.audio_total_s)} of audio"
+    )
+    if progress.rtf is not None:
+        message += f", {progress.rtf:.2f}x real time"
+    if progress.eta_s is not None and progress.percent < 100:
+        message += f", about {format_time_duration(progress.eta_s)} left"
+    return message + ")"
+
+
 class ModelManager:
-    """Manage ML models for transcription."""
+    """Manage ML models for transcription.
+
+    ASR models, their processors and diarization pipelines are cached
+    under one keep-warm policy: after the last job releases them they stay
+    loaded for model_keep_warm_seconds, so back-to-back jobs skip loading
+    weights, and are then evicted together.
+    """
 
     _instance = None
 
@@ -78,6 +119,11 @@ class ModelManager:
         """Init ModelManager."""
         self._models: Dict[str, Any] = {}  # Cache for loaded models
         self._processors: Dict[str, Any] = {}  # Cache for loaded processors
+        self._diarization_pipelines: Dict[str, Any] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.RLock()
+        self._jobs = 0  # jobs currently holding the models
+        self._release_timer: Optional[threading.Timer] = None
 
         # Read config to get hardware acceleration setting
         from app.utils import ConfigManager
@@ -85,6 +131,9 @@ class ModelManager:
         config_manager = ConfigManager.instance()
         hw_accel_enabled = config_manager.get(
             "hardware_acceleration_enabled", True)
+        self.keep_warm_seconds = float(
+            config_manager.get("model_keep_warm_seconds", DEFAULT_KEEP_WARM_SECONDS)
+        )
 
         # Track current device
         self.device = self._get_optimal_device(hw_accel_enabled)
@@ -107,7 +156,7 @@ class ModelManager:
         if torch.cuda.is_available():
             # Check available GPU memory before setting device to cuda
             free_memory = self._get_free_gpu_memory()
-            if free_memory > 2.0:  # If at least 2GB is available
+            if free_memory > MIN_FREE_GPU_GB:
                 logger.info("CUDA device selected for acceleration")
                 return "cuda"
             else:
@@ -128,7 +177,12 @@ class ModelManager:
             import torch
             
             if torch.cuda.is_available():
-                # This is an approximate way to get free memory
+                # Device-wide free memory, including what other processes hold
+                mem_get_info = getattr(torch.cuda, "mem_get_info", None)
+                if callable(mem_get_info):
+                    free, _total = mem_get_info()
+                    return free / (1024**3)
+                # Older torch: only this process's allocations are known
                 gpu_memory = torch.cuda.get_device_properties(0).total_memory / (
                     1024**3
                 )  # Convert to GB
@@ -153,10 +207,22 @@ class ModelManager:
         Returns:
             The loaded model
         """
-        if model_id not in self._models:
+        with self._lock:
+            if model_id in self._models:
+                return self._models[model_id]
+            load_lock = self._load_locks.setdefault(model_id, threading.Lock())
+
+        # One load per model at a time: a job that starts while the idle
+        # prefetch is loading waits for that load rather than repeating it
+        with load_lock:
+            with self._lock:
+                if model_id in self._models:
+                    return self._models[model_id]
             logger.info(f"Loading model: {model_id}")
-            self._models[model_id] = self._load_model(model_id)
-        return self._models[model_id]
+            model = self._load_model(model_id)
+            with self._lock:
+                self._models[model_id] = model
+            return model
 
     def get_processor(self, model_id: str) -> Any:
         """
@@ -182,6 +248,36 @@ class ModelManager:
                 model_id)
         return self._processors[model_id]
 
+    def get_diarization_pipeline(
+        self, hf_auth_key: Optional[str], model_id: str = DIARIZATION_MODEL_ID
+    ) -> Any:
+        """
+        Get a speaker diarization pipeline, loading it if not already loaded.
+
+        Args:
+            hf_auth_key: HuggingFace authentication key (needed to download)
+            model_id: The pyannote pipeline identifier
+
+        Returns:
+            The loaded pyannote pipeline
+        """
+        with self._lock:
+            if model_id in self._diarization_pipelines:
+                return self._diarization_pipelines[model_id]
+
+        try:
+            from pyannote.audio import Pipeline
+        except ImportError as e:
+            raise RuntimeError(
+                "Speaker detection requires 'pyannote.audio' package. "
+                "Please install it with: pip install pyannote.audio"
+            ) from e
+
+        logger.info(f"Loading diarization pipeline: {model_id}")
+        pipeline = Pipeline.from_pretrained(model_id, use_auth_token=hf_auth_key)
+        with self._lock:
+            return self._diarization_pipelines.setdefault(model_id, pipeline)
+
     def _load_model(self, model_id: str) -> Any:
         """
         Load a model from the transformers library.
@@ -202,9 +298,18 @@ class ModelManager:
             ) from e
             
         try:
+            if self.device == "cpu":
+                from app.services.cpu_inference import cpu_settings, load_cpu_model
+
+                settings = cpu_settings()
+                return load_cpu_model(
+                    model_id,
+                    quantize=settings["quantize"],
+                    compile_encoder=settings["compile"],
+                )
             model = AutoModelForSpeechSeq2Seq.from_pretrained(
                 model_id,
-                torch_dtype=torch.float16 if self.device != "cpu" else torch.float32,
+                torch_dtype=torch.float16,
                 low_cpu_mem_usage=True,
                 use_safetensors=True,
             )
@@ -228,9 +333,13 @@ class ModelManager:
             if model_id in self._processors:
                 del self._processors[model_id]
                 logger.info(f"Cleared processor from cache: {model_id}")
+            if model_id in self._diarization_pipelines:
+                del self._diarization_pipelines[model_id]
+                logger.info(f"Cleared diarization pipeline from cache: {model_id}")
         else:
             self._models.clear()
             self._processors.clear()
+            self._diarization_pipelines.clear()
             # Only clear CUDA cache if torch is available
             try:
                 import torch
@@ -240,7 +349,12 @@ class ModelManager:
             logger.info("Cleared all models from cache")
 
     def create_pipeline(
-        self, model_id: str, language: str = "english", chunk_length_s: int = 30
+        self,
+        model_id: str,
+        language: str = "english",
+        chunk_length_s: int = PIPELINE_CHUNK_LENGTH_S,
+        return_timestamps: Union[bool, str] = True,
+        batch_size: Optional[int] = None,
     ) -> Any:
         """
         Create a transcription pipeline using a cached model.
@@ -249,6 +363,9 @@ class ModelManager:
             model_id: Model identifier
             language: Language for transcription
             chunk_length_s: Length of chunks in seconds
+            return_timestamps: True for segment timestamps, "word" for
+                one chunk per word
+            batch_size: Chunks per forward pass; tuned to free memory if None
 
         Returns:
             A transcription pipeline
@@ -274,8 +391,8 @@ class ModelManager:
             feature_extractor=processor.feature_extractor,
             torch_dtype=torch.float16 if self.device != "cpu" else torch.float32,
             chunk_length_s=chunk_length_s,
-            batch_size=8,
-            return_timestamps=True,
+            batch_size=batch_size or self.batch_size_for(model_id),
+            return_timestamps=return_timestamps,
             device=self.device,
             model_kwargs={"use_flash_attention_2": self.device == "cuda"},
             generate_kwargs={"language": language.lower()},
@@ -283,8 +400,83 @@ class ModelManager:
 
         return pipe
 
-    def release_memory(self) -> None:
-        """Release memory by clearing caches and running garbage collection."""
+    def batch_size_for(self, model_id: str) -> int:
+        """Return the batch size for model_id: the asr_batch_size setting,
+        or the largest that fits the memory free on the device right now."""
+        from app.utils import ConfigManager
+        from app.services.batch_tuner import get_batch_tuner
+
+        try:
+            fixed = int(ConfigManager.instance().get("asr_batch_size", 0) or 0)
+        except (TypeError, ValueError):
+            fixed = 0
+        if fixed > 0:
+            return fixed
+        return get_batch_tuner().batch_size(
+            model_id, self.device, self._models.get(model_id)
+        )
+
+    def record_batch_oom(self, model_id: str, batch_size: int) -> int:
+        """Free cached allocations after an OOM; return the smaller batch to retry with."""
+        from app.services.batch_tuner import get_batch_tuner
+
+        if self.device == "cuda":
+            try:
+                import torch
+                torch.cuda.empty_cache()
+            except Exception:
+                pass
+        return get_batch_tuner().record_oom(model_id, self.device, batch_size)
+
+    def record_batch_success(self, model_id: str, batch_size: int) -> None:
+        from app.services.batch_tuner import get_batch_tuner
+
+        get_batch_tuner().record_success(model_id, self.device, batch_size)
+
+    def hold(self) -> None:
+        """Mark a job as using the cached models until release_memory()."""
+        with self._lock:
+            self._jobs += 1
+            if self._release_timer is not None:
+                self._release_timer.cancel()
+                self._release_timer = None
+
+    def release_memory(self, force: bool = False) -> None:
+        """Release models once no job holds them and the keep-warm time passes.
+
+        Args:
+            force: Skip the keep-warm time, e.g. at shutdown or under memory
+                pressure. Models another job still holds are never released.
+        """
+        with self._lock:
+            self._jobs = max(0, self._jobs - 1)
+            if self._release_timer is not None:
+                self._release_timer.cancel()
+                self._release_timer = None
+            if self._jobs:
+                if force:
+                    logger.info("Models still in use by a running job; not evicting")
+                return  # the last holder releases them
+            if not force and self.keep_warm_seconds > 0:
+                if self._models or self._diarization_pipelines:
+                    timer = threading.Timer(
+                        self.keep_warm_seconds, self._release_if_idle)
+                    timer.daemon = True
+                    self._release_timer = timer
+                    timer.start()
+                    logger.debug(
+                        f"Keeping models warm for {self.keep_warm_seconds:.0f}s")
+                return
+            self._release_now()
+
+    def _release_if_idle(self) -> None:
+        with self._lock:
+            self._release_timer = None
+            if not self._jobs:
+                self._release_now()
+
+    def _release_now(self) -> None:
+        """Clear caches and run garbage collection."""
         self.clear_cache()
         if self.device == "cuda":
             try:
@@ -304,6 +496,24 @@ class TranscriptionService:
     def __init__(self):
         """Initialize the transcription service."""
         self.model_manager = ModelManager.instance()
+        # OpenAI clients keyed by (factory, api_key, base_url); they share
+        # the pooled HTTP client so chunked uploads reuse connections
+        self._api_clients: Dict[Tuple[Any, str, str], Any] = {}
+
+    def _get_api_client(self, api_key: str, base_url: str) -> Any:
+        """Return a cached OpenAI client bound to the shared HTTP pool."""
+        key = (OpenAI, api_key, base_url)
+        client = self._api_clients.get(key)
+        if client is None:
+            from app.services.http_client import get_httpx_client
+
+            kwargs: Dict[str, Any] = {"api_key": api_key, "base_url": base_url}
+            http_client = get_httpx_client()
+            if http_client is not None:
+                kwargs["http_client"] = http_client
+            client = OpenAI(**kwargs)  # type: ignore[misc]
+            self._api_clients[key] = client
+        return client
 
     def transcribe_file(
         self,
@@ -391,7 +601,9 @@ class TranscriptionService:
             # we'll assume they prioritize speaker detection over hardware acceleration
             logger.info("Using CPU transcription to support speaker detection")
             return self._transcribe_locally(
-                file_path, model_id, language, speaker_detection, hf_auth_key
+                file_path, model_id, language, speaker_detection, hf_auth_key,
+                progress_cb=progress_cb,
+                cancel_cb=cancel_cb,
             )
 
         # If MPS is available and hardware acceleration is enabled, use MPS path
@@ -399,7 +611,11 @@ class TranscriptionService:
             logger.info(
                 f"Using MPS-optimized method for transcription of {os.path.basename(file_path)}"
             )
-            return self._transcribe_with_mps(file_path, model_id, language)
+            return self._transcribe_with_mps(
+                file_path, model_id, language,
+                progress_cb=progress_cb,
+                cancel_cb=cancel_cb,
+            )
 
         # Otherwise use standard path with CUDA or CPU based on availability and settings
         else:
@@ -410,7 +626,9 @@ class TranscriptionService:
                 f"Using standard transcription with {device} for {os.path.basename(file_path)}"
             )
             return self._transcribe_locally(
-                file_path, model_id, language, speaker_detection, hf_auth_key
+                file_path, model_id, language, speaker_detection, hf_auth_key,
+                progress_cb=progress_cb,
+                cancel_cb=cancel_cb,
             )
 
     def _transcribe_locally(
@@ -420,6 +638,9 @@ class TranscriptionService:
         language: str,
         speaker_detection: bool,
         hf_auth_key: Optional[str],
+        *,
+        progress_cb: Optional[Callable[[int, str], None]] = None,
+        cancel_cb: Optional[Callable[[], bool]] = None,
     ) -> Dict[str, Any]:
         """
         Transcribe using local models.
@@ -430,22 +651,59 @@ class TranscriptionService:
             language: Language of the audio
             speaker_detection: Whether to enable speaker detection
             hf_auth_key: HuggingFace auth key for speaker detection
+            progress_cb: Called with (percent, message) after each audio window
+            cancel_cb: Polled between audio windows; stops inference early
 
         Returns:
             Dictionary with transcription results
         """
+        self.model_manager.hold()
+        stop_diarization = threading.Event()
+        pending_turns = None
         try:
-            # Create pipeline using model manager
-            pipe = self.model_manager.create_pipeline(model_id, language)
+            # Word timestamps let speaker changes split a chunk mid-sentence
+            split_words = bool(
+                speaker_detection and hf_auth_key and word_alignment_enabled()
+            )
+
+            # Diarization doesn't depend on the transcript, so run it on the
+            # same audio while ASR runs and only join them for alignment
+            diarization_loaded = None
+            if speaker_detection and hf_auth_key:
+                diarization_loaded = threading.Event()
+                executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="diarization")
+                pending_turns = executor.submit(
+                    self._diarize, file_path, hf_auth_key, stop_diarization,
+                    diarization_loaded,
+                )
+                executor.shutdown(wait=False)  # worker exits when diarization ends
+
+            # Create pipelines using model manager
+            def make_pipe(batch_size: int) -> Any:
+                if split_words:
+                    return self.model_manager.create_pipeline(
+                        model_id, language, return_timestamps="word",
+                        batch_size=batch_size,
+                    )
+                return self.model_manager.create_pipeline(
+                    model_id, language, batch_size=batch_size
+                )
 
-            # Process the file
-            result = pipe(file_path)
+            result = self._run_pipeline(
+                make_pipe, file_path, model_id, progress_cb=progress_cb, cancel_cb=cancel_cb,
+                other_models_loaded=diarization_loaded,
+            )
+            if result is None:
+                self._stop_diarization(pending_turns, stop_diarization)
+                return {"text": "[Cancelled]", "method": "local"}
 
             # If speaker detection is enabled and we have a HF key
-            if speaker_detection and hf_auth_key:
+            if pending_turns is not None:
                 try:
                     result_with_speakers: Dict[str, Any] = self._add_speaker_detection(
-                        file_path, result, hf_auth_key
+                        file_path, result, hf_auth_key, split_words=split_words,
+                        pending_turns=pending_turns,
                     )
                     return result_with_speakers
                 except Exception as e:
@@ -459,90 +717,173 @@ class TranscriptionService:
             return dict(result) if isinstance(result, dict) else {"text": str(result)}
 
         except Exception as e:
+            self._stop_diarization(pending_turns, stop_diarization)
             logger.error(f"Local transcription error: {e}")
             raise RuntimeError(f"Failed to transcribe audio: {e}")
+        finally:
+            self.model_manager.release_memory()
+
+    @staticmethod
+    def _stop_diarization(
+        pending_turns: Optional["Future[List[Turn]]"], stop: threading.Event
+    ) -> None:
+        """Abandon diarization running alongside ASR and wait for it to stop.
+
+        Waiting keeps the pipeline from running on after the job releases
+        the models, and surfaces an error that nobody would otherwise see.
+        """
+        if pending_turns is None:
+            return
+        stop.set()
+        try:
+            pending_turns.result()
+        except _DiarizationCancelled:
+            logger.info("Speaker diarization stopped")
+        except Exception as e:
+            logger.warning(f"Speaker diarization failed: {e}")
+
+    def _run_pipeline(
+        self,
+        make_pipe: Callable[[int], Any],
+        file_path: str,
+        model_id: str,
+        *,
+        progress_cb: Optional[Callable[[int, str], None]] = None,
+        cancel_cb: Optional[Callable[[], bool]] = None,
+        other_models_loaded: Optional[threading.Event] = None,
+    ) -> Optional[Any]:
+        """Run a pipeline over the file a window at a time; None if cancelled.
+
+        make_pipe(batch_size) builds the pipeline. The batch size is picked
+        once the model, and any models loading alongside it (signalled by
+        other_models_loaded), are in memory. A window that runs out of
+        memory is retried with half the batch size (persisted as the new
+        ceiling) instead of failing the job. Reports percent, audio time,
+        real-time factor and ETA after each window. Falls back to a single
+        call on the file path when the audio can't be decoded up front,
+        which then can't be interrupted.
+        """
+        from app.ffmpeg_utils import decode_audio
+        from app.services.batch_tuner import is_out_of_memory
+        from app.services.windowed_asr import SAMPLING_RATE, transcribe_windows
+
+        # Size batches from the memory left once every model is loaded
+        self.model_manager.get_model(model_id)
+        if other_models_loaded is not None:
+            other_models_loaded.wait()
+        batch_size = self.model_manager.batch_size_for(model_id)
+        current = {"batch_size": batch_size, "pipe": make_pipe(batch_size)}
+
+        def run(inputs: Any) -> Any:
+            while True:
+                try:
+                    # Copy: the pipeline pops "raw" from its input dict
+                    return current["pipe"](dict(inputs) if isinstance(inputs, dict) else inputs)
+                except Exception as e:
+                    if current["batch_size"] <= 1 or not is_out_of_memory(e):
+                        raise
+                    smaller = self.model_manager.record_batch_oom(
+                        model_id, current["batch_size"])
+                    current.update(batch_size=smaller, pipe=make_pipe(smaller))
+
+        try:
+            audio = decode_audio(file_path, SAMPLING_RATE)
+        except Exception as e:
+            logger.warning(
+                f"Could not decode {os.path.basename(file_path)} for windowed "
+                f"transcription, transcribing in one pass: {e}"
+            )
+            if cancel_cb and cancel_cb():
+                return None
+            result = run(file_path)
+        else:
+            last: List[WindowProgress] = []
+
+            def on_window(progress: WindowProgress) -> None:
+                last[:] = [progress]
+                if progress_cb:
+                    progress_cb(progress.percent, _format_window_progress(progress))
+
+            # One window is one batch at the starting batch size
+            result = transcribe_windows(
+                run,
+                audio,
+                PIPELINE_CHUNK_LENGTH_S * batch_size,
+                sampling_rate=SAMPLING_RATE,
+                cancel_cb=cancel_cb,
+                progress_cb=on_window,
+            )
+            if result is not None and last and last[0].rtf is not None:
+                logger.info(
+                    f"Transcribed {last[0].audio_total_s:.0f}s of audio with {model_id} "
+                    f"at {last[0].rtf:.2f}x real time (batch size {current['batch_size']})"
+                )
+
+        if result is not None:
+            self.model_manager.record_batch_success(model_id, current["batch_size"])
+        return result
 
     def _transcribe_with_mps(
-        self, file_path: str, model_id: str, language: str
+        self,
+        file_path: str,
+        model_id: str,
+        language: str,
+        *,
+        progress_cb: Optional[Callable[[int, str], None]] = None,
+        cancel_cb: Optional[Callable[[], bool]] = None,
     ) -> Dict[str, Any]:
         """
-        Transcribe using MPS-optimized approach for Apple Silicon.
-        This implementation uses the approach from the mac_support branch.
+        Transcribe on Apple Silicon's MPS device.
+
+        Uses the model cached by ModelManager (loaded in float16 on "mps"),
+        so a prefetched model is reused, and runs it a window at a time like
+        the other local paths.
 
         Args:
             file_path: Path to the audio file
             model_id: Model identifier
             language: Language of the audio
+            progress_cb: Called with (percent, message) after each audio window
+            cancel_cb: Polled between audio windows; stops inference early
 
         Returns:
             Dictionary with transcription results
         """
-        try:
-            # SpeechToTextPipeline MPS implementation
-            if _torch_mps_available():
-                logger.info(
-                    f"Using MPS device for transcription of {os.path.basename(file_path)}"
-                )
-
-                # Lazy import transformers components
-                try:
-                    from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor, pipeline
-                    import torch
-                except ImportError as e:
-                    raise RuntimeError(
-                        "MPS transcription requires 'transformers' and 'torch' packages. "
-                        "Please install them with: pip install transformers torch"
-                    ) from e
-                    
-                # Initialize model
-                model = AutoModelForSpeechSeq2Seq.from_pretrained(
-                    model_id,
-                    torch_dtype=torch.float16,
-                    low_cpu_mem_usage=False,
-                    use_safetensors=True,
-                )
+        if not _torch_mps_available():
+            # Fall back to regular transcription if MPS not available
+            logger.warning(
+                "MPS requested but not available, falling back to standard transcription"
+            )
+            return self._transcribe_locally(
+                file_path, model_id, language, False, None,
+                progress_cb=progress_cb,
+                cancel_cb=cancel_cb,
+            )
 
-                # Set device to MPS
-                device = "mps"
-                model.to(device)
-
-                # Load processor
-                processor = AutoProcessor.from_pretrained(model_id)
-
-                # Create pipeline
-                pipe = pipeline(
-                    "automatic-speech-recognition",
-                    model=model,
-                    tokenizer=processor.tokenizer,
-                    feature_extractor=processor.feature_extractor,
-                    torch_dtype=torch.float16,
-                    chunk_length_s=15,
-                    max_new_tokens=128,
-                    batch_size=8,
-                    return_timestamps=True,
-                    device=device,
-                    generate_kwargs={"language": language.lower()},
+        logger.info(
+            f"Using MPS device for transcription of {os.path.basename(file_path)}"
+        )
+        self.model_manager.hold()
+        try:
+            def make_pipe(batch_size: int) -> Any:
+                return self.model_manager.create_pipeline(
+                    model_id, language, batch_size=batch_size
                 )
 
-                # Transcribe
-                logger.info("Transcribing audio with MPS...")
-                result = pipe(file_path)
-
-                # Return result in standard format as a properly typed dict
-                return dict(result) if isinstance(result, dict) else {"text": str(result)}
+            result = self._run_pipeline(
+                make_pipe, file_path, model_id, progress_cb=progress_cb, cancel_cb=cancel_cb
+            )
+            if result is None:
+                return {"text": "[Cancelled]", "method": "local"}
 
-            else:
-                # Fall back to regular transcription if MPS not available
-                logger.warning(
-                    "MPS requested but not available, falling back to standard transcription"
-                )
-                return self._transcribe_locally(
-                    file_path, model_id, language, False, None
-                )
+            # Return result in standard format as a properly typed dict
+            return dict(result) if isinstance(result, dict) else {"text": str(result)}
 
         except Exception as e:
             logger.error(f"MPS transcription error: {e}", exc_info=True)
             raise RuntimeError(f"MPS transcription failed: {e}")
+        finally:
+            self.model_manager.release_memory()
 
     def _transcribe_with_api(
         self,
@@ -572,7 +913,7 @@ class TranscriptionService:
                     ) from e
                 OpenAI = _OpenAI  # type: ignore
 
-            client = OpenAI(api_key=api_key, base_url=base_url)  # type: ignore[call-arg]
+            client = self._get_api_client(api_key, base_url)
             with open(file_path, "rb") as f:
                 lang = language_to_iso(language)
                 rsp = client.audio.transcriptions.create(
@@ -622,6 +963,9 @@ class TranscriptionService:
         chunk_duration = max(1, duration_ms // num_chunks)
 
         pieces: List[str] = []
+        from app.services.rate_limiter import get_rate_limiter
+
+        limiter = get_rate_limiter("whisper-1")
 
         for i in range(num_chunks):
             if cancel_cb and cancel_cb():
@@ -638,6 +982,12 @@ class TranscriptionService:
                 pct = int(((i) / num_chunks) * 100)
                 progress_cb(pct, f"Transcribing chunk {i+1}/{num_chunks}...")
 
+            # Respect the shared Whisper request budget between uploads
+            if not limiter.acquire(cancel_check=cancel_cb):
+                if progress_cb:
+                    progress_cb(0, "Chunked transcription cancelled.")
+                return {"text": "[Cancelled]", "method": "api"}
+
             # Export to a temp WAV and call the API
             fd, tmp_path = tempfile.mkstemp(suffix=".wav", prefix=f"temp_chunk_{i+1}_")
             os.close(fd)
@@ -659,8 +1009,60 @@ class TranscriptionService:
         combined = " ".join(pieces).strip()
         return {"text": combined, "method": "api"}
 
+    def _diarize(
+        self,
+        file_path: str,
+        hf_auth_key: str,
+        stop: Optional[threading.Event] = None,
+        loaded: Optional[threading.Event] = None,
+    ) -> List[Turn]:
+        """
+        Run speaker diarization on an audio file.
+
+        Args:
+            file_path: Path to the audio file
+            hf_auth_key: HuggingFace authentication key
+            stop: When set, diarization raises _DiarizationCancelled at the
+                pipeline's next progress step
+            loaded: Set once the pipeline is in memory, or failed to load
+
+        Returns:
+            Speaker turns as (start, end, speaker), sorted by start
+        """
+
+        def check_stop(*args: Any, **kwargs: Any) -> None:
+            if stop is not None and stop.is_set():
+                raise _DiarizationCancelled()
+
+        try:
+            check_stop()
+            diarization_pipeline = self.model_manager.get_diarization_pipeline(hf_auth_key)
+        finally:
+            if loaded is not None:
+                loaded.set()
+
+        # One cached pipeline serves every job; run it one file at a time
+        logger.info("Running speaker diarization")
+        with _diarization_lock:
+            check_stop()
+            if stop is None:
+                diarization = diarization_pipeline(file_path)
+            else:
+                # pyannote calls the hook after each step and batch
+                diarization = diarization_pipeline(file_path, hook=check_stop)
+
+        return merge_turns(
+            (segment.start, segment.end, label)
+            for segment, _track, label in diarization.itertracks(yield_label=True)
+        )
+
     def _add_speaker_detection(
-        self, file_path: str, result: Dict[str, Any], hf_auth_key: str
+        self,
+        file_path: str,
+        result: Dict[str, Any],
+        hf_auth_key: str,
+        split_words: bool = False,
+        pending_turns: Optional["Future[List[Turn]]"] = None,
     ) -> Dict[str, Any]:
         """
         Add speaker detection to transcription results.
@@ -669,74 +1071,22 @@ class TranscriptionService:
             file_path: Path to the audio file
             result: Base transcription result
             hf_auth_key: HuggingFace authentication key
+            split_words: Split chunks where the speaker changes mid-chunk,
+                using word-level timestamps
+            pending_turns: Diarization already started for this file; run
+                it now if not given
 
         Returns:
             Enhanced transcription with speaker detection
         """
         try:
-            from pyannote.audio import Pipeline
-        except ImportError as e:
-            raise RuntimeError(
-                "Speaker detection requires 'pyannote.audio' package. "
-                "Please install it with: pip install pyannote.audio"
-            ) from e
-            
-        try:
-            # Initialize diarization pipeline
-            logger.info("Initializing speaker diarization pipeline")
-            diarization_pipeline = Pipeline.from_pretrained(
-                "pyannote/speaker-diarization", use_auth_token=hf_auth_key
-            )
-
-            # Process the audio file
-            logger.info("Running speaker diarization")
-            diarization = diarization_pipeline(file_path)
-
-            # Extract speaker segments
-            segments = []
-            for segment, track, label in diarization.itertracks(yield_label=True):
-                segments.append(
-                    {
-                        "segment": {"start": segment.start, "end": segment.end},
-                        "track": track,
-                        "label": label,
-                    }
-                )
-
-            # Combine segments with the same speaker
-            speaker_segments = []
-            if not segments:
+            if pending_turns is not None:
+                turns = pending_turns.result()
+            else:
+                turns = self._diarize(file_path, hf_auth_key)
+            if not turns:
                 return result  # No segments found
 
-            prev_segment = segments[0]
-            for i in range(1, len(segments)):
-                cur_segment = segments[i]
-
-                # Check if the speaker has changed
-                if cur_segment["label"] != prev_segment["label"]:
-                    # Add the previous segment
-                    speaker_segments.append(
-                        {
-                            "segment": {
-                                "start": prev_segment["segment"]["start"],
-                                "end": cur_segment["segment"]["start"],
-                            },
-                            "speaker": prev_segment["label"],
-                        }
-                    )
-                    prev_segment = cur_segment
-
-            # Add the last segment
-            speaker_segments.append(
-                {
-                    "segment": {
-                        "start": prev_segment["segment"]["start"],
-                        "end": segments[-1]["segment"]["end"],
-                    },
-                    "speaker": prev_segment["label"],
-                }
-            )
-
             # Align with transcription chunks
             transcript_chunks = result.get("chunks", [])
             if not transcript_chunks:
@@ -745,24 +1095,10 @@ class TranscriptionService:
                     {"text": result.get("text", ""), "timestamp": (0, 0)}
                 ]
 
-            # Assign speakers to transcript chunks
-            for chunk in transcript_chunks:
-                # Find the speaker segment that contains this chunk
-                chunk_start = chunk.get("timestamp", (0, 0))[0]
-                chunk_end = chunk.get("timestamp", (0, 0))[1]
-
-                for speaker_segment in speaker_segments:
-                    segment_start = speaker_segment["segment"]["start"]
-                    segment_end = speaker_segment["segment"]["end"]
-
-                    # Check if chunk is within this speaker segment
-                    if (chunk_start >= segment_start and chunk_start < segment_end) or (
-                        chunk_end > segment_start and chunk_end <= segment_end
-                    ):
-                        chunk["speaker"] = speaker_segment["speaker"]
-                        break
-                else:
-                    chunk["speaker"] = "Unknown"
+            # Assign each chunk (or word) to the speaker overlapping it most
+            transcript_chunks = align_chunks(
+                transcript_chunks, turns, split_words=split_words
+            )
 
             # Format the final result
             enhanced_result = result.copy()
@@ -770,12 +1106,11 @@ class TranscriptionService:
             enhanced_result["has_speaker_detection"] = True
 
             # Create a formatted text with speaker labels
-            formatted_text = ""
-            for chunk in transcript_chunks:
-                speaker = chunk.get("speaker", "Unknown")
-                text = chunk.get("text", "").strip()
-                if text:
-                    formatted_text += f"{speaker}: {text}\n\n"
+            formatted_text = "".join(
+                f"{chunk.get('speaker', 'Unknown')}: {text}\n\n"
+                for chunk in transcript_chunks
+                if (text := chunk.get("text", "").strip())
+            )
 
             enhanced_result["formatted_text"] = formatted_text
 
@@ -0,0 +1,144 @@
+"""Run a speech recognition pipeline over audio one window at a time.
+
+Calling the pipeline on a whole file gives no chance to stop until it
+returns, which can take many minutes. Instead the audio is decoded once
+and fed to the pipeline in windows of about one pipeline batch
+(chunk_length_s * batch_size seconds), checking for cancellation between
+windows. Window edges are moved to the quietest point nearby, so a word
+is rarely cut in two, and chunk timestamps are shifted back onto the
+timeline of the whole file. Windows also give a natural place to report
+progress, and the time each one takes gives a live real-time factor.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("transcribrr")
+
+SAMPLING_RATE = 16000
+SPLIT_SEARCH_S = 2.0  # seconds before a window edge searched for a pause
+FRAME_S = 0.05  # energy is compared over frames of this length
+
+
+@dataclass
+class WindowProgress:
+    """Progress after a window: audio transcribed and wall time spent."""
+
+    audio_done_s: float
+    audio_total_s: float
+    elapsed_s: float
+
+    @property
+    def percent(self) -> int:
+        if self.audio_total_s <= 0:
+            return 100
+        return min(100, int(100 * self.audio_done_s / self.audio_total_s))
+
+    @property
+    def rtf(self) -> Optional[float]:
+        """Real-time factor: seconds of compute per second of audio."""
+        if self.audio_done_s <= 0:
+            return None
+        return self.elapsed_s / self.audio_done_s
+
+    @property
+    def eta_s(self) -> Optional[float]:
+        rtf = self.rtf
+        if rtf is None:
+            return None
+        return rtf * max(0.0, self.audio_total_s - self.audio_done_s)
+
+
+def window_bounds(
+    audio: Sequence[float],
+    window_s: float,
+    sampling_rate: int = SAMPLING_RATE,
+    search_s: float = SPLIT_SEARCH_S,
+) -> List[Tuple[int, int]]:
+    """Split audio into (start, end) sample ranges of at most window_s.
+
+    Each cut is placed in the quietest frame within search_s before the
+    nominal window edge.
+    """
+    import numpy as np
+
+    total = len(audio)
+    step = max(1, int(window_s * sampling_rate))
+    frame = max(1, int(FRAME_S * sampling_rate))
+    search = int(search_s * sampling_rate)
+
+    cuts = [0]
+    while total - cuts[-1] > step:
+        target = cuts[-1] + step
+        lo = max(cuts[-1] + frame, target - search)
+        frames = (target - lo) // frame
+        if frames <= 0:
+            cuts.append(target)
+            continue
+        region = np.asarray(audio[lo:lo + frames * frame], dtype=np.float32)
+        energy = np.square(region).reshape(frames, frame).mean(axis=1)
+        cuts.append(lo + int(energy.argmin()) * frame + frame // 2)
+    cuts.append(total)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+def _shift(chunk: Dict[str, Any], offset: float, window_end: float) -> Dict[str, Any]:
+    """Return chunk with timestamps moved by offset seconds.
+
+    The pipeline leaves the end of a window's last chunk open (None); it is
+    closed at the window's end so later alignment sees a real interval.
+    """
+    shifted = dict(chunk)
+    timestamp = chunk.get("timestamp")
+    if timestamp:
+        start, end = (tuple(timestamp) + (None,))[:2]
+        shifted["timestamp"] = (
+            None if start is None else round(start + offset, 3),
+            round(window_end if end is None else end + offset, 3),
+        )
+    if chunk.get("words"):
+        shifted["words"] = [_shift(word, offset, window_end) for word in chunk["words"]]
+    return shifted
+
+
+def transcribe_windows(
+    pipe: Callable[[Any], Any],
+    audio: Sequence[float],
+    window_s: float,
+    *,
+    sampling_rate: int = SAMPLING_RATE,
+    cancel_cb: Optional[Callable[[], bool]] = None,
+    progress_cb: Optional[Callable[[WindowProgress], None]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Transcribe audio window by window; return None if cancelled.
+
+    The result has the pipeline's shape: combined "text" and "chunks"
+    with timestamps relative to the start of the audio. progress_cb is
+    called after every window.
+    """
+    texts: List[str] = []
+    chunks: List[Dict[str, Any]] = []
+    bounds = window_bounds(audio, window_s, sampling_rate)
+    total_s = len(audio) / sampling_rate
+    started = time.monotonic()
+    for index, (start, end) in enumerate(bounds):
+        if cancel_cb and cancel_cb():
+            logger.info(f"Local transcription cancelled after {index}/{len(bounds)} windows")
+            return None
+
+        # The pipeline consumes its input dict, so build a fresh one each time
+        result = pipe({"raw": audio[start:end], "sampling_rate": sampling_rate})
+        if not isinstance(result, dict):
+            result = {"text": str(result)}
+
+        text = (result.get("text") or "").strip()
+        if text:
+            texts.append(text)
+        offset, window_end = start / sampling_rate, end / sampling_rate
+        chunks.extend(_shift(chunk, offset, window_end) for chunk in result.get("chunks") or [])
+        if progress_cb:
+            progress_cb(WindowProgress(window_end, total_s, time.monotonic() - started))
+
+    return {"text": " ".join(texts), "chunks": chunks}
@@ -0,0 +1,129 @@
+"""Tests for header-based duration parsing and calculate_duration caching."""
+
+import os
+import struct
+import tempfile
+import unittest
+import wave
+from unittest import mock
+
+from app import file_utils
+from app.audio_headers import read_header_duration
+
+RESOURCES = os.path.join(os.path.dirname(__file__), "resources")
+
+
+def _mp3_frame_header(bitrate_index=9, rate_index=0):
+    # MPEG-1 Layer III, no CRC, stereo: bitrate 128 kbps / 44.1 kHz by default
+    return bytes([0xFF, 0xFB, (bitrate_index << 4) | (rate_index << 2), 0x00])
+
+
+class TestHeaderDurations(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name, data):
+        path = os.path.join(self.tmp, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_wav(self):
+        path = os.path.join(self.tmp, "a.wav")
+        with wave.open(path, "wb") as wf:
+            wf.setnchannels(2)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(b"\0" * (16000 * 4 * 3))
+        self.assertAlmostEqual(read_header_duration(path), 3.0)
+
+    def test_flac_streaminfo(self):
+        packed = (44100 << 44) | (1 << 41) | (15 << 36) | (44100 * 90)
+        streaminfo = b"\0" * 10 + packed.to_bytes(8, "big") + b"\0" * 16
+        path = self._write("a.flac", b"fLaC" + bytes([0x80, 0, 0, 34]) + streaminfo)
+        self.assertAlmostEqual(read_header_duration(path), 90.0)
+
+    def test_mp3_cbr_with_id3_tags(self):
+        id3v2 = b"ID3\x03\x00\x00" + bytes([0, 0, 0, 20]) + b"\0" * 20
+        audio = (_mp3_frame_header() + b"\0" * 413) * 100
+        path = self._write("a.mp3", id3v2 + audio + b"TAG" + b"\0" * 125)
+        self.assertAlmostEqual(read_header_duration(path), len(audio) * 8 / 128000)
+
+    def test_mp3_xing_frame_count(self):
+        frame = _mp3_frame_header() + b"\0" * 32
+        xing = b"Xing" + struct.pack(">II", 0x1, 3000)
+        path = self._write("a.mp3", frame + xing + b"\0" * 400)
+        self.assertAlmostEqual(read_header_duration(path), 3000 * 1152 / 44100)
+
+    def test_mp3_resource_file(self):
+        duration = read_header_duration(os.path.join(RESOURCES, "test.mp3"))
+        self.assertIsNotNone(duration)
+        self.assertAlmostEqual(duration, 3.48, places=1)
+
+    def test_m4a_mvhd_after_mdat(self):
+        def box(kind, payload):
+            return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+        mvhd = box(b"mvhd", b"\0\0\0\0" + b"\0" * 8 + struct.pack(">II", 1000, 125500))
+        data = box(b"ftyp", b"M4A \0\0\0\0") + box(b"mdat", b"\0" * 64)
+        path = self._write("a.m4a", data + box(b"moov", mvhd))
+        self.assertAlmostEqual(read_header_duration(path), 125.5)
+
+    def test_unrecognised_data_returns_none(self):
+        self.assertIsNone(read_header_duration(self._write("a.wav", b"junk")))
+        self.assertIsNone(read_header_duration(self._write("a.mp3", b"\0" * 64)))
+        self.assertIsNone(read_header_duration(self._write("a.ogg", b"OggS")))
+        self.assertIsNone(read_header_duration(os.path.join(self.tmp, "missing.flac")))
+
+
+class TestCalculateDuration(unittest.TestCase):
+    def test_header_duration_is_cached_without_decoding(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.wav")
+            with wave.open(path, "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(8000)
+                wf.writeframes(b"\0" * (8000 * 2 * 65))
+
+            with mock.patch.object(file_utils, "_decode_duration") as decode, \
+                    mock.patch.object(
+                        file_utils, "read_header_duration",
+                        wraps=file_utils.read_header_duration) as header:
+                self.assertEqual(file_utils.calculate_duration(path), "0:01:05")
+                self.assertEqual(file_utils.calculate_duration(path), "0:01:05")
+            decode.assert_not_called()
+            self.assertEqual(header.call_count, 1)
+
+    def test_falls_back_to_decode(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.aac")
+            with open(path, "wb") as f:
+                f.write(b"\0" * 8)
+            with mock.patch.object(file_utils, "probe_media", return_value=None), \
+                    mock.patch.object(file_utils, "_decode_duration", return_value=7.9):
+                self.assertEqual(file_utils.calculate_duration(path), "0:00:07")
+
+    def test_duration_cache_is_bounded(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(file_utils, "DURATION_CACHE_MAX_ENTRIES", 2), \
+                mock.patch.object(file_utils, "_duration_cache", file_utils.OrderedDict()), \
+                mock.patch.object(file_utils, "probe_duration", return_value=5.0) as probe:
+            paths = []
+            for name in ("a.aac", "b.aac", "c.aac"):
+                paths.append(os.path.join(tmp, name))
+                with open(paths[-1], "wb") as f:
+                    f.write(b"\0")
+                file_utils.calculate_duration(paths[-1])
+            self.assertEqual(len(file_utils._duration_cache), 2)
+
+            file_utils.calculate_duration(paths[0])  # evicted, probed again
+            self.assertEqual(probe.call_count, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
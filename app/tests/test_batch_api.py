@@ -0,0 +1,311 @@
+"""Tests for Batch API packaging, the job store and a mock batch server."""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.services.batch_api import (
+    BatchClient,
+    BatchJobStore,
+    build_batch_jsonl,
+    new_job,
+    parse_batch_output,
+    recording_id_for,
+)
+
+
+def _output_line(recording_id, content=None, status=200, error=None):
+    body = (
+        {"choices": [{"message": {"role": "assistant", "content": content}}]}
+        if status == 200 else {"error": {"message": error}}
+    )
+    return json.dumps({
+        "id": f"req_{recording_id}",
+        "custom_id": f"recording-{recording_id}",
+        "response": {"status_code": status, "body": body},
+        "error": None,
+    })
+
+
+class _MockBatchServer(BaseHTTPRequestHandler):
+    """Just enough of /v1/files and /v1/batches for one batch's lifecycle."""
+
+    uploads = {}
+    batches = {}
+    authorization_headers = []
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        self.authorization_headers.append(self.headers.get("Authorization"))
+        if self.headers.get("Authorization") != "Bearer test-key":
+            self._send_json({"error": {"message": "bad key"}}, 401)
+        elif self.path == "/v1/files":
+            assert b'name="purpose"' in body and b"batch" in body
+            file_id = f"file-{len(self.uploads) + 1}"
+            self.uploads[file_id] = body
+            self._send_json({"id": file_id, "purpose": "batch"})
+        elif self.path == "/v1/batches":
+            request = json.loads(body)
+            if request["input_file_id"] not in self.uploads:
+                self._send_json({"error": {"message": "no such file"}}, 400)
+                return
+            batch = {
+                "id": "batch-1",
+                "status": "validating",
+                "endpoint": request["endpoint"],
+                "input_file_id": request["input_file_id"],
+                "request_counts": {"total": 2, "completed": 0, "failed": 0},
+            }
+            self.batches[batch["id"]] = batch
+            self._send_json(batch)
+        else:
+            self._send_json({"error": {"message": "not found"}}, 404)
+
+    def do_GET(self):
+        self.authorization_headers.append(self.headers.get("Authorization"))
+        if self.path == "/v1/batches/batch-1":
+            batch = self.batches["batch-1"]
+            # Each poll moves the batch on one step
+            if batch["status"] == "validating":
+                batch["status"] = "in_progress"
+            elif batch["status"] == "in_progress":
+                batch.update(
+                    status="completed",
+                    output_file_id="file-out",
+                    error_file_id="file-err",
+                    request_counts={"total": 2, "completed": 1, "failed": 1},
+                )
+            self._send_json(batch)
+        elif self.path in ("/v1/files/file-out/content", "/v1/files/file-err/content"):
+            line = (
+                _output_line(1, "Summary one")
+                if "out" in self.path
+                else _output_line(2, status=400, error="context too long")
+            )
+            body = (line + "\n").encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json({"error": {"message": "not found"}}, 404)
+
+    def log_message(self, *_args):
+        pass
+
+
+class TestJsonl(unittest.TestCase):
+    def test_build_uses_chat_completion_requests(self):
+        jsonl = build_batch_jsonl(
+            [(1, "first transcript"), (7, "second")], "Summarise", "gpt-4o",
+            500, 0.2,
+        )
+        lines = [json.loads(line) for line in jsonl.splitlines()]
+        self.assertEqual([line["custom_id"] for line in lines],
+                         ["recording-1", "recording-7"])
+        self.assertEqual(lines[0]["url"], "/v1/chat/completions")
+        self.assertEqual(lines[0]["body"]["messages"], [
+            {"role": "system", "content": "Summarise"},
+            {"role": "user", "content": "first transcript"},
+        ])
+        self.assertEqual(lines[1]["body"]["max_tokens"], 500)
+        self.assertEqual(build_batch_jsonl([], "p", "m", 1, 0), "")
+
+    def test_parse_output_and_errors(self):
+        content = "\n".join([
+            _output_line(1, "done"),
+            _output_line(2, status=429, error="slow down"),
+            json.dumps({"custom_id": "recording-3", "response": None,
+                        "error": {"code": "x", "message": "expired"}}),
+            json.dumps({"custom_id": "someone-else", "response": {}}),
+            "not json",
+        ])
+        results, errors = parse_batch_output(content)
+        self.assertEqual(results, {1: "done"})
+        self.assertEqual(errors, {2: "slow down", 3: "expired"})
+        self.assertIsNone(recording_id_for("recording-x"))
+
+
+class TestJobStore(unittest.TestCase):
+    def test_jobs_persist_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "batch_jobs.json")
+            job = new_job([1, 2], "gpt-4o", None, "{}\n")
+            BatchJobStore(path).save(job)
+
+            reloaded = BatchJobStore(path)
+            self.assertEqual([j.job_id for j in reloaded.unfinished()], [job.job_id])
+            restored = reloaded.get(job.job_id)
+            self.assertEqual(restored.recording_ids, [1, 2])
+            self.assertEqual(restored.status, "pending")
+
+            restored.applied = True
+            reloaded.save(restored)
+            self.assertEqual(BatchJobStore(path).unfinished(), [])
+            reloaded.remove(job.job_id)
+            self.assertEqual(BatchJobStore(path).all(), [])
+
+    def test_corrupt_file_reads_as_empty(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "batch_jobs.json")
+            with open(path, "w") as f:
+                f.write("{truncated")
+            self.assertEqual(BatchJobStore(path).all(), [])
+
+
+class TestBatchLifecycle(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _MockBatchServer)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}/v1"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_submit_poll_and_collect(self):
+        client = BatchClient("test-key", self.base_url)
+        job = new_job(
+            [1, 2], "gpt-4o", self.base_url,
+            build_batch_jsonl([(1, "a"), (2, "b")], "p", "gpt-4o", 100, 0),
+        )
+
+        job.input_file_id = client.upload_file(job.input_jsonl)
+        self.assertIn(b"recording-2", _MockBatchServer.uploads[job.input_file_id])
+        job.update_from_batch(client.create_batch(job.input_file_id))
+        self.assertEqual((job.batch_id, job.status), ("batch-1", "validating"))
+
+        polls = 0
+        while not job.is_finished and polls < 5:
+            job.update_from_batch(client.get_batch(job.batch_id))
+            polls += 1
+        self.assertEqual(job.status, "completed")
+        self.assertEqual((job.completed_requests, job.failed_requests), (1, 1))
+
+        results, _ = parse_batch_output(client.download_file(job.output_file_id))
+        _, errors = parse_batch_output(client.download_file(job.error_file_id))
+        self.assertEqual(results, {1: "Summary one"})
+        self.assertEqual(errors, {2: "context too long"})
+
+    def test_rejected_key_raises(self):
+        import requests
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            BatchClient("wrong", self.base_url).upload_file("{}\n")
+
+    def _poll(self, keys, base_url=None, extra_jobs=()):
+        from app.services.llm_endpoints import endpoint_api_key
+        from app.threads.BatchPollingThread import BatchPollingThread
+
+        base_url = base_url or self.base_url
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        store = BatchJobStore(os.path.join(tmp.name, "jobs.json"))
+        for job in extra_jobs:
+            store.save(job)
+        store.save(new_job(
+            [1, 2], "gpt-4o", base_url,
+            build_batch_jsonl([(1, "a"), (2, "b")], "p", "gpt-4o", 100, 0),
+        ))
+        _MockBatchServer.batches.clear()
+        _MockBatchServer.authorization_headers.clear()
+        thread = BatchPollingThread(
+            store, lambda url: endpoint_api_key(url, keys.get), poll_interval=0.01)
+        finished = []
+        thread.job_finished.connect(lambda *args: finished.append(args))
+        thread.run()
+        return finished
+
+    def test_polling_uses_the_endpoint_key(self):
+        keys = {"OPENAI_API_KEY": "sk-openai", f"LLM_API_KEY:{self.base_url}": "test-key"}
+        ((_, results, errors),) = self._poll(keys)
+        self.assertEqual(results, {1: "Summary one"})
+        self.assertEqual(errors, {2: "context too long"})
+        self.assertEqual(set(_MockBatchServer.authorization_headers), {"Bearer test-key"})
+
+    def test_openai_key_never_sent_to_other_endpoints(self):
+        ((_, results, errors),) = self._poll({"OPENAI_API_KEY": "test-key"})
+        self.assertEqual(results, {})
+        self.assertIn("rejected", errors[1])
+        self.assertEqual(_MockBatchServer.authorization_headers, [None])
+
+    def test_remote_job_without_key_stays_queued(self):
+        with self.assertLogs("transcribrr", "ERROR"):
+            finished = self._poll({}, base_url="https://llm.example.com/v1")
+        self.assertEqual(finished, [])
+        self.assertEqual(_MockBatchServer.authorization_headers, [])
+
+    def test_broken_job_fails_alone(self):
+        broken = new_job([7], "gpt-4o", self.base_url, None)
+        keys = {f"LLM_API_KEY:{self.base_url}": "test-key"}
+        with self.assertLogs("transcribrr", "ERROR"):
+            finished = self._poll(keys, extra_jobs=[broken])
+        self.assertEqual(len(finished), 2)
+        by_job = {job_id: (results, errors) for job_id, results, errors in finished}
+        results, errors = by_job.pop(broken.job_id)
+        self.assertEqual(results, {})
+        self.assertIn("no input", errors[7])
+        # The other job was still submitted, polled and collected
+        ((results, errors),) = by_job.values()
+        self.assertEqual(results, {1: "Summary one"})
+
+
+class _FakeDatabase:
+    """Applies update_recording at once, failing for the given recording IDs."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.written = {}
+
+    def update_recording(self, recording_id, callback=None, error_callback=None, **fields):
+        if recording_id in self.failing:
+            error_callback("database is locked")
+        else:
+            self.written[recording_id] = fields
+            callback()
+
+
+class TestBatchControllerApply(unittest.TestCase):
+    def setUp(self):
+        from app.controllers.batch_controller import BatchController
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = BatchJobStore(os.path.join(tmp.name, "jobs.json"))
+        self.job = new_job([1, 2, 3], "gpt-4o", None, "{}\n")
+        self.job.status = "completed"
+        self.store.save(self.job)
+        self.make = lambda db: BatchController(db, store=self.store)
+
+    def test_failed_update_still_marks_job_applied(self):
+        db = _FakeDatabase(failing={2})
+        controller = self.make(db)
+        finished = []
+        controller.batch_job_finished.connect(lambda *args: finished.append(args))
+        with self.assertLogs("transcribrr", "ERROR"):
+            controller._on_job_finished(
+                self.job.job_id, {1: "one", 2: "two"}, {3: "context too long"})
+
+        self.assertEqual(db.written, {1: {"processed_text": "one"}})
+        self.assertTrue(self.store.get(self.job.job_id).applied)
+        self.assertEqual(finished, [(self.job.job_id, 1, 2)])
+        self.assertEqual(self.store.unfinished(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Tests for memory-aware batch size tuning."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.services import batch_tuner
+from app.services.batch_tuner import BatchTuner, is_out_of_memory, pick_batch_size
+
+GB = 1024**3
+
+
+class TestPickBatchSize(unittest.TestCase):
+    def test_largest_power_of_two_that_fits(self):
+        # 3 GB model -> 0.75 GB per item; 8 GB free * 0.8 headroom fits 8
+        self.assertEqual(pick_batch_size(8 * GB, 3 * GB), 8)
+        self.assertEqual(pick_batch_size(2 * GB, 3 * GB), 2)
+        self.assertEqual(pick_batch_size(100 * GB, 3 * GB), batch_tuner.MAX_BATCH_SIZE)
+
+    def test_never_below_one_and_respects_ceiling(self):
+        self.assertEqual(pick_batch_size(0, 3 * GB), 1)
+        self.assertEqual(pick_batch_size(100 * GB, 3 * GB, ceiling=4), 4)
+
+    def test_unknown_memory_uses_default(self):
+        self.assertEqual(pick_batch_size(None, None), batch_tuner.DEFAULT_BATCH_SIZE)
+        self.assertEqual(pick_batch_size(None, None, ceiling=2), 2)
+
+
+class TestOutOfMemory(unittest.TestCase):
+    def test_detects_allocation_failures(self):
+        self.assertTrue(is_out_of_memory(RuntimeError("CUDA out of memory. Tried to allocate")))
+        self.assertTrue(is_out_of_memory(MemoryError()))
+        self.assertFalse(is_out_of_memory(RuntimeError("shape mismatch")))
+
+
+class TestBatchTuner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "batch_tuning.json")
+        patcher = patch.object(batch_tuner, "free_memory_bytes", return_value=64 * GB)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_oom_ceiling_persists(self):
+        tuner = BatchTuner(self.path)
+        self.assertEqual(tuner.batch_size("m", "cuda"), batch_tuner.MAX_BATCH_SIZE)
+        self.assertEqual(tuner.record_oom("m", "cuda", 16), 8)
+        self.assertEqual(tuner.batch_size("m", "cuda"), 8)
+        # Other models and devices are unaffected
+        self.assertEqual(tuner.batch_size("m", "cpu"), batch_tuner.MAX_BATCH_SIZE)
+
+        reloaded = BatchTuner(self.path)
+        self.assertEqual(reloaded.batch_size("m", "cuda"), 8)
+        reloaded.record_success("m", "cuda", 8)
+        self.assertEqual(BatchTuner(self.path).entry("m", "cuda"),
+                         {"max_batch_size": 8, "last_good_batch_size": 8})
+
+    def test_corrupt_file_is_ignored(self):
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        tuner = BatchTuner(self.path)
+        with self.assertLogs("transcribrr", level="WARNING"):
+            self.assertEqual(tuner.batch_size("m", "cpu"), batch_tuner.MAX_BATCH_SIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()
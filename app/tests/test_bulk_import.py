@@ -0,0 +1,150 @@
+"""Tests for importing media files, singly and through BulkImportThread."""
+
+import os
+import tempfile
+import unittest
+import wave
+from concurrent.futures import BrokenExecutor, ThreadPoolExecutor
+from unittest.mock import patch
+
+from app import file_utils
+from app.ffmpeg_utils import MediaInfo
+from app.threads import BulkImportThread as bulk
+
+
+def _write_wav(path, seconds=2, rate=8000):
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(b"\0" * (rate * 2 * seconds))
+
+
+class TestImportMediaFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_supported_audio_is_linked_or_copied(self):
+        source = os.path.join(self.tmp.name, "talk.wav")
+        _write_wav(source, seconds=65)
+        dest_stem = os.path.join(self.tmp.name, "library", "talk")
+        os.makedirs(os.path.dirname(dest_stem))
+
+        with patch.object(file_utils, "probe_media", return_value=None):
+            dest_path, duration = file_utils.import_media_file(source, dest_stem)
+
+        self.assertEqual(dest_path, dest_stem + ".wav")
+        self.assertTrue(os.path.exists(dest_path))
+        self.assertEqual(duration, "0:01:05")
+
+    def test_file_without_audio_is_rejected(self):
+        source = os.path.join(self.tmp.name, "slides.mp4")
+        with open(source, "wb") as f:
+            f.write(b"\0" * 16)
+        dest_stem = os.path.join(self.tmp.name, "slides")
+
+        with patch.object(file_utils, "probe_media",
+                          return_value=MediaInfo(has_video=True)):
+            with self.assertRaises(ValueError):
+                file_utils.import_media_file(source, dest_stem)
+        self.assertEqual(os.listdir(self.tmp.name), ["slides.mp4"])
+
+
+class TestBulkImportThread(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.library = os.path.join(self.tmp.name, "library")
+        patcher = patch.object(bulk, "get_recordings_dir", return_value=self.library)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.results = []
+
+    def _sources(self, *names):
+        paths = []
+        for name in names:
+            paths.append(os.path.join(self.tmp.name, name))
+            _write_wav(paths[-1])
+        return paths
+
+    def _thread(self, sources, max_workers=2):
+        thread = bulk.BulkImportThread(sources, max_workers=max_workers)
+        thread.completed.connect(lambda records, failures: self.results.append((records, failures)))
+        return thread
+
+    def _use_threads(self, thread):
+        patcher = patch.object(
+            thread, "_create_executor", side_effect=lambda n: ThreadPoolExecutor(max_workers=n))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_imports_in_spawned_worker_processes(self):
+        sources = self._sources("a.wav", "b.wav")
+        thread = self._thread(sources)
+        executor = thread._create_executor(2)
+        self.assertEqual(executor._mp_context.get_start_method(), "spawn")
+        executor.shutdown()
+
+        thread.run()
+
+        (records, failures), = self.results
+        self.assertEqual(failures, [])
+        self.assertEqual(sorted(r[0] for r in records), ["a.wav", "b.wav"])
+        self.assertEqual({r[6] for r in records}, set(sources))
+        for record in records:
+            self.assertTrue(os.path.exists(record[1]))
+
+    def test_failing_file_is_reported_and_others_imported(self):
+        sources = self._sources("good.wav", "bad.wav")
+        real_import = file_utils.import_media_file
+
+        def import_one(source, stem):
+            if source.endswith("bad.wav"):
+                raise ValueError("File contains no audio track")
+            return real_import(source, stem)
+
+        thread = self._thread(sources)
+        self._use_threads(thread)
+        with patch.object(bulk, "import_media_file", side_effect=import_one):
+            thread.run()
+
+        (records, failures), = self.results
+        self.assertEqual([r[0] for r in records], ["good.wav"])
+        self.assertEqual(failures, [(sources[1], "File contains no audio track")])
+
+    def test_cancel_drops_queued_files_and_keeps_finished_ones(self):
+        sources = self._sources("a.wav", "b.wav", "c.wav")
+        thread = self._thread(sources, max_workers=1)
+        self._use_threads(thread)
+        real_import = file_utils.import_media_file
+
+        def import_then_cancel(source, stem):
+            thread.cancel()  # user cancels while the first file imports
+            return real_import(source, stem)
+
+        with patch.object(bulk, "import_media_file", side_effect=import_then_cancel):
+            thread.run()
+
+        (records, failures), = self.results
+        self.assertEqual([r[0] for r in records], ["a.wav"])
+        self.assertEqual(failures, [])
+        self.assertEqual(os.listdir(self.library), ["a.wav"])
+
+    def test_broken_process_pool_falls_back_to_threads(self):
+        class BrokenPool(ThreadPoolExecutor):
+            def submit(self, *args, **kwargs):
+                raise BrokenExecutor("worker failed to start")
+
+        sources = self._sources("a.wav", "b.wav")
+        thread = self._thread(sources)
+        with patch.object(thread, "_create_executor", return_value=BrokenPool()):
+            thread.run()
+
+        (records, failures), = self.results
+        self.assertEqual(failures, [])
+        self.assertEqual(sorted(r[0] for r in records), ["a.wav", "b.wav"])
+
+
+if __name__ == "__main__":
+    unittest.main()
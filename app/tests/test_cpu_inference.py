@@ -0,0 +1,44 @@
+"""Tests for CPU inference helpers."""
+
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+from app.services import cpu_inference
+from app.services.cpu_inference import word_error_rate
+
+
+class TestWordErrorRate(unittest.TestCase):
+    def test_identical_ignores_case_and_punctuation(self):
+        self.assertEqual(word_error_rate("Hello, world.", "hello world"), 0.0)
+
+    def test_substitution_insertion_deletion(self):
+        self.assertAlmostEqual(word_error_rate("a b c d", "a x c d"), 0.25)
+        self.assertAlmostEqual(word_error_rate("a b c d", "a b c d e"), 0.25)
+        self.assertAlmostEqual(word_error_rate("a b c d", "a c d"), 0.25)
+        self.assertAlmostEqual(word_error_rate("a b", ""), 1.0)
+
+    def test_empty_reference(self):
+        self.assertIsNone(word_error_rate("", "anything"))
+
+
+class TestConfigureThreads(unittest.TestCase):
+    def test_threads_follow_physical_cores_once(self):
+        calls = []
+        torch = types.SimpleNamespace(
+            set_num_threads=lambda n: calls.append(("intra", n)),
+            set_num_interop_threads=lambda n: calls.append(("inter", n)),
+            get_num_threads=lambda: 8,
+            get_num_interop_threads=lambda: 2,
+        )
+        with patch.dict(sys.modules, {"torch": torch}), \
+                patch.object(cpu_inference, "_threads_configured", False), \
+                patch.object(cpu_inference, "physical_cores", return_value=8):
+            cpu_inference.configure_cpu_threads()
+            cpu_inference.configure_cpu_threads()
+        self.assertEqual(calls, [("intra", 8), ("inter", 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -246,6 +246,15 @@ class TestDatabaseManagerBehavior(_DatabaseTestBase):
             cnt = c.execute("SELECT COUNT(*) FROM recordings WHERE id=?", (999999,)).fetchone()[0]
         self.assertEqual(cnt, 0)
 
+    def test_failed_update_calls_error_callback(self):
+        done, failed = _Wait(), _Wait()
+        with mock.patch("app.DatabaseManager.update_recording",
+                        side_effect=sqlite3.OperationalError("database is locked")):
+            self.mgr.update_recording(1, done.cb, error_callback=failed.cb, raw_transcript="x")
+            self.assertTrue(failed.wait(), "error callback not called")
+        self.assertIn("database is locked", failed.payload)
+        self.assertFalse(done.evt.is_set())
+
     def test_delete_nonexistent_recording_handles_gracefully(self):
         wdel = _Wait()
         self.mgr.delete_recording(424242, wdel.cb)
@@ -138,6 +138,40 @@ class TestDbUtilsCRUD(unittest.TestCase):
         cur.execute("SELECT COUNT(*) FROM recordings")
         self.assertIsNotNone(cur.fetchone(), "Table should still be accessible")
 
+    def test_create_recordings_batch_skips_duplicate_paths(self):
+        db_utils.create_recording(self.conn, ("a", "/a", "t", "d"))
+        batch = [
+            ("a", "/a", "t", "d"),
+            ("b", "/b", "t", "d", "", "", "/src/b"),
+            ("b2", "/b", "t", "d"),
+            ("c", "/c", "t", "d"),
+        ]
+        new_ids, duplicates = db_utils.create_recordings(self.conn, batch)
+        self.assertEqual(len(new_ids), 2)
+        self.assertEqual(duplicates, ["/a", "/b"])
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT file_path, original_source_identifier FROM recordings ORDER BY id"
+        )
+        self.assertEqual(
+            cur.fetchall(), [("/a", None), ("/b", "/src/b"), ("/c", None)]
+        )
+
+    def test_create_recordings_batch_larger_than_param_limit(self):
+        batch = [(f"f{i}", f"/p/{i}", "t", "d") for i in range(db_utils.MAX_QUERY_PARAMS + 5)]
+        new_ids, duplicates = db_utils.create_recordings(self.conn, batch)
+        self.assertEqual(len(new_ids), len(batch))
+        self.assertEqual(duplicates, [])
+        self.assertEqual(db_utils.create_recordings(self.conn, batch[:3]), ([], [r[1] for r in batch[:3]]))
+
+    def test_create_recordings_batch_rolls_back_on_error(self):
+        batch = [("a", "/a", "t", "d"), (None, "/b", "t", "d")]
+        with self.assertRaises(sqlite3.IntegrityError):
+            db_utils.create_recordings(self.conn, batch)
+        cur = self.conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM recordings")
+        self.assertEqual(cur.fetchone()[0], 0)
+
 
 class TestDbUtilsQueries(unittest.TestCase):
     def setUp(self):
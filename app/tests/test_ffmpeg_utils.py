@@ -0,0 +1,185 @@
+"""Tests for ffmpeg_utils probing, command building, progress parsing and process control."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app import ffmpeg_utils
+from app.ffmpeg_utils import (
+    FFmpegCancelled,
+    FFmpegError,
+    FFmpegProcess,
+    MediaInfo,
+    build_command,
+    cache_media_info,
+    copy_target_format,
+    get_cached_media_info,
+    is_directly_usable,
+    parse_probe_output,
+    parse_progress_line,
+)
+from app.file_utils import calculate_duration, link_or_copy
+
+
+def _script(body):
+    """Return a command running a Python snippet in place of ffmpeg."""
+    return [sys.executable, "-c", body]
+
+
+class TestProgressParsing(unittest.TestCase):
+    def test_out_time_keys_are_microseconds(self):
+        self.assertEqual(parse_progress_line("out_time_us=2500000\n"), 2.5)
+        self.assertEqual(parse_progress_line("out_time_ms=1000000"), 1.0)
+
+    def test_other_lines_ignored(self):
+        self.assertIsNone(parse_progress_line("progress=continue"))
+        self.assertIsNone(parse_progress_line("out_time=00:00:01.000000"))
+        self.assertIsNone(parse_progress_line("out_time_us=N/A"))
+        self.assertIsNone(parse_progress_line(""))
+
+    def test_negative_positions_clamped(self):
+        self.assertEqual(parse_progress_line("out_time_us=-23219"), 0.0)
+
+
+class TestCommandBuilding(unittest.TestCase):
+    def test_copy_target_format(self):
+        self.assertEqual(copy_target_format("mp3"), "mp3")
+        self.assertEqual(copy_target_format("AAC"), "m4a")
+        self.assertIsNone(copy_target_format("pcm_s16le"))
+        self.assertIsNone(copy_target_format(None))
+
+    def test_stream_copy_skips_video(self):
+        cmd = build_command("ffmpeg", "in.mp4", "out.m4a", stream_copy=True)
+        self.assertIn("-vn", cmd)
+        self.assertEqual(cmd[cmd.index("-c:a") + 1], "copy")
+        self.assertEqual(cmd[cmd.index("-progress") + 1], "pipe:1")
+        self.assertEqual(cmd[-1], "out.m4a")
+
+    def test_encode_uses_target_encoder(self):
+        cmd = build_command("ffmpeg", "in.wav", "out.mp3", stream_copy=False)
+        self.assertEqual(cmd[cmd.index("-c:a") + 1], "libmp3lame")
+
+
+class TestMediaProbe(unittest.TestCase):
+    def test_parse_probe_output_prefers_audio_stream(self):
+        data = {
+            "streams": [
+                {"codec_type": "video", "codec_name": "h264"},
+                {
+                    "codec_type": "audio",
+                    "codec_name": "aac",
+                    "sample_rate": "48000",
+                    "channels": 2,
+                    "bit_rate": "128000",
+                    "duration": "61.5",
+                },
+            ],
+            "format": {"duration": "62.0", "bit_rate": "900000"},
+        }
+        info = parse_probe_output(data)
+        self.assertEqual(
+            info,
+            MediaInfo("aac", 48000, 2, 61.5, 128000, has_video=True),
+        )
+
+    def test_cover_art_is_not_video(self):
+        data = {
+            "streams": [
+                {"codec_type": "audio", "codec_name": "mp3"},
+                {
+                    "codec_type": "video",
+                    "codec_name": "mjpeg",
+                    "disposition": {"attached_pic": 1},
+                },
+            ],
+            "format": {"duration": "10.0"},
+        }
+        info = parse_probe_output(data)
+        self.assertFalse(info.has_video)
+        self.assertEqual(info.duration, 10.0)
+        self.assertTrue(is_directly_usable("song.mp3", info))
+
+    def test_is_directly_usable(self):
+        self.assertTrue(is_directly_usable("a.m4a", MediaInfo(codec="aac")))
+        self.assertTrue(is_directly_usable("a.wav", MediaInfo(codec="pcm_s24le")))
+        self.assertFalse(is_directly_usable("a.wav", MediaInfo(codec="adpcm_ms")))
+        self.assertFalse(is_directly_usable("a.aac", MediaInfo(codec="aac")))
+        self.assertFalse(
+            is_directly_usable("a.m4a", MediaInfo(codec="aac", has_video=True))
+        )
+        self.assertFalse(is_directly_usable("a.mp3", MediaInfo()))
+        self.assertFalse(is_directly_usable("a.mp3", None))
+
+    def test_cached_probe_feeds_duration_and_invalidates_on_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "clip.mp3")
+            with open(path, "wb") as f:
+                f.write(b"\0" * 16)
+            cache_media_info(path, MediaInfo(codec="mp3", duration=3725.4))
+            self.assertEqual(calculate_duration(path), "1:02:05")
+
+            copy_path = link_or_copy(path, os.path.join(tmp, "copy.mp3"))
+            self.assertTrue(os.path.exists(copy_path))
+
+            with open(path, "ab") as f:
+                f.write(b"\0")
+            self.assertIsNone(get_cached_media_info(path))
+
+    def test_probe_cache_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(ffmpeg_utils, "PROBE_CACHE_MAX_ENTRIES", 2), \
+                patch.object(ffmpeg_utils, "_probe_cache", ffmpeg_utils.OrderedDict()):
+            paths = []
+            for name in ("a.mp3", "b.mp3", "c.mp3"):
+                path = os.path.join(tmp, name)
+                with open(path, "wb") as f:
+                    f.write(b"\0")
+                paths.append(path)
+            cache_media_info(paths[0], MediaInfo(codec="mp3"))
+            cache_media_info(paths[1], MediaInfo(codec="mp3"))
+            self.assertIsNotNone(get_cached_media_info(paths[0]))  # now most recent
+            cache_media_info(paths[2], MediaInfo(codec="mp3"))
+
+            self.assertIsNotNone(get_cached_media_info(paths[0]))
+            self.assertIsNone(get_cached_media_info(paths[1]))
+            self.assertIsNotNone(get_cached_media_info(paths[2]))
+
+
+class TestFFmpegProcess(unittest.TestCase):
+    def test_progress_reported_until_complete(self):
+        body = (
+            "for t in (0, 5000000, 10000000):\n"
+            "    print(f'out_time_us={t}', flush=True)\n"
+            "print('progress=end', flush=True)\n"
+        )
+        seen = []
+        FFmpegProcess(_script(body), duration=20.0).run(progress_callback=seen.append)
+        self.assertEqual(seen, [0, 25, 50, 100])
+
+    def test_nonzero_exit_raises_with_stderr(self):
+        body = "import sys; sys.stderr.write('bad input'); sys.exit(1)"
+        with self.assertRaises(FFmpegError) as ctx:
+            FFmpegProcess(_script(body)).run()
+        self.assertIn("bad input", str(ctx.exception))
+
+    def test_cancel_check_terminates_process(self):
+        body = (
+            "import time\n"
+            "while True:\n"
+            "    print('out_time_us=0', flush=True)\n"
+            "    time.sleep(0.05)\n"
+        )
+        with self.assertRaises(FFmpegCancelled):
+            FFmpegProcess(_script(body)).run(cancel_check=lambda: True)
+
+    def test_terminate_before_start(self):
+        process = FFmpegProcess(_script("pass"))
+        process.terminate()
+        with self.assertRaises(FFmpegCancelled):
+            process.run()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,286 @@
+"""Tests for GPT4ProcessingThread: streaming responses and request orchestration."""
+
+import io
+import json
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+
+from app.threads import GPT4ProcessingThread as gpt_module
+from app.threads.GPT4ProcessingThread import GPT4ProcessingThread
+
+
+def _event(content=None, finish_reason=None):
+    delta = {} if content is None else {"content": content}
+    choice = {"index": 0, "delta": delta, "finish_reason": finish_reason}
+    return "data: " + json.dumps({"choices": [choice]}, ensure_ascii=False)
+
+
+def _sse_response(lines):
+    """Return a streaming requests.Response whose body is the given SSE lines."""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "text/event-stream"
+    response.raw = io.BytesIO(("\n\n".join(lines) + "\n\n").encode("utf-8"))
+    return response
+
+
+def _thread(**kwargs):
+    kwargs.setdefault("openai_api_key", "sk-test")
+    return GPT4ProcessingThread(
+        transcript=kwargs.pop("transcript", "hello"),
+        prompt_instructions=kwargs.pop("prompt_instructions", "Summarize"),
+        gpt_model="gpt-4o",
+        max_tokens=100,
+        temperature=0.0,
+        **kwargs,
+    )
+
+
+class TestParseStreamLine(unittest.TestCase):
+    def test_data_line_yields_content_delta(self):
+        self.assertEqual(
+            GPT4ProcessingThread._parse_stream_line(_event("Hi")), ("Hi", None))
+
+    def test_finish_reason_is_reported(self):
+        self.assertEqual(
+            GPT4ProcessingThread._parse_stream_line(_event(finish_reason="stop")),
+            ("", "stop"),
+        )
+
+    def test_done_marker(self):
+        self.assertIsNone(GPT4ProcessingThread._parse_stream_line("data: [DONE]"))
+
+    def test_comments_blank_lines_and_other_fields_are_ignored(self):
+        for line in ("", None, ": keep-alive", "event: message", "id: 3"):
+            self.assertEqual(GPT4ProcessingThread._parse_stream_line(line), ("", None))
+
+    def test_malformed_json_is_skipped(self):
+        with self.assertLogs("transcribrr", "WARNING"):
+            self.assertEqual(
+                GPT4ProcessingThread._parse_stream_line("data: {not json"), ("", None))
+
+    def test_error_event_raises(self):
+        line = 'data: {"error": {"message": "overloaded"}}'
+        with self.assertRaisesRegex(Exception, "overloaded"):
+            GPT4ProcessingThread._parse_stream_line(line)
+
+
+class TestReadStream(unittest.TestCase):
+    def setUp(self):
+        self.thread = _thread()
+        self.partials = []
+        self.thread.partial_text.connect(self.partials.append)
+
+    def test_accumulates_deltas_until_done(self):
+        response = _sse_response(
+            [_event("Hello"), ": ping", _event(", world"),
+             _event(finish_reason="stop"), "data: [DONE]"])
+        self.assertEqual(self.thread._read_stream(response), "Hello, world")
+        self.assertEqual(self.partials[-1], "Hello, world")
+
+    def test_utf8_split_across_network_chunks(self):
+        # Pad so "é" straddles the boundary of iter_lines' 512-byte reads
+        head = _event("caf").split("caf")[0].encode("utf-8")
+        text = "x" * (511 - len(head) - 3) + "café – naïve"
+        response = _sse_response([_event(text), "data: [DONE]"])
+        self.assertEqual(response.raw.getvalue()[510:513], "fé".encode("utf-8"))
+        self.assertEqual(self.thread._read_stream(response), text)
+
+    def test_finish_reason_without_done_is_complete(self):
+        response = _sse_response([_event("Hi"), _event(finish_reason="stop")])
+        self.assertEqual(self.thread._read_stream(response), "Hi")
+
+    def test_stream_ending_early_raises(self):
+        response = _sse_response([_event("Hel"), _event("lo")])
+        with self.assertRaises(requests.RequestException):
+            self.thread._read_stream(response)
+        self.assertNotIn("Hello", self.partials)
+
+    def test_cancel_mid_stream_returns_without_error(self):
+        lines = [_event("one "), _event("two "), _event("three")]
+
+        class CancellingResponse:
+            encoding = None
+
+            def iter_lines(inner, decode_unicode=False):
+                yield lines[0]
+                self.thread.cancel()
+                yield lines[1]
+                yield lines[2]
+
+        self.assertEqual(self.thread._read_stream(CancellingResponse()), "one ")
+
+    def test_partial_text_is_throttled(self):
+        response = _sse_response(
+            [_event("a"), _event("b"), _event("c"), _event("d"), "data: [DONE]"])
+        clock = iter([10.0, 10.05, 10.2, 10.25])
+        with patch.object(gpt_module.time, "monotonic", side_effect=lambda: next(clock)):
+            self.thread._read_stream(response)
+        # Emitted at 10.0 and 10.2 only, then the final text once
+        self.assertEqual(self.partials, ["a", "abc", "abcd"])
+
+
+class TestStreamingRun(unittest.TestCase):
+    def setUp(self):
+        self.session = Mock()
+        self.cache = Mock()
+        self.cache.get.return_value = None
+        for target, value in (
+            ("get_session", self.session),
+            ("get_response_cache", self.cache),
+            ("get_rate_limiter", Mock()),
+            ("backoff_delay", 0),
+        ):
+            patcher = patch.object(gpt_module, target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.completed, self.errors = [], []
+
+    def _run(self):
+        thread = _thread()
+        thread.completed.connect(self.completed.append)
+        thread.error.connect(self.errors.append)
+        thread.run()
+
+    def test_complete_stream_is_cached(self):
+        self.session.send.return_value = _sse_response([_event("Done"), "data: [DONE]"])
+        self._run()
+        self.assertEqual(self.completed, ["Done"])
+        self.cache.put.assert_called_once()
+
+    def test_truncated_stream_is_retried_and_never_cached(self):
+        self.session.send.side_effect = lambda *a, **k: _sse_response([_event("Partial")])
+        self._run()
+        self.assertEqual(self.completed, [])
+        self.assertEqual(len(self.errors), 1)
+        self.assertEqual(
+            self.session.send.call_count, GPT4ProcessingThread.MAX_RETRY_ATTEMPTS)
+        self.cache.put.assert_not_called()
+
+
+class TestMapReduce(unittest.TestCase):
+    def setUp(self):
+        self.thread = _thread(stream=False)
+        self.requests = []
+        self.priorities = {}
+        self.lock = threading.Lock()
+
+    def _fake_send(self, fail_on=None):
+        def send(messages, stream=None, quiet=False, priority=None):
+            system, user = messages[0]["content"], messages[1]["content"]
+            with self.lock:
+                self.requests.append((system, user))
+                self.priorities[user] = priority
+            if user == fail_on:
+                raise Exception("OpenAI API error: server_error")
+            if user.startswith("chunk "):
+                # Later parts finish first, so completion order is reversed
+                time.sleep(0.01 * (5 - int(user.split()[1])))
+                return f"summary of {user}"
+            return "combined"
+        return send
+
+    def test_parts_are_combined_in_order(self):
+        chunks = [f"chunk {i}" for i in range(1, 5)]
+        with patch.object(self.thread, "_send_api_request", side_effect=self._fake_send()):
+            self.assertEqual(self.thread._map_reduce(chunks), "combined")
+
+        map_requests, reduce_request = self.requests[:-1], self.requests[-1]
+        self.assertEqual(sorted(user for _, user in map_requests), chunks)
+        for system, user in map_requests:
+            index = user.split()[1]
+            self.assertIn("Summarize", system)
+            self.assertIn(f"This is part {index} of 4", system)
+
+        system, user = reduce_request
+        self.assertEqual(
+            system,
+            GPT4ProcessingThread.REDUCE_INSTRUCTIONS.format(instructions="Summarize"))
+        self.assertEqual(user, "\n\n".join(
+            f"[Part {i}]\nsummary of chunk {i}" for i in range(1, 5)))
+
+    def test_parts_queue_at_batch_priority(self):
+        from app.services.rate_limiter import RATE_PRIORITY_BATCH
+
+        chunks = [f"chunk {i}" for i in range(1, 4)]
+        with patch.object(self.thread, "_send_api_request", side_effect=self._fake_send()):
+            self.thread._map_reduce(chunks)
+        combined = self.requests[-1][1]
+        self.assertEqual(
+            {user: p for user, p in self.priorities.items() if user != combined},
+            dict.fromkeys(chunks, RATE_PRIORITY_BATCH),
+        )
+        # The final combine uses the thread's own priority
+        self.assertIsNone(self.priorities[combined])
+
+    def test_process_parts_returns_results_in_input_order(self):
+        with patch.object(self.thread, "_send_api_request", side_effect=self._fake_send()):
+            results = self.thread._process_parts(
+                ["chunk 1", "chunk 2", "chunk 3"], lambda i, n: "prompt", "part")
+        self.assertEqual(results, [f"summary of chunk {i}" for i in (1, 2, 3)])
+
+    def test_failed_part_aborts_without_reducing(self):
+        chunks = [f"chunk {i}" for i in range(1, 5)]
+        send = self._fake_send(fail_on="chunk 2")
+        with patch.object(self.thread, "_send_api_request", side_effect=send):
+            with self.assertRaisesRegex(Exception, "server_error"):
+                self.thread._map_reduce(chunks)
+        self.assertFalse(any(user.startswith("[Part") for _, user in self.requests))
+
+    def test_failed_part_reports_error_from_run(self):
+        cache = Mock()
+        cache.get.return_value = None
+        completed, errors = [], []
+        self.thread.completed.connect(completed.append)
+        self.thread.error.connect(errors.append)
+        send = self._fake_send(fail_on="chunk 3")
+        with patch.object(gpt_module, "get_response_cache", return_value=cache), \
+                patch.object(self.thread, "_split_if_too_long",
+                             return_value=["chunk 1", "chunk 2", "chunk 3"]), \
+                patch.object(self.thread, "_send_api_request", side_effect=send):
+            self.thread.run()
+        self.assertEqual(completed, [])
+        self.assertEqual(len(errors), 1)
+        cache.put.assert_not_called()
+
+
+class TestSmartFormatMode(unittest.TestCase):
+    TEXT = "First paragraph.\nSecond paragraph."
+
+    def _run(self, previous_html):
+        thread = _thread(
+            transcript=self.TEXT, stream=False, use_cache=False,
+            previous_html=previous_html)
+        sent = []
+
+        def send(messages, stream=None, quiet=False, priority=None):
+            sent.append(messages[1]["content"])
+            return "".join(f"<p>{line}</p>" for line in messages[1]["content"].split("\n"))
+
+        completed = []
+        thread.completed.connect(completed.append)
+        with patch.object(thread, "_send_api_request", side_effect=send):
+            thread.run()
+        return sent, completed[0]
+
+    def test_first_format_sends_the_whole_document_once(self):
+        for previous in (None, "", "<p>Formatted before markers existed</p>"):
+            sent, _ = self._run(previous)
+            self.assertEqual(sent, [self.TEXT], previous)
+
+    def test_marked_previous_html_formats_only_changes(self):
+        from app.services.incremental_format import mark_document
+
+        _, result = self._run(None)
+        previous = mark_document(result)
+        self.TEXT = "First paragraph.\nSecond paragraph, edited."
+        sent, _ = self._run(previous)
+        self.assertEqual(sent, ["Second paragraph, edited."])
+
+
+if __name__ == "__main__":
+    unittest.main()
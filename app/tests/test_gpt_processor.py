@@ -11,6 +11,7 @@ from typing import Dict, Any
 
 from app.controllers.gpt_controller import GPTController
 from app.models.recording import Recording
+from app.ThreadManager import ThreadManager
 
 
 class TestGPTController(unittest.TestCase):
@@ -18,6 +19,10 @@ class TestGPTController(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
+        # Fresh scheduler so mock threads never left running don't fill the pool
+        ThreadManager.create_for_testing()
+        self.addCleanup(ThreadManager.reset_for_tests)
+
         # Mock database manager
         self.db_manager = Mock()
         
@@ -352,8 +357,8 @@ class TestGPTController(unittest.TestCase):
         # Verify thread is stored
         self.assertIn("process", self.controller.threads)
         
-        # Get the connected finished handler
-        finished_handler = self.mock_thread_instance.finished.connect.call_args[0][0]
+        # Get the controller's finished handler (ThreadManager connects its own after)
+        finished_handler = self.mock_thread_instance.finished.connect.call_args_list[0][0][0]
         
         # Act: Simulate thread finished
         finished_handler()
@@ -430,5 +435,47 @@ class TestGPTController(unittest.TestCase):
         )
 
 
+    def _use_keys(self, keys):
+        self.controller.get_api_key = Mock(side_effect=keys.get)
+
+    def _sent_key(self):
+        return self.mock_thread_class.call_args.kwargs["openai_api_key"]
+
+    def test_openai_key_only_sent_to_openai(self):
+        self._use_keys({"OPENAI_API_KEY": "sk-openai"})
+        for base_url, expected in (
+            ("", "sk-openai"),
+            ("https://api.openai.com/v1", "sk-openai"),
+            ("http://localhost:11434/v1", ""),
+        ):
+            config = dict(self.config, gpt_api_base_url=base_url)
+            self.assertTrue(self.controller.process(
+                self.recording, "Test prompt", config, self.busy_guard_callback))
+            self.assertEqual(self._sent_key(), expected, base_url)
+
+    def test_third_party_endpoint_uses_its_own_key(self):
+        url = "https://llm.example.com/v1"
+        self._use_keys({"OPENAI_API_KEY": "sk-openai", f"LLM_API_KEY:{url}": "own-key"})
+        config = dict(self.config, gpt_api_base_url=url)
+        self.assertTrue(self.controller.process(
+            self.recording, "Test prompt", config, self.busy_guard_callback))
+        self.assertEqual(self._sent_key(), "own-key")
+
+    def test_third_party_endpoint_without_key_is_refused(self):
+        self._use_keys({"OPENAI_API_KEY": "sk-openai"})
+        config = dict(self.config, gpt_api_base_url="https://llm.example.com/v1")
+        self.assertFalse(self.controller.process(
+            self.recording, "Test prompt", config, self.busy_guard_callback))
+        self.mock_thread_class.assert_not_called()
+
+
+    def test_smart_format_result_gets_block_markers(self):
+        self.controller._on_format_completed(
+            "<h3>Title</h3><p>Body</p>", self.completion_callback)
+        (formatted,), _ = self.completion_callback.call_args
+        self.assertEqual(formatted.count("<!--tf:"), 2)
+        self.assertIn("<h3>Title</h3>", formatted)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""Tests for the shared pooled HTTP clients."""
+
+import threading
+import unittest
+
+from app.services import http_client
+
+
+class TestSharedSession(unittest.TestCase):
+    def setUp(self):
+        http_client.configure(pool_size=3, http2=False)
+
+    def tearDown(self):
+        http_client.configure()
+
+    def test_session_is_shared_across_threads(self):
+        sessions = []
+        threads = [
+            threading.Thread(target=lambda: sessions.append(http_client.get_session()))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len({id(s) for s in sessions}), 1)
+
+    def test_pool_size_and_no_adapter_retries(self):
+        adapter = http_client.get_session().get_adapter("https://api.openai.com")
+        self.assertEqual(adapter._pool_maxsize, 3)
+        self.assertEqual(adapter.max_retries.total, 0)
+
+    def test_configure_rebuilds_session(self):
+        first = http_client.get_session()
+        http_client.configure(pool_size=5)
+        second = http_client.get_session()
+        self.assertIsNot(first, second)
+        self.assertEqual(second.get_adapter("https://x")._pool_maxsize, 5)
+
+    def test_invalid_pool_size_falls_back_to_default(self):
+        http_client.configure(pool_size="many", http2=False)
+        adapter = http_client.get_session().get_adapter("https://x")
+        self.assertEqual(adapter._pool_maxsize, http_client.DEFAULT_POOL_SIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""Tests for the icon cache in ui_utils.icon_utils."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.ui_utils import icon_utils
+
+
+class TestIconCache(unittest.TestCase):
+    def setUp(self):
+        icon_utils.clear_icon_cache()
+        self.addCleanup(icon_utils.clear_icon_cache)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.svg = os.path.join(self.tmp.name, "folder.svg")
+        with open(self.svg, "w") as f:
+            f.write("<svg xmlns='http://www.w3.org/2000/svg'/>")
+
+        create = patch.object(icon_utils, "_create_icon",
+                              side_effect=lambda *args: object())
+        self.create = create.start()
+        self.addCleanup(create.stop)
+        ratio = patch.object(icon_utils, "_device_pixel_ratio", return_value=1.0)
+        self.ratio = ratio.start()
+        self.addCleanup(ratio.stop)
+
+    def test_repeated_loads_are_cached(self):
+        first = icon_utils.load_icon(self.svg, size=24, theme="light")
+        for _ in range(50):
+            self.assertIs(icon_utils.load_icon(self.svg, size=24, theme="light"), first)
+        self.assertEqual(self.create.call_count, 1)
+        self.create.assert_called_once_with(os.path.abspath(self.svg), 24, "light", 1.0)
+
+    def test_size_theme_and_ratio_are_part_of_the_key(self):
+        icon_utils.load_icon(self.svg, size=24, theme="light")
+        icon_utils.load_icon(self.svg, size=20, theme="light")
+        icon_utils.load_icon(self.svg, size=24, theme="dark")
+        self.ratio.return_value = 2.0
+        icon_utils.load_icon(self.svg, size=24, theme="light")
+        self.assertEqual(self.create.call_count, 4)
+
+        icon_utils.clear_icon_cache()
+        icon_utils.load_icon(self.svg, size=24, theme="light")
+        self.assertEqual(self.create.call_count, 5)
+
+    def test_missing_path_is_not_cached(self):
+        missing = os.path.join(self.tmp.name, "missing.svg")
+        with self.assertLogs("transcribrr", level="WARNING"):
+            icon_utils.load_icon(missing)
+        self.create.assert_not_called()
+        self.assertEqual(icon_utils._icon_cache, {})
+
+
+class TestDiskCachePath(unittest.TestCase):
+    def test_name_tracks_source_and_settings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            svg = os.path.join(tmp, "play.svg")
+            with open(svg, "w") as f:
+                f.write("<svg/>")
+            path = icon_utils._disk_cache_path(tmp, svg, 24, "dark", 2.0)
+            self.assertEqual(os.path.dirname(path), tmp)
+            self.assertTrue(os.path.basename(path).startswith("play-"))
+            self.assertTrue(path.endswith("-dark-24@2x.png"))
+            self.assertEqual(path, icon_utils._disk_cache_path(tmp, svg, 24, "dark", 2.0))
+            self.assertNotEqual(path, icon_utils._disk_cache_path(tmp, svg, 24, "light", 2.0))
+
+            # An edited icon gets a fresh cache entry
+            with open(svg, "w") as f:
+                f.write("<svg width='2'/>")
+            self.assertNotEqual(path, icon_utils._disk_cache_path(tmp, svg, 24, "dark", 2.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""Tests for paragraph-level diffing used by incremental smart formatting."""
+
+import unittest
+
+from app.services.incremental_format import (
+    clean_fragment,
+    has_markers,
+    html_to_lines,
+    mark_document,
+    parse_blocks,
+    plan_blocks,
+    render_blocks,
+    split_top_level,
+)
+
+
+def _words(text):
+    return len(text.split())
+
+
+def _format_all(blocks):
+    """Stand-in for the model: wrap each block's lines in a heading + list."""
+    for block in blocks:
+        if block.html is None:
+            items = "".join(f"<li>{line}</li>" for line in block.lines)
+            block.html = f"<h3>Section</h3><ul>{items}</ul>"
+    return render_blocks(blocks)
+
+
+class TestHtmlToLines(unittest.TestCase):
+    def test_block_elements_become_lines(self):
+        fragment = "<h3>Intro</h3><p>One <strong>bold</strong>\nword</p><ul><li>a</li><li>b &amp; c</li></ul>"
+        self.assertEqual(html_to_lines(fragment),
+                         ["Intro", "One bold word", "a", "b & c"])
+
+    def test_clean_fragment(self):
+        reply = "```html\n<html><body><p>Hi</p></body></html>\n```"
+        self.assertEqual(clean_fragment(reply), "<p>Hi</p>")
+
+
+class TestPlanBlocks(unittest.TestCase):
+    def setUp(self):
+        self.text = "\n\n".join(f"Paragraph {i} has some words." for i in range(6))
+
+    def test_first_format_groups_all_lines(self):
+        blocks = plan_blocks(self.text, "", max_tokens=10, count=_words)
+        self.assertEqual([len(b.lines) for b in blocks], [2, 2, 2])
+        self.assertTrue(all(b.html is None for b in blocks))
+
+    def test_unchanged_rendered_text_reuses_every_block(self):
+        formatted = _format_all(plan_blocks(self.text, "", 10, _words))
+        rendered = "\n".join(html_to_lines(formatted))
+        blocks = plan_blocks(rendered, formatted, 10, _words)
+        self.assertTrue(all(b.html is not None for b in blocks))
+        self.assertEqual(render_blocks(blocks), formatted)
+
+    def test_only_edited_block_is_resent(self):
+        formatted = _format_all(plan_blocks(self.text, "", 10, _words))
+        rendered = "\n".join(html_to_lines(formatted))
+        edited = rendered.replace("Paragraph 3", "Paragraph three")
+        edited += "\nA brand new closing line."
+        blocks = plan_blocks(edited, formatted, 10, _words)
+        pending = [line for b in blocks if b.html is None for line in b.lines]
+        self.assertEqual(pending, [
+            "Section",
+            "Paragraph 2 has some words.",
+            "Paragraph three has some words.",
+            "A brand new closing line.",
+        ])
+        self.assertEqual(sum(b.html is not None for b in blocks), 2)
+
+    def test_markers_survive_parse(self):
+        formatted = _format_all(plan_blocks("One.\nTwo.", "", 10, _words))
+        ((hashes, fragment),) = parse_blocks(formatted).items()
+        self.assertEqual(len(hashes), 3)  # heading plus two list items
+        self.assertTrue(fragment.startswith("<h3>"))
+
+    def test_unformatted_blocks_render_as_paragraphs(self):
+        blocks = plan_blocks("a < b", "", 10, _words)
+        self.assertIn("<p>a &lt; b</p>", render_blocks(blocks))
+
+
+class TestMarkDocument(unittest.TestCase):
+    WHOLE = (
+        "```html\n<html><body><h3>Intro</h3>\n<p>Hello <strong>there</strong></p>"
+        "<ul><li>a</li><li>b</li></ul><br><p>Last</p></body></html>\n```"
+    )
+
+    def test_splits_at_top_level_block_elements(self):
+        self.assertEqual(split_top_level(clean_fragment(self.WHOLE)), [
+            "<h3>Intro</h3>",
+            "<p>Hello <strong>there</strong></p>",
+            "<ul><li>a</li><li>b</li></ul>",
+            "<br>",
+            "<p>Last</p>",
+        ])
+
+    def test_whole_document_result_gets_markers_per_block(self):
+        marked = mark_document(self.WHOLE)
+        self.assertTrue(has_markers(marked))
+        self.assertEqual(list(parse_blocks(marked).values()), [
+            "<h3>Intro</h3>",
+            "<p>Hello <strong>there</strong></p>",
+            "<ul><li>a</li><li>b</li></ul><br>",  # spacing joins the block before
+            "<p>Last</p>",
+        ])
+        # Already marked output is left alone
+        self.assertEqual(mark_document(marked), marked)
+
+    def test_next_format_reuses_marked_blocks(self):
+        marked = mark_document(self.WHOLE)
+        rendered = "\n".join(html_to_lines(marked)).replace("Last", "Final")
+        blocks = plan_blocks(rendered, marked, 10, _words)
+        self.assertEqual([b.lines for b in blocks if b.html is None], [["Final"]])
+        self.assertEqual(sum(b.html is not None for b in blocks), 3)
+
+    def test_has_markers(self):
+        self.assertFalse(has_markers(None))
+        self.assertFalse(has_markers(""))
+        self.assertFalse(has_markers("<p>Formatted before markers existed</p>"))
+
+
+class TestPreviousFormattedHtml(unittest.TestCase):
+    def test_none_when_never_formatted(self):
+        from app.MainTranscriptionWidget import MainTranscriptionWidget
+
+        previous = MainTranscriptionWidget._previous_formatted_html
+        self.assertIsNone(previous(None, "raw_transcript_formatted"))
+        self.assertIsNone(previous({"id": 1}, "raw_transcript_formatted"))
+        self.assertIsNone(previous(
+            {"id": 1, "raw_transcript_formatted": ""}, "raw_transcript_formatted"))
+        self.assertEqual(
+            previous({"raw_transcript_formatted": "<p>x</p>"}, "raw_transcript_formatted"),
+            "<p>x</p>")
+
+
+if __name__ == "__main__":
+    unittest.main()
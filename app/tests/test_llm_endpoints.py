@@ -0,0 +1,176 @@
+"""Tests for OpenAI-compatible endpoint helpers, using a local stand-in server."""
+
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.services import llm_endpoints
+from app.services.llm_endpoints import (
+    OPENAI_BASE_URL,
+    chat_completions_url,
+    check_health,
+    endpoint_api_key,
+    endpoint_key_name,
+    endpoint_slot,
+    is_local,
+    is_openai,
+    validate_base_url,
+)
+
+KEYS = {"OPENAI_API_KEY": "sk-openai-secret"}
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    authorization_headers = []
+
+    def do_GET(self):
+        self.authorization_headers.append(self.headers.get("Authorization"))
+        if self.path == "/v1/models":
+            body = json.dumps({"data": [{"id": "local-model"}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def do_POST(self):
+        self.authorization_headers.append(self.headers.get("Authorization"))
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(
+            {"choices": [{"message": {"content": "local reply"}, "finish_reason": "stop"}]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+class TestUrls(unittest.TestCase):
+    def test_defaults_and_normalisation(self):
+        self.assertEqual(chat_completions_url(None),
+                         f"{OPENAI_BASE_URL}/chat/completions")
+        self.assertEqual(chat_completions_url("http://localhost:8080/v1/"),
+                         "http://localhost:8080/v1/chat/completions")
+
+    def test_local_hosts(self):
+        for url in ("http://localhost:11434/v1", "http://127.0.0.1:8000/v1",
+                    "http://192.168.1.20/v1", "http://gpu-box.local/v1"):
+            self.assertTrue(is_local(url), url)
+        self.assertFalse(is_local("https://api.openai.com/v1"))
+        self.assertFalse(is_local("http://8.8.8.8/v1"))
+
+    def test_http_only_allowed_for_local_hosts(self):
+        self.assertEqual(validate_base_url("http://localhost:8080/v1"),
+                         "http://localhost:8080/v1")
+        self.assertEqual(validate_base_url("https://llm.example.com/v1"),
+                         "https://llm.example.com/v1")
+        with self.assertRaises(ValueError):
+            validate_base_url("http://llm.example.com/v1")
+
+
+class TestEndpointKeys(unittest.TestCase):
+    def test_only_openai_host_is_openai(self):
+        self.assertTrue(is_openai(None))
+        self.assertTrue(is_openai("https://api.openai.com/v1/"))
+        for url in ("http://api.openai.com/v1", "https://api.openai.com.evil.net/v1",
+                    "https://llm.example.com/v1", "http://localhost:11434/v1"):
+            self.assertFalse(is_openai(url), url)
+
+    def test_openai_key_never_resolved_for_other_endpoints(self):
+        self.assertEqual(endpoint_api_key(None, KEYS.get), "sk-openai-secret")
+        for url in ("http://localhost:11434/v1", "https://llm.example.com/v1",
+                    "https://api.openai.com.evil.net/v1"):
+            self.assertIsNone(endpoint_api_key(url, KEYS.get), url)
+
+    def test_other_endpoints_use_their_own_key(self):
+        url = "https://llm.example.com/v1"
+        self.assertEqual(endpoint_key_name(url + "/"), "LLM_API_KEY:" + url)
+        keys = dict(KEYS, **{endpoint_key_name(url): "endpoint-key"})
+        self.assertEqual(endpoint_api_key(url, keys.get), "endpoint-key")
+
+    def test_keyring_failure_means_no_key(self):
+        def broken(_name):
+            raise RuntimeError("no keyring backend")
+
+        with self.assertLogs("transcribrr", "WARNING"):
+            self.assertIsNone(endpoint_api_key("https://llm.example.com/v1", broken))
+
+
+class TestEndpointSlots(unittest.TestCase):
+    def test_local_endpoint_allows_one_request_at_a_time(self):
+        url = "http://127.0.0.1:9/slots-test"
+        with endpoint_slot(url) as held:
+            self.assertTrue(held)
+            with endpoint_slot(url, cancel_check=lambda: True) as second:
+                self.assertFalse(second)
+        with endpoint_slot(url) as held:
+            self.assertTrue(held)
+
+
+class TestHealthCheck(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_healthy_server(self):
+        healthy, message = check_health(f"{self.base_url}/v1", use_cached=False)
+        self.assertTrue(healthy)
+        self.assertEqual(message, "HTTP 200")
+
+    def test_server_error_is_unhealthy(self):
+        healthy, _ = check_health(f"{self.base_url}/broken", use_cached=False)
+        self.assertFalse(healthy)
+
+    def test_local_server_never_receives_the_openai_key(self):
+        from unittest import mock
+
+        from app.controllers.gpt_controller import GPTController
+        from app.threads.GPT4ProcessingThread import GPT4ProcessingThread
+
+        controller = GPTController(mock.Mock())
+        controller.get_api_key = KEYS.get
+        options = controller._endpoint_options({"gpt_api_base_url": f"{self.base_url}/v1"})
+        api_key = controller._require_api_key(options, "test")
+        self.assertEqual(api_key, "")
+
+        thread = GPT4ProcessingThread(
+            "transcript", "Summarize", "local-model", 50, 0.0, api_key,
+            stream=False, use_cache=False, **options)
+        completed = []
+        thread.completed.connect(completed.append)
+        _StandInHandler.authorization_headers.clear()
+        with mock.patch.object(llm_endpoints, "_configured_concurrency", return_value=1), \
+                mock.patch.dict(llm_endpoints._health, clear=True):
+            thread.run()
+
+        self.assertEqual(completed, ["local reply"])
+        # Health check and chat request, both without an Authorization header
+        self.assertEqual(_StandInHandler.authorization_headers, [None, None])
+
+    def test_unreachable_server_is_unhealthy_and_cached(self):
+        url = "http://127.0.0.1:9/v1"  # discard port, nothing listening
+        healthy, _ = check_health(url, use_cached=False)
+        self.assertFalse(healthy)
+        self.assertIn(llm_endpoints.normalize_base_url(url), llm_endpoints._health)
+        self.assertFalse(check_health(url)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
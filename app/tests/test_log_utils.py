@@ -0,0 +1,127 @@
+"""Tests for the queue-based logging pipeline."""
+
+import logging
+import os
+import queue
+import sys
+import tempfile
+import threading
+import unittest
+from logging.handlers import RotatingFileHandler
+from unittest.mock import patch
+
+from app import log_utils
+from app.secure import REDACTED_TEXT
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+        self.threads.add(threading.current_thread().name)
+
+
+class TestDeferredQueueHandler(unittest.TestCase):
+    def setUp(self):
+        self.queue = queue.SimpleQueue()
+        self.handler = log_utils.DeferredQueueHandler(self.queue)
+
+    def _enqueue(self, msg, args, exc_info=None):
+        record = logging.LogRecord(
+            "transcribrr", logging.DEBUG, __file__, 1, msg, args, exc_info
+        )
+        self.handler.handle(record)
+        return self.queue.get_nowait()
+
+    def test_primitive_args_are_not_formatted_on_enqueue(self):
+        queued = self._enqueue("loaded %d items from %s in %.1fs", (3, "db", 0.25))
+        self.assertEqual(queued.msg, "loaded %d items from %s in %.1fs")
+        self.assertEqual(queued.getMessage(), "loaded 3 items from db in 0.2s")
+
+    def test_other_args_are_formatted_on_enqueue(self):
+        items = ["a"]
+
+        class Widget:
+            calls = 0
+
+            def __str__(self):
+                Widget.calls += 1
+                return "widget"
+
+        queued = self._enqueue("%s saw %s", (Widget(), items))
+        items.append("b")  # mutated before the listener runs
+        self.assertEqual(Widget.calls, 1)
+        self.assertIsNone(queued.args)
+        self.assertEqual(queued.getMessage(), "widget saw ['a']")
+
+    def test_mapping_args(self):
+        queued = self._enqueue("%(n)d files", ({"n": 2},))
+        self.assertEqual(queued.getMessage(), "2 files")
+
+    def test_traceback_is_rendered_on_enqueue(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            queued = self._enqueue("failed", None, exc_info=sys.exc_info())
+        self.assertIsNone(queued.exc_info)
+        self.assertIn("ValueError: boom", queued.exc_text)
+        self.assertIn("ValueError: boom", logging.Formatter().format(queued))
+
+
+class TestQueuePipeline(unittest.TestCase):
+    def setUp(self):
+        root = logging.getLogger()
+        saved = (list(root.handlers), root.level)
+        root.handlers = []
+
+        def restore():
+            log_utils.stop_logging()
+            root.handlers, level = saved
+            root.setLevel(level)
+
+        self.addCleanup(restore)
+        patcher = patch.object(log_utils, "_listener", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_records_are_redacted_and_written_off_thread(self):
+        target = _RecordingHandler()
+        logging.getLogger().addHandler(target)
+
+        log_utils.setup_logging(fmt="%(message)s")
+        self.assertIs(log_utils.setup_logging(), log_utils._listener)
+        logging.getLogger("transcribrr.test").warning(
+            "key %s in %s", "sk-abcdefghijklmnop1234", "sk-zyxwvutsrq98765 text"
+        )
+        log_utils.stop_logging()
+
+        self.assertEqual(target.messages, [f"key {REDACTED_TEXT} in {REDACTED_TEXT} text"])
+        self.assertNotIn(threading.current_thread().name, target.threads)
+        # Handlers are reattached synchronously once the listener stops
+        self.assertIn(target, logging.getLogger().handlers)
+
+    def test_default_handlers_include_rotating_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = os.path.join(tmp, "transcribrr.log")
+            listener = log_utils.setup_logging(log_file=log_file)
+            file_handlers = [
+                h for h in listener.handlers if isinstance(h, RotatingFileHandler)
+            ]
+            self.assertEqual(len(file_handlers), 1)
+            self.assertEqual(file_handlers[0].maxBytes, log_utils.LOG_MAX_BYTES)
+
+            logging.getLogger("transcribrr.test").info("hello %d", 42)
+            log_utils.stop_logging()
+            for handler in list(logging.getLogger().handlers):
+                logging.getLogger().removeHandler(handler)
+                handler.close()
+            with open(log_file, encoding="utf-8") as f:
+                self.assertIn("hello 42", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""Tests for idle model prefetch and warm-up."""
+
+import unittest
+from unittest.mock import Mock, patch
+
+from app.services import batch_tuner
+from app.services.transcription_service import ModelManager
+from app.threads import ModelPrefetchThread as prefetch
+
+GB = 1024**3
+
+
+class TestModelPrefetchThread(unittest.TestCase):
+    def setUp(self):
+        self.mm = Mock(device="cpu")
+        patcher = patch.object(ModelManager, "instance", return_value=self.mm)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.free = patch.object(batch_tuner, "free_memory_bytes", return_value=16 * GB)
+        self.free.start()
+        self.addCleanup(self.free.stop)
+        self.thread = prefetch.ModelPrefetchThread("m", "english")
+
+    def test_loads_warms_up_and_releases_when_cancelled(self):
+        calls = []
+
+        def pipe(inputs):
+            calls.append(len(inputs["raw"]))
+            self.thread.cancel()  # a real job starts during the warm-up
+
+        self.mm.create_pipeline.return_value = pipe
+        self.thread.run()
+
+        self.mm.get_model.assert_called_once_with("m")
+        self.assertEqual(calls, [16000 * prefetch.WARMUP_AUDIO_SECONDS])
+        self.mm.hold.assert_called_once()
+        # Normal release: models stay warm for the job that's starting
+        self.mm.release_memory.assert_called_once_with(force=False)
+
+    def test_skips_when_memory_is_low(self):
+        batch_tuner.free_memory_bytes.return_value = 2 * GB
+        self.thread.run()
+        self.mm.hold.assert_not_called()
+        self.mm.get_model.assert_not_called()
+
+    def test_evicts_when_memory_gets_tight(self):
+        batch_tuner.free_memory_bytes.side_effect = [16 * GB, 0.5 * GB]
+        self.thread.run()
+        self.mm.get_model.assert_called_once_with("m")
+        self.mm.create_pipeline.assert_not_called()
+        self.mm.release_memory.assert_called_once_with(force=True)
+
+    def test_cancelled_before_start_loads_nothing(self):
+        self.thread.cancel()
+        self.thread.run()
+        self.mm.get_model.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
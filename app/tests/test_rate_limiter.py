@@ -0,0 +1,123 @@
+"""Tests for the shared OpenAI rate limiter."""
+
+import threading
+import time
+import unittest
+
+from app.services.rate_limiter import (
+    RATE_PRIORITY_BATCH,
+    RATE_PRIORITY_INTERACTIVE,
+    RateLimiter,
+    backoff_delay,
+    parse_reset_duration,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHeaderParsing(unittest.TestCase):
+    def test_reset_durations(self):
+        self.assertEqual(parse_reset_duration("1s"), 1.0)
+        self.assertEqual(parse_reset_duration("20ms"), 0.02)
+        self.assertEqual(parse_reset_duration("6m0s"), 360.0)
+        self.assertEqual(parse_reset_duration("1h2m3.5s"), 3723.5)
+        self.assertEqual(parse_reset_duration("7"), 7.0)
+        self.assertIsNone(parse_reset_duration("soon"))
+        self.assertIsNone(parse_reset_duration(None))
+
+    def test_retry_after(self):
+        self.assertEqual(parse_retry_after({"retry-after-ms": "1500"}), 1.5)
+        self.assertEqual(parse_retry_after({"retry-after": "3"}), 3.0)
+        self.assertIsNone(parse_retry_after({}))
+        http_date = parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        self.assertEqual(http_date, 0.0)  # in the past
+
+    def test_backoff_honours_retry_after_and_caps(self):
+        for _ in range(20):
+            delay = backoff_delay(0, retry_after=5.0)
+            self.assertGreaterEqual(delay, 5.0)
+            self.assertLessEqual(delay, 6.0)
+            self.assertLessEqual(backoff_delay(10, base=2.0, cap=30.0), 30.0)
+            self.assertGreaterEqual(backoff_delay(1, base=2.0), 2.0)
+
+
+class TestBuckets(unittest.TestCase):
+    def test_unlimited_by_default(self):
+        limiter = RateLimiter()
+        for _ in range(100):
+            self.assertTrue(limiter.acquire(tokens=10000))
+
+    def test_requests_per_minute(self):
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=60, clock=clock)
+        for _ in range(60):
+            self.assertTrue(limiter.acquire())
+        self.assertAlmostEqual(limiter._wait_time(0, clock.now), 1.0)
+        clock.now += 1.0
+        self.assertTrue(limiter.acquire())
+
+    def test_tokens_per_minute_and_oversized_requests(self):
+        clock = FakeClock()
+        limiter = RateLimiter(tokens_per_minute=600, clock=clock)
+        self.assertTrue(limiter.acquire(tokens=500))
+        self.assertAlmostEqual(limiter._wait_time(200, clock.now), 10.0)
+        # A request larger than the whole budget waits for a full bucket
+        self.assertAlmostEqual(limiter._wait_time(5000, clock.now), 50.0)
+
+    def test_headers_set_limits_and_block_when_exhausted(self):
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock)
+        limiter.update_from_headers({
+            "x-ratelimit-limit-requests": "500",
+            "x-ratelimit-remaining-requests": "499",
+            "x-ratelimit-limit-tokens": "30000",
+            "x-ratelimit-remaining-tokens": "0",
+            "x-ratelimit-reset-tokens": "2s",
+        })
+        self.assertAlmostEqual(limiter._wait_time(0, clock.now), 2.0)
+        self.assertAlmostEqual(limiter._wait_time(5000, clock.now), 10.0)
+
+    def test_pause(self):
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock)
+        limiter.pause(3.0)
+        self.assertAlmostEqual(limiter._wait_time(0, clock.now), 3.0)
+
+
+class TestScheduling(unittest.TestCase):
+    def test_cancel_while_waiting(self):
+        limiter = RateLimiter()
+        limiter.pause(30.0)
+        start = time.monotonic()
+        self.assertFalse(limiter.acquire(cancel_check=lambda: True))
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_higher_priority_served_first(self):
+        limiter = RateLimiter()
+        limiter.pause(0.3)
+        order = []
+
+        def worker(name, priority):
+            limiter.acquire(priority=priority)
+            order.append(name)
+
+        batch = threading.Thread(target=worker, args=("batch", RATE_PRIORITY_BATCH))
+        batch.start()
+        time.sleep(0.05)
+        interactive = threading.Thread(
+            target=worker, args=("interactive", RATE_PRIORITY_INTERACTIVE))
+        interactive.start()
+        batch.join(5)
+        interactive.join(5)
+        self.assertEqual(order, ["interactive", "batch"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Tests for the persistent GPT response cache."""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from app.services.response_cache import ResponseCache, make_key
+
+MESSAGES = [
+    {"role": "system", "content": "Summarize"},
+    {"role": "user", "content": "A long transcript"},
+]
+
+
+class TestMakeKey(unittest.TestCase):
+    def test_key_depends_on_every_parameter(self):
+        base = make_key(MESSAGES, "gpt-4o", 0.3, 1000)
+        self.assertEqual(base, make_key(list(MESSAGES), "gpt-4o", 0.3, 1000))
+        self.assertNotEqual(base, make_key(MESSAGES[:1], "gpt-4o", 0.3, 1000))
+        self.assertNotEqual(base, make_key(MESSAGES, "gpt-4o-mini", 0.3, 1000))
+        self.assertNotEqual(base, make_key(MESSAGES, "gpt-4o", 0.7, 1000))
+        self.assertNotEqual(base, make_key(MESSAGES, "gpt-4o", 0.3, 2000))
+
+    def test_key_depends_on_endpoint(self):
+        openai = make_key(MESSAGES, "llama3", 0.3, 1000)
+        self.assertEqual(
+            openai, make_key(MESSAGES, "llama3", 0.3, 1000, "https://api.openai.com/v1/"))
+        local = make_key(MESSAGES, "llama3", 0.3, 1000, "http://localhost:11434/v1")
+        self.assertNotEqual(openai, local)
+        self.assertNotEqual(
+            local, make_key(MESSAGES, "llama3", 0.3, 1000, "http://10.0.0.5:8080/v1"))
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "cache", "gpt_cache.sqlite")
+        self.cache = ResponseCache(self.path, ttl_seconds=60, max_entries=3)
+
+    def tearDown(self):
+        self.cache.close()
+        self._tmp.cleanup()
+
+    def test_round_trip_and_counters(self):
+        self.assertIsNone(self.cache.get("k"))
+        self.cache.put("k", "gpt-4o", "result")
+        self.assertEqual(self.cache.get("k"), "result")
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_persists_across_instances(self):
+        self.cache.put("k", "gpt-4o", "result")
+        other = ResponseCache(self.path)
+        try:
+            self.assertEqual(other.get("k"), "result")
+        finally:
+            other.close()
+
+    def test_expired_entries_are_misses(self):
+        self.cache.put("k", "gpt-4o", "result")
+        with mock.patch("app.services.response_cache.time.time",
+                        return_value=time.time() + 120):
+            self.assertIsNone(self.cache.get("k"))
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_least_recently_used_evicted(self):
+        for i, key in enumerate("abc"):
+            with mock.patch("app.services.response_cache.time.time",
+                            return_value=1000.0 + i):
+                self.cache.put(key, "gpt-4o", key.upper())
+        self.cache.ttl_seconds = float("inf")
+        with mock.patch("app.services.response_cache.time.time",
+                        return_value=1010.0):
+            self.cache.get("a")  # "b" is now least recently used
+            self.cache.put("d", "gpt-4o", "D")
+        self.assertIsNone(self.cache.get("b"))
+        for key in "acd":
+            self.assertEqual(self.cache.get(key), key.upper())
+
+
+if __name__ == "__main__":
+    unittest.main()
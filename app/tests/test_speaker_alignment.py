@@ -0,0 +1,125 @@
+"""Tests for diarization-to-transcript speaker alignment."""
+
+import random
+import unittest
+from unittest.mock import patch
+
+from app.services import speaker_alignment
+from app.services.speaker_alignment import (
+    UNKNOWN_SPEAKER,
+    align_chunks,
+    assign_speakers,
+    chunk_intervals,
+    merge_turns,
+)
+
+
+def _brute_force(intervals, turns, tolerance=speaker_alignment.NEAREST_TOLERANCE):
+    """Reference O(n*m) implementation of the same assignment rule."""
+    labels = sorted({t[2] for t in turns})
+    result = []
+    for c_start, c_end in intervals:
+        scores = {}
+        for start, end, label in turns:
+            overlap = min(end, c_end) - max(start, c_start)
+            if overlap > 0:
+                scores[label] = scores.get(label, 0.0) + overlap
+        if scores:
+            top = max(scores.values())
+            result.append(next(lb for lb in labels if scores.get(lb) == top))
+            continue
+        gaps = [
+            (c_start - end if end <= c_start else start - c_end, label)
+            for start, end, label in turns
+        ]
+        gap, label = min(gaps, key=lambda g: g[0])
+        result.append(label if gap <= tolerance else UNKNOWN_SPEAKER)
+    return result
+
+
+class TestMergeAndIntervals(unittest.TestCase):
+    def test_merge_sorts_and_joins_same_speaker(self):
+        turns = merge_turns([(5, 6, "B"), (0, 1, "A"), (1.2, 2, "A"), (3, 4, "B")])
+        self.assertEqual(turns, [(0, 2, "A"), (3, 6, "B")])
+
+    def test_missing_timestamps(self):
+        chunks = [{"timestamp": (0.0, 2.0)}, {"timestamp": (None, 3.0)},
+                  {"timestamp": (3.0, None)}]
+        intervals = chunk_intervals(chunks)
+        self.assertEqual(intervals[0], (0.0, 2.0))
+        self.assertEqual(intervals[1], (2.0, 3.0))
+        self.assertAlmostEqual(intervals[2][1], 3.0 + speaker_alignment.MIN_CHUNK_DURATION)
+
+
+class TestAssignment(unittest.TestCase):
+    def test_maximal_overlap_for_straddling_chunk(self):
+        turns = merge_turns([(0, 10, "A"), (10, 30, "B")])
+        # Starts in A's turn but is mostly B: the old first-match rule said A
+        self.assertEqual(assign_speakers([(9, 20)], turns), ["B"])
+
+    def test_overlapping_speech_and_pauses(self):
+        turns = merge_turns([(0, 10, "A"), (4, 6, "B"), (20, 25, "C")])
+        self.assertEqual(
+            assign_speakers([(4.5, 5.5), (10.5, 11), (19.5, 19.8), (14, 15)], turns),
+            ["A", "A", "C", UNKNOWN_SPEAKER],
+        )
+
+    def test_numpy_and_fallback_match_reference(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            turns, t = [], 0.0
+            for _ in range(rng.randint(1, 40)):
+                start = t + rng.uniform(-1.0, 2.0)
+                end = start + rng.uniform(0.2, 8.0)
+                turns.append((max(start, 0.0), end, rng.choice("ABCD")))
+                t = end
+            turns = merge_turns(turns)
+            intervals = []
+            for _ in range(rng.randint(1, 60)):
+                start = rng.uniform(0, t + 3)
+                intervals.append((start, start + rng.uniform(0.01, 6.0)))
+
+            expected = _brute_force(intervals, turns)
+            self.assertEqual(assign_speakers(intervals, turns), expected)
+            with patch.object(speaker_alignment, "_numpy", return_value=None):
+                self.assertEqual(assign_speakers(intervals, turns), expected)
+
+    def test_no_turns(self):
+        self.assertEqual(assign_speakers([(0, 1)], []), [UNKNOWN_SPEAKER])
+        self.assertEqual(assign_speakers([], [(0, 1, "A")]), [])
+
+
+class TestAlignChunks(unittest.TestCase):
+    def test_segment_chunks_are_labelled_copies(self):
+        chunks = [{"text": "hi", "timestamp": (0, 1)}]
+        aligned = align_chunks(chunks, [(0, 2, "A")])
+        self.assertEqual(aligned, [{"text": "hi", "timestamp": (0, 1), "speaker": "A"}])
+        self.assertNotIn("speaker", chunks[0])
+
+    def test_split_words_regroups_at_speaker_change(self):
+        words = [
+            {"text": " Hello", "timestamp": (0.0, 0.4)},
+            {"text": " there.", "timestamp": (0.4, 0.9)},
+            {"text": " Hi", "timestamp": (1.0, 1.3)},
+            {"text": " back.", "timestamp": (1.3, 1.8)},
+        ]
+        turns = [(0.0, 0.95, "A"), (0.95, 2.0, "B")]
+        self.assertEqual(align_chunks(words, turns, split_words=True), [
+            {"text": "Hello there.", "timestamp": (0.0, 0.9), "speaker": "A"},
+            {"text": "Hi back.", "timestamp": (1.0, 1.8), "speaker": "B"},
+        ])
+
+    def test_split_words_uses_nested_word_lists(self):
+        chunks = [{
+            "text": "Yes. No.",
+            "timestamp": (0, 2),
+            "words": [{"text": "Yes.", "timestamp": (0, 0.8)},
+                      {"text": "No.", "timestamp": (1.2, 2)}],
+        }]
+        aligned = align_chunks(chunks, [(0, 1, "A"), (1, 2, "B")], split_words=True)
+        self.assertEqual([(c["speaker"], c["text"]) for c in aligned],
+                         [("A", "Yes."), ("B", "No.")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""Tests for token-aware transcript chunking."""
+
+import unittest
+
+from app.services import text_chunker
+from app.services.text_chunker import context_limit, input_budget, split_text
+
+
+def _words(text):
+    """Count whitespace-separated words, a predictable stand-in for tokens."""
+    return len(text.split())
+
+
+class TestContextLimits(unittest.TestCase):
+    def test_known_and_dated_models(self):
+        self.assertEqual(context_limit("gpt-4"), 8192)
+        self.assertEqual(context_limit("gpt-4o-2024-08-06"), 128000)
+        self.assertEqual(context_limit("gpt-4-0613"), 8192)
+        self.assertEqual(context_limit("some-local-model"),
+                         text_chunker.DEFAULT_CONTEXT_TOKENS)
+
+    def test_budget_reserves_output_tokens(self):
+        small = input_budget("gpt-4", 1000)
+        self.assertLess(small, 8192 - 1000)
+        self.assertGreater(small, 0)
+        self.assertLess(input_budget("gpt-4", 1000, "word " * 400), small)
+        # Oversized output limits still leave room for input
+        self.assertGreater(input_budget("gpt-4", 100000), 0)
+
+
+class TestSplitText(unittest.TestCase):
+    def test_short_text_is_one_chunk(self):
+        self.assertEqual(split_text("Hello there.", 10, _words), ["Hello there."])
+        self.assertEqual(split_text("  \n ", 10, _words), [])
+
+    def test_keeps_speaker_turns_whole(self):
+        turns = [f"SPEAKER_{i % 2}: " + "word " * 5 + "end." for i in range(6)]
+        chunks = split_text("\n\n".join(turns), 15, _words)
+        self.assertEqual(len(chunks), 3)
+        for chunk in chunks:
+            self.assertLessEqual(_words(chunk), 15)
+            self.assertTrue(chunk.startswith("SPEAKER_"))
+        self.assertEqual("\n\n".join(chunks), "\n\n".join(turns))
+
+    def test_long_paragraph_splits_on_sentences(self):
+        text = " ".join(f"Sentence number {i} here." for i in range(10))
+        chunks = split_text(text, 9, _words)
+        for chunk in chunks:
+            self.assertLessEqual(_words(chunk), 9)
+            self.assertTrue(chunk.endswith("."))
+        self.assertEqual(sum(_words(c) for c in chunks), 40)
+
+    def test_oversized_sentence_splits_on_words(self):
+        chunks = split_text("a " * 25, 10, _words)
+        self.assertEqual([_words(c) for c in chunks], [10, 10, 5])
+
+    def test_packing_counts_each_unit_once(self):
+        calls = []
+
+        def counting(text):
+            calls.append(text)
+            return _words(text)
+
+        turns = [f"Turn {i} says something." for i in range(200)]
+        chunks = split_text("\n\n".join(turns), 40, counting)
+        self.assertEqual("\n\n".join(chunks), "\n\n".join(turns))
+        for chunk in chunks:
+            self.assertLessEqual(_words(chunk), 40)
+        # Whole text, each turn, and the separator: never a growing chunk
+        self.assertEqual(len(calls), len(turns) + 2)
+
+    def test_rejects_non_positive_budget(self):
+        with self.assertRaises(ValueError):
+            split_text("text", 0)
+
+    def test_default_estimate_scales_with_length(self):
+        self.assertEqual(text_chunker.estimate_tokens(""), 0)
+        self.assertGreater(text_chunker.estimate_tokens("word " * 1000),
+                           text_chunker.estimate_tokens("word " * 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
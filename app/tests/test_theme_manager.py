@@ -0,0 +1,109 @@
+"""Tests for ThemeManager's compiled stylesheet cache."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from app import ThemeManager as theme_module
+from app.ThemeManager import STYLESHEET_CACHE_DIR, ThemeManager, _minify_stylesheet, _template_hash
+
+
+class TestMinifyStylesheet(unittest.TestCase):
+    def test_strips_comments_and_whitespace(self):
+        source = """
+            /* Buttons */
+            QPushButton {
+                color : red;   /* inline
+                                  comment */
+                padding: 4px 8px;
+            }
+
+            QLabel { font-weight: bold; }
+        """
+        self.assertEqual(
+            _minify_stylesheet(source),
+            "QPushButton{color : red;padding: 4px 8px;}QLabel{font-weight: bold;}",
+        )
+
+    def test_template_hash_tracks_template_text(self):
+        def one():
+            return "QLabel { color: red; }"
+
+        def two():
+            return "QLabel { color: blue; }"
+
+        self.assertEqual(_template_hash(one), _template_hash(one))
+        self.assertNotEqual(_template_hash(one), _template_hash(two))
+
+
+class TestStylesheetCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_dir = os.path.join(self.tmp.name, STYLESHEET_CACHE_DIR)
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: default
+        for target, value in (
+            ("ConfigManager", Mock(instance=Mock(return_value=config))),
+            ("get_user_data_dir", Mock(return_value=self.tmp.name)),
+            ("resource_path", Mock(return_value=os.path.join(self.tmp.name, "none.json"))),
+        ):
+            patcher = patch.object(theme_module, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _manager(self):
+        return ThemeManager()
+
+    def _cached_files(self):
+        return sorted(os.listdir(self.cache_dir))
+
+    def test_compiled_stylesheet_round_trips_through_disk(self):
+        first = self._manager()
+        self.assertEqual(len(self._cached_files()), 1)
+
+        with patch.object(theme_module, "_minify_stylesheet") as compile_:
+            second = self._manager()
+        compile_.assert_not_called()
+        self.assertEqual(second.current_stylesheet, first.current_stylesheet)
+
+    def test_key_depends_on_theme_and_variables(self):
+        manager = self._manager()
+        light = manager._stylesheet_key()
+        manager.current_variables = {**manager.current_variables, "primary": "#000000"}
+        self.assertNotEqual(manager._stylesheet_key(), light)
+        manager._update_theme_variables()
+        self.assertEqual(manager._stylesheet_key(), light)
+        manager.current_theme = "dark"
+        self.assertNotEqual(manager._stylesheet_key(), light)
+
+    def test_other_variable_sets_stay_cached(self):
+        manager = self._manager()
+        manager.current_variables = {**manager.current_variables, "primary": "#000000"}
+        manager._compiled_stylesheet()
+        manager.apply_theme("dark")
+        self.assertEqual(len(self._cached_files()), 3)
+
+        # Switching back reuses the file written for the first variable set
+        with patch.object(theme_module, "_minify_stylesheet") as compile_:
+            self._manager()
+        compile_.assert_not_called()
+
+    def test_template_change_invalidates_and_prunes_old_entries(self):
+        self._manager().apply_theme("dark")
+        old_files = self._cached_files()
+        self.assertEqual(len(old_files), 2)
+
+        with patch.object(theme_module, "_template_hash", return_value="newtemplate0"):
+            with patch.object(ThemeManager, "_generate_stylesheet",
+                              return_value="QLabel { color: red; }") as generate:
+                manager = self._manager()
+        generate.assert_called_once()
+        self.assertEqual(manager.current_stylesheet, "QLabel{color: red;}")
+        self.assertEqual(len(self._cached_files()), 1)
+        self.assertIn("-newtemplate0-", self._cached_files()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,7 +9,11 @@ import logging
 import logging.handlers
 
 
-from app.ThreadManager import ThreadManager
+from app.ThreadManager import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    ThreadManager,
+)
 
 
 class _Signal:
@@ -98,6 +102,11 @@ class TestThread:
     # Helpers for tests
     def start(self) -> None:
         self._running = True
+
+    def finish(self) -> None:
+        """Simulate run() returning."""
+        self._running = False
+        self.finished.emit()
     
     @property
     def was_cancelled(self) -> bool:
@@ -246,6 +255,136 @@ class TestThreadCancellation(BaseThreadManagerTest):
         )
 
 
+class TestWorkerPools(BaseThreadManagerTest):
+    """Tests for pooled scheduling via submit()."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.manager = ThreadManager(pool_limits={"gpu": 1, "network": 2})
+
+    def test_pool_limit_queues_excess_tasks(self):
+        """Only `limit` tasks run at once; finishing one starts the next."""
+        threads = [self.create_test_thread() for _ in range(3)]
+        for thread in threads:
+            self.manager.submit(thread, pool="network")
+
+        self.assertEqual([t.isRunning() for t in threads], [True, True, False])
+        self.assertTrue(self.manager.is_queued(threads[2]))
+        self.assertEqual(len(self.manager.get_active_threads()), 3)
+
+        threads[0].finish()
+        self.assertTrue(threads[2].isRunning())
+        self.assertFalse(self.manager.is_queued(threads[2]))
+
+    def test_priority_order_then_submission_order(self):
+        """Queued tasks start by priority, FIFO within a priority."""
+        started = []
+        blocker = self.create_test_thread()
+        self.manager.submit(blocker, pool="gpu")
+
+        names = ["low", "normal-1", "high", "normal-2"]
+        priorities = [PRIORITY_LOW, None, PRIORITY_HIGH, None]
+        threads = {}
+        for name, priority in zip(names, priorities):
+            thread = self.create_test_thread()
+            thread.start = lambda n=name, t=thread: (started.append(n), TestThread.start(t))
+            kwargs = {} if priority is None else {"priority": priority}
+            self.manager.submit(thread, pool="gpu", **kwargs)
+            threads[name] = thread
+
+        running = blocker
+        for _ in names:
+            running.finish()
+            running = threads[started[-1]]
+        self.assertEqual(started, ["high", "normal-1", "normal-2", "low"])
+
+    def test_deadline_then_shortest_cost_first(self):
+        """Within a priority, deadlines go first, then the cheapest task."""
+        started = []
+        blocker = self.create_test_thread()
+        self.manager.submit(blocker, pool="gpu")
+
+        jobs = {
+            "long": {"cost": 600.0},
+            "short": {"cost": 30.0},
+            "due-later": {"cost": 900.0, "deadline": 200.0},
+            "due-soon": {"cost": 900.0, "deadline": 100.0},
+            "unknown": {},
+        }
+        threads = {}
+        for name, kwargs in jobs.items():
+            thread = self.create_test_thread()
+            thread.start = lambda n=name, t=thread: (started.append(n), TestThread.start(t))
+            self.manager.submit(thread, pool="gpu", **kwargs)
+            threads[name] = thread
+
+        running = blocker
+        for _ in jobs:
+            running.finish()
+            running = threads[started[-1]]
+        self.assertEqual(started, ["due-soon", "due-later", "unknown", "short", "long"])
+
+    def test_cancel_queued_task_frees_it_without_a_slot(self):
+        """Cancelling a queued task dequeues it and lets it exit at once."""
+        running, queued, waiting = (self.create_test_thread() for _ in range(3))
+        self.manager.submit(running, pool="gpu")
+        token = self.manager.submit(queued, pool="gpu")
+        self.manager.submit(waiting, pool="gpu")
+
+        token.cancel()
+        self.assertTrue(token.is_cancelled())
+        self.assertTrue(queued.was_cancelled)
+        # Started outside the pool so run() can take its cancelled path
+        self.assertTrue(queued.isRunning())
+        self.assertFalse(waiting.isRunning())
+
+        queued.finish()
+        self.assertFalse(waiting.isRunning(), "Cancelled task never held a slot")
+        running.finish()
+        self.assertTrue(waiting.isRunning())
+
+    def test_cancel_running_task_calls_thread_cancel(self):
+        thread = self.create_test_thread()
+        token = self.manager.submit(thread, pool="gpu")
+        token.cancel()
+        token.cancel()
+        self.assertTrue(thread.was_cancelled)
+        self.assertEqual(self.manager.metrics()["gpu"]["cancelled"], 0)
+
+    def test_metrics_report_depth_and_latency(self):
+        threads = [self.create_test_thread() for _ in range(2)]
+        for thread in threads:
+            self.manager.submit(thread, pool="gpu")
+
+        metrics = self.manager.metrics()["gpu"]
+        self.assertEqual((metrics["limit"], metrics["running"], metrics["queued"]), (1, 1, 1))
+        self.assertEqual(metrics["submitted"], 2)
+        self.assertGreaterEqual(metrics["oldest_queued_ms"], 0.0)
+
+        threads[0].finish()
+        threads[1].finish()
+        metrics = self.manager.metrics()["gpu"]
+        self.assertEqual((metrics["running"], metrics["queued"], metrics["completed"]), (0, 0, 2))
+        self.assertGreaterEqual(metrics["max_wait_ms"], metrics["avg_wait_ms"])
+
+    def test_set_pool_limit_starts_waiting_tasks(self):
+        threads = [self.create_test_thread() for _ in range(2)]
+        for thread in threads:
+            self.manager.submit(thread, pool="gpu")
+        self.manager.set_pool_limit("gpu", 2)
+        self.assertTrue(all(t.isRunning() for t in threads))
+
+    def test_cancel_all_drops_queued_tasks(self):
+        threads = [self.create_test_thread() for _ in range(2)]
+        for thread in threads:
+            self.manager.submit(thread, pool="gpu")
+
+        self.manager.cancel_all_threads()
+        self.assertTrue(all(t.was_cancelled for t in threads))
+        self.assertFalse(threads[1].isRunning(), "Queued task is not started")
+        self.assertEqual(self.manager.metrics()["gpu"]["queued"], 0)
+
+
 class TestThreadManagerEdgeCases(BaseThreadManagerTest):
     """Tests for edge cases and error conditions."""
 
@@ -0,0 +1,85 @@
+"""Tests for the self-calibrating transcription time estimator."""
+
+import os
+import tempfile
+import unittest
+
+from app.services import time_estimator
+from app.services.time_estimator import TimeEstimator, fit_runtime
+
+
+class TestFitRuntime(unittest.TestCase):
+    def test_recovers_overhead_and_rate(self):
+        runs = [(a, 20 + 0.5 * a) for a in (60, 300, 600, 1800)]
+        fit = fit_runtime(runs)
+        self.assertAlmostEqual(fit.overhead, 20)
+        self.assertAlmostEqual(fit.rate, 0.5)
+        estimate = fit.predict(1200)
+        self.assertAlmostEqual(estimate.seconds, 620)
+        # A perfect fit leaves no spread
+        self.assertAlmostEqual(estimate.low, estimate.high)
+
+    def test_few_runs_give_rate_with_wide_interval(self):
+        fit = fit_runtime([(100, 50)])
+        self.assertEqual(fit.overhead, 0)
+        self.assertAlmostEqual(fit.rate, 0.5)
+        estimate = fit.predict(200)
+        self.assertAlmostEqual(estimate.seconds, 100)
+        self.assertLess(estimate.low, 60)
+        self.assertGreater(estimate.high, 140)
+
+    def test_noisy_runs_widen_the_interval(self):
+        runs = [(a, 0.5 * a * (1.3 if i % 2 else 0.7)) for i, a in enumerate((60, 120, 300, 600))]
+        estimate = fit_runtime(runs).predict(300)
+        self.assertLess(estimate.low, estimate.seconds)
+        self.assertGreater(estimate.high, estimate.seconds)
+
+    def test_no_usable_runs(self):
+        self.assertIsNone(fit_runtime([]))
+        self.assertIsNone(fit_runtime([(0, 10)]))
+
+
+class TestTimeEstimator(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "times.sqlite")
+        self.estimator = TimeEstimator(self.path)
+        self.addCleanup(self.estimator.close)
+
+    def test_records_persist_and_update_predictions(self):
+        self.assertIsNone(self.estimator.predict("local", "m", ["gpu"], 600))
+        self.estimator.record("local", "m", "gpu", 600, 120)
+        self.assertAlmostEqual(self.estimator.predict("local", "m", ["gpu"], 300).seconds, 60)
+
+        self.estimator.record("local", "m", "gpu", 600, 240)
+        self.assertAlmostEqual(self.estimator.predict("local", "m", ["gpu"], 300).seconds, 90)
+
+        self.estimator.close()
+        reopened = TimeEstimator(self.path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(len(reopened.runs("local", "m", "gpu")), 2)
+
+    def test_configurations_are_separate_and_devices_fall_back(self):
+        self.estimator.record("local", "m", "cpu", 100, 200)
+        self.estimator.record("api", "whisper-1", "api", 100, 10)
+        self.assertIsNone(self.estimator.predict("local", "other", ["cpu"], 100))
+        estimate = self.estimator.predict("local", "m", ["gpu", "cpu"], 100)
+        self.assertAlmostEqual(estimate.seconds, 200)
+
+    def test_old_runs_are_pruned(self):
+        for i in range(time_estimator.MAX_RUNS_PER_CONFIG + 5):
+            self.estimator.record("local", "m", "cpu", 60, 30 + i)
+        count = self.estimator._connection().execute(
+            "SELECT COUNT(*) FROM transcription_runs").fetchone()[0]
+        self.assertEqual(count, time_estimator.MAX_RUNS_PER_CONFIG)
+
+    def test_device_class(self):
+        self.assertEqual(time_estimator.device_class("API", None), "api")
+        self.assertEqual(time_estimator.device_class("local", "cpu"), "cpu")
+        self.assertEqual(time_estimator.device_class("local", "cuda"), "gpu")
+        self.assertEqual(time_estimator.device_class("local", "mps"), "gpu")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -116,6 +116,7 @@ class TestTranscriptionService(unittest.TestCase):
         self.mm = Mock()
         self.mm._get_optimal_device.return_value = "cpu"
         self.mm.create_pipeline.return_value = lambda path: {"text": "hello", "chunks": []}
+        self.mm.batch_size_for.return_value = 8
         self.mock_mm_instance.return_value = self.mm
 
     def _setup_service(self):
@@ -192,7 +193,81 @@ class TestTranscriptionService(unittest.TestCase):
         self.assertEqual(out["method"], "local_mps")
         
         # Verify MPS method was called with correct parameters
-        mock_mps.assert_called_once_with(self.file_path, "m", "en")
+        mock_mps.assert_called_once_with(
+            self.file_path, "m", "en", progress_cb=None, cancel_cb=None)
+
+    def _mps_available(self):
+        import torch as torch_mod
+        torch_mod.backends.mps.is_available = lambda: True
+        torch_mod.cuda.is_available = lambda: False
+
+    def test__transcribe_with_mps_reports_window_progress(self):
+        from app.services.windowed_asr import WindowProgress
+
+        self._mps_available()
+
+        def fake_windows(pipe, audio, window_s, *, sampling_rate, cancel_cb, progress_cb):
+            progress_cb(WindowProgress(120.0, 480.0, 30.0))
+            progress_cb(WindowProgress(480.0, 480.0, 120.0))
+            return {"text": "done", "chunks": []}
+
+        messages = []
+        with patch("app.ffmpeg_utils.decode_audio", return_value="samples"), \
+                patch("app.services.windowed_asr.transcribe_windows", side_effect=fake_windows):
+            out = self.svc.transcribe_file(
+                self.file_path, model_id="m", method="local",
+                hardware_acceleration_enabled=True,
+                progress_cb=lambda pct, msg: messages.append((pct, msg)),
+            )
+        self.assertEqual(out["text"], "done")
+        self.assertEqual([pct for pct, _ in messages], [25, 100])
+        self.assertIn("0.25x real time", messages[0][1])
+        self.assertIn("about 01:30 left", messages[0][1])
+
+    def test__transcribe_with_mps_sizes_after_load_and_halves_on_oom(self):
+        self._mps_available()
+        events, batches = [], []
+
+        def create_pipeline(model_id, language, batch_size):
+            batches.append(batch_size)
+
+            def pipe(_path):
+                if batch_size > 4:
+                    raise RuntimeError("MPS backend out of memory")
+                return {"text": f"batch {batch_size}"}
+            return pipe
+
+        self.mm.get_model.side_effect = lambda model_id: events.append("model loaded")
+        self.mm.batch_size_for.side_effect = lambda model_id: events.append("sized") or 16
+        self.mm.create_pipeline.side_effect = create_pipeline
+        self.mm.record_batch_oom.side_effect = lambda model_id, batch: batch // 2
+        out = self.svc._transcribe_with_mps(self.file_path, "m", "en")
+
+        self.assertEqual(events, ["model loaded", "sized"])
+        self.assertEqual(out["text"], "batch 4")
+        self.assertEqual(batches, [16, 8, 4])
+        self.mm.record_batch_success.assert_called_once_with("m", 4)
+
+    def test__transcribe_with_mps_cancelled_between_windows(self):
+        self._mps_available()
+        windows = []
+
+        def fake_windows(pipe, audio, window_s, *, sampling_rate, cancel_cb, progress_cb):
+            windows.append(window_s)
+            return None if cancel_cb() else pipe(audio)
+
+        with patch("app.ffmpeg_utils.decode_audio", return_value="samples"), \
+                patch("app.services.windowed_asr.transcribe_windows", side_effect=fake_windows):
+            out = self.svc.transcribe_file(
+                self.file_path, model_id="m", method="local",
+                hardware_acceleration_enabled=True, cancel_cb=lambda: True,
+            )
+        self.assertEqual(out["text"], "[Cancelled]")
+        self.assertEqual(len(windows), 1)
+        # The model comes from ModelManager, held only for this job
+        self.mm.get_model.assert_called_once_with("m")
+        self.mm.hold.assert_called_once_with()
+        self.mm.release_memory.assert_called_once_with()
 
     def test_transcribe_file_mps_with_speaker_detection_prefers_cpu(self):
         """Test that speaker detection forces CPU path even with MPS available."""
@@ -238,7 +313,9 @@ class TestTranscriptionService(unittest.TestCase):
         self.assertIn("chunks", out)
         
         # Verify local method was called with correct parameters
-        mock_local.assert_called_once_with(self.file_path, "m", "en", False, None)
+        mock_local.assert_called_once_with(
+            self.file_path, "m", "en", False, None, progress_cb=None, cancel_cb=None
+        )
 
     def test__transcribe_locally_basic_and_string_result(self):
         # dict result
@@ -336,14 +413,8 @@ class TestTranscriptionService(unittest.TestCase):
             def __call__(self, path):
                 return FakeDiarization()
 
-        class PipelineWrapper:
-            @staticmethod
-            def from_pretrained(*args, **kwargs):
-                return FakePipeline()
-
-        # Inject into sys.modules so local import sees it
-        pa = sys.modules["pyannote.audio"]
-        setattr(pa, "Pipeline", PipelineWrapper)
+        # The cached pipeline comes from ModelManager
+        self.mm.get_diarization_pipeline.return_value = FakePipeline()
 
         base = {"text": "t", "chunks": [{"text": "c1", "timestamp": (0, 0.5)}, {"text": "c2", "timestamp": (1.1, 1.5)}]}
         out = self.svc._add_speaker_detection(self.file_path, base, hf_auth_key="hf")
@@ -361,13 +432,8 @@ class TestTranscriptionService(unittest.TestCase):
             def __call__(self, path):
                 return FakeDiarization()
 
-        class PipelineWrapper:
-            @staticmethod
-            def from_pretrained(*args, **kwargs):
-                return FakePipeline()
-
-        pa = sys.modules["pyannote.audio"]
-        setattr(pa, "Pipeline", PipelineWrapper)
+        # The cached pipeline comes from ModelManager
+        self.mm.get_diarization_pipeline.return_value = FakePipeline()
 
         base = {"text": "t", "chunks": []}
         out = self.svc._add_speaker_detection(self.file_path, base, hf_auth_key="hf")
@@ -446,6 +512,202 @@ class TestTranscriptionService(unittest.TestCase):
             with self.assertRaises(RuntimeError):
                 self.svc._transcribe_with_api(self.file_path, 'english', api_key='sk')
 
+    def test__transcribe_locally_runs_diarization_alongside_asr(self):
+        import threading
+
+        asr_started = threading.Event()
+        diarization_started = threading.Event()
+
+        class Seg:
+            def __init__(self, start, end):
+                self.start = start
+                self.end = end
+
+        class FakeDiarization:
+            def itertracks(self, yield_label=False):
+                yield (Seg(0, 2), None, "A")
+
+        def diarize(_path, hook=None):
+            diarization_started.set()
+            # Only finishes if ASR is running at the same time
+            self.assertTrue(asr_started.wait(5))
+            return FakeDiarization()
+
+        def asr(_path):
+            asr_started.set()
+            self.assertTrue(diarization_started.wait(5))
+            return {"text": "hi", "chunks": [{"text": "hi", "timestamp": (0, 1)}]}
+
+        self.mm.get_diarization_pipeline.return_value = diarize
+        self.mm.create_pipeline.return_value = asr
+        out = self.svc._transcribe_locally(self.file_path, "m", "en", True, "hf")
+        self.assertEqual(out["formatted_text"], "A: hi\n\n")
+        self.mm.get_diarization_pipeline.assert_called_once_with("hf")
+
+    def _diarization_until_stopped(self):
+        """Fake pyannote pipeline that runs until its hook raises."""
+        import threading
+
+        started, state = threading.Event(), {}
+
+        def diarize(_path, hook=None):
+            started.set()
+            try:
+                for _ in range(500):
+                    hook("embeddings", None)
+                    threading.Event().wait(0.01)
+            except Exception as e:
+                state["stopped_by"] = e
+                raise
+            state["finished"] = True
+
+        self.mm.get_diarization_pipeline.return_value = diarize
+        return started, state
+
+    def test__transcribe_locally_asr_failure_stops_diarization(self):
+        started, state = self._diarization_until_stopped()
+
+        def asr(_path):
+            self.assertTrue(started.wait(5))
+            raise ValueError("decoder crashed")
+
+        self.mm.create_pipeline.return_value = asr
+        with self.assertRaises(RuntimeError):
+            self.svc._transcribe_locally(self.file_path, "m", "en", True, "hf")
+        # Diarization was stopped and waited for before the job released the models
+        self.assertIsInstance(state["stopped_by"], self._tsvc._DiarizationCancelled)
+        self.assertNotIn("finished", state)
+        self.mm.release_memory.assert_called_once_with()
+
+    def test__transcribe_locally_cancel_stops_diarization(self):
+        started, state = self._diarization_until_stopped()
+
+        def fake_windows(pipe, audio, window_s, *, sampling_rate, cancel_cb, progress_cb):
+            self.assertTrue(started.wait(5))
+            return None
+
+        with patch("app.ffmpeg_utils.decode_audio", return_value="samples"), \
+                patch("app.services.windowed_asr.transcribe_windows", side_effect=fake_windows):
+            out = self.svc._transcribe_locally(
+                self.file_path, "m", "en", True, "hf", cancel_cb=lambda: True)
+        self.assertEqual(out["text"], "[Cancelled]")
+        self.assertIn("stopped_by", state)
+        self.mm.release_memory.assert_called_once_with()
+
+    def test__transcribe_locally_logs_diarization_error_after_asr_failure(self):
+        def diarize(_path, hook=None):
+            raise RuntimeError("gated model")
+
+        self.mm.get_diarization_pipeline.return_value = diarize
+        self.mm.create_pipeline.return_value = Mock(side_effect=ValueError("bad audio"))
+        with self.assertRaises(RuntimeError):
+            self.svc._transcribe_locally(self.file_path, "m", "en", True, "hf")
+        self.assertTrue(any(
+            "gated model" in str(call) for call in self.mock_logger.warning.call_args_list))
+
+    def test_api_job_during_local_job_keeps_models_held(self):
+        with patch("app.utils.ConfigManager") as CM:
+            CM.instance.return_value.get.side_effect = lambda key, default=None: (
+                0.05 if key == "model_keep_warm_seconds" else False
+            )
+            mm = self._tsvc.ModelManager()
+        mm._models["m"] = object()
+        self.svc.model_manager = mm
+        held = []
+
+        def asr(_path):
+            with patch.object(self.svc, "_transcribe_with_api",
+                              return_value={"text": "api", "method": "api"}):
+                out = self.svc.transcribe_file(
+                    self.file_path, model_id="m", method="api", openai_api_key="sk")
+            self.assertEqual(out["text"], "api")
+            held.append((mm._jobs, mm._release_timer))
+            return {"text": "local", "chunks": []}
+
+        with patch.object(mm, "batch_size_for", return_value=1), \
+                patch.object(mm, "record_batch_success"), \
+                patch.object(mm, "create_pipeline", return_value=asr):
+            out = self.svc.transcribe_file(self.file_path, model_id="m", method="local")
+        self.assertEqual(out["text"], "local")
+        self.assertEqual(held, [(1, None)])
+        # The local job's own release arms the keep-warm timer
+        self.assertEqual(mm._jobs, 0)
+        self.assertIsNotNone(mm._release_timer)
+        mm._release_timer.cancel()
+
+    def test__transcribe_locally_sizes_batch_after_models_load(self):
+        import threading
+
+        events = []
+
+        def load_diarization(_key):
+            threading.Event().wait(0.05)  # loads slower than the ASR model
+            events.append("diarization loaded")
+            return lambda _path, hook=None: types.SimpleNamespace(
+                itertracks=lambda yield_label=False: iter(()))
+
+        self.mm.get_model.side_effect = lambda model_id: events.append("model loaded")
+        self.mm.get_diarization_pipeline.side_effect = load_diarization
+        self.mm.batch_size_for.side_effect = lambda model_id: events.append("sized") or 4
+
+        self.svc._transcribe_locally(self.file_path, "m", "en", True, "hf")
+        self.assertEqual(events, ["model loaded", "diarization loaded", "sized"])
+
+    def test__transcribe_locally_cancelled_between_windows(self):
+        seen = []
+
+        def fake_windows(pipe, audio, window_s, *, sampling_rate, cancel_cb, progress_cb):
+            seen.append((audio, window_s))
+            return None if cancel_cb() else pipe(audio)
+
+        with patch("app.ffmpeg_utils.decode_audio", return_value="samples"), \
+                patch("app.services.windowed_asr.transcribe_windows", side_effect=fake_windows):
+            out = self.svc._transcribe_locally(
+                self.file_path, "m", "en", False, None, cancel_cb=lambda: True
+            )
+        self.assertEqual(out["text"], "[Cancelled]")
+        self.assertEqual(seen[0][0], "samples")
+
+    def test__transcribe_locally_reports_progress(self):
+        from app.services.windowed_asr import WindowProgress
+
+        def fake_windows(pipe, audio, window_s, *, sampling_rate, cancel_cb, progress_cb):
+            progress_cb(WindowProgress(240.0, 480.0, 60.0))
+            progress_cb(WindowProgress(480.0, 480.0, 120.0))
+            return {"text": "done", "chunks": []}
+
+        messages = []
+        with patch("app.ffmpeg_utils.decode_audio", return_value="samples"), \
+                patch("app.services.windowed_asr.transcribe_windows", side_effect=fake_windows):
+            out = self.svc._transcribe_locally(
+                self.file_path, "m", "en", False, None,
+                progress_cb=lambda pct, msg: messages.append((pct, msg)),
+            )
+        self.assertEqual(out["text"], "done")
+        self.assertEqual([pct for pct, _ in messages], [50, 100])
+        self.assertIn("04:00 / 08:00", messages[0][1])
+        self.assertIn("0.25x real time", messages[0][1])
+        self.assertIn("about 01:00 left", messages[0][1])
+
+    def test__transcribe_locally_halves_batch_on_oom(self):
+        batches = []
+
+        def create_pipeline(model_id, language, batch_size):
+            batches.append(batch_size)
+
+            def pipe(_path):
+                if batch_size > 2:
+                    raise RuntimeError("CUDA out of memory. Tried to allocate 2.00 GiB")
+                return {"text": f"batch {batch_size}"}
+            return pipe
+
+        self.mm.create_pipeline.side_effect = create_pipeline
+        self.mm.record_batch_oom.side_effect = lambda model_id, batch: batch // 2
+        out = self.svc._transcribe_locally(self.file_path, "m", "en", False, None)
+        self.assertEqual(out["text"], "batch 2")
+        self.assertEqual(batches, [8, 4, 2])
+        self.mm.record_batch_success.assert_called_once_with("m", 2)
+
     def test_speaker_detection_requested_but_no_hf_key(self):
         # With speaker_detection True but no key, returns base result (no crash)
         self.mm.create_pipeline.return_value = lambda p: {"text": "base", "chunks": []}
@@ -490,6 +752,89 @@ class TestModelManagerDeviceSelection(unittest.TestCase):
             mm = self._tsvc.ModelManager()
             self.assertEqual(mm.device, "cpu")
 
+    def _manager(self, keep_warm):
+        with patch("app.utils.ConfigManager") as CM:
+            inst = Mock()
+            inst.get.side_effect = lambda key, default=None: (
+                keep_warm if key == "model_keep_warm_seconds" else False
+            )
+            CM.instance.return_value = inst
+            return self._tsvc.ModelManager()
+
+    def test_diarization_pipeline_loaded_once(self):
+        loads = []
+
+        class FakePipeline:
+            @staticmethod
+            def from_pretrained(model_id, use_auth_token=None):
+                loads.append((model_id, use_auth_token))
+                return object()
+
+        sys.modules["pyannote.audio"].Pipeline = FakePipeline
+        mm = self._manager(keep_warm=0)
+        first = mm.get_diarization_pipeline("hf")
+        self.assertIs(mm.get_diarization_pipeline("hf"), first)
+        self.assertEqual(loads, [("pyannote/speaker-diarization", "hf")])
+        mm.release_memory()
+        mm.get_diarization_pipeline("hf")
+        self.assertEqual(len(loads), 2)
+
+    def test_models_kept_warm_until_idle(self):
+        mm = self._manager(keep_warm=0.05)
+        mm._models["m"] = object()
+        mm._diarization_pipelines["d"] = object()
+        mm.hold()
+        mm.release_memory()
+        self.assertIn("m", mm._models)  # still warm for the next job
+        mm.hold()  # next job arrives before the timer fires
+        import time
+        time.sleep(0.1)
+        self.assertIn("d", mm._diarization_pipelines)
+        mm.release_memory()
+        time.sleep(0.2)
+        self.assertEqual((mm._models, mm._diarization_pipelines), ({}, {}))
+
+    def test_concurrent_get_model_loads_once(self):
+        import threading
+
+        mm = self._manager(keep_warm=300)
+        loading = threading.Event()
+        loads = []
+
+        def load(model_id):
+            loads.append(model_id)
+            loading.set()
+            threading.Event().wait(0.05)
+            return object()
+
+        with patch.object(mm, "_load_model", side_effect=load):
+            results = []
+            first = threading.Thread(target=lambda: results.append(mm.get_model("m")))
+            first.start()
+            loading.wait(5)
+            results.append(mm.get_model("m"))  # waits for the load in progress
+            first.join(5)
+        self.assertEqual(loads, ["m"])
+        self.assertIs(results[0], results[1])
+
+    def test_forced_release_keeps_models_a_job_holds(self):
+        mm = self._manager(keep_warm=0.05)
+        mm._models["m"] = object()
+        mm.hold()  # a transcription job
+        mm.hold()  # the idle prefetch
+        mm.release_memory(force=True)  # prefetch evicts under memory pressure
+        self.assertIn("m", mm._models)
+        self.assertIsNone(mm._release_timer)
+        mm.release_memory()  # the job finishes
+        self.assertIsNotNone(mm._release_timer)
+        mm._release_timer.cancel()
+
+    def test_release_memory_force(self):
+        mm = self._manager(keep_warm=300)
+        mm._models["m"] = object()
+        mm.release_memory(force=True)
+        self.assertEqual(mm._models, {})
+
     def test_get_free_gpu_memory_exception_returns_zero(self):
         import torch as torch_mod
         torch_mod.cuda.is_available = lambda: True
@@ -0,0 +1,100 @@
+"""Tests for windowed local transcription in services.windowed_asr."""
+
+import unittest
+
+import numpy as np
+
+from app.services import windowed_asr
+
+SR = 1000  # small rate keeps the arrays tiny
+
+
+def _tone(seconds):
+    return np.full(int(seconds * SR), 0.5, dtype=np.float32)
+
+
+class TestWindowBounds(unittest.TestCase):
+    def test_short_audio_is_one_window(self):
+        audio = _tone(3)
+        self.assertEqual(windowed_asr.window_bounds(audio, 10, SR), [(0, 3000)])
+
+    def test_cuts_land_in_nearby_silence(self):
+        # Silence at 8.5-8.7 s, inside the search range before the 10 s edge
+        audio = _tone(25)
+        audio[8500:8700] = 0.0
+        bounds = windowed_asr.window_bounds(audio, 10, SR, search_s=2.0)
+        self.assertGreaterEqual(bounds[0][1], 8500)
+        self.assertLess(bounds[0][1], 8700)
+        # Windows are contiguous, cover the audio and never exceed window_s
+        self.assertEqual(bounds[0][0], 0)
+        self.assertEqual(bounds[-1][1], len(audio))
+        for (_, end), (start, _) in zip(bounds, bounds[1:]):
+            self.assertEqual(end, start)
+        self.assertTrue(all(end - start <= 10 * SR for start, end in bounds))
+
+
+class TestWindowProgress(unittest.TestCase):
+    def test_rate_and_eta(self):
+        progress = windowed_asr.WindowProgress(60.0, 240.0, 30.0)
+        self.assertEqual(progress.percent, 25)
+        self.assertAlmostEqual(progress.rtf, 0.5)
+        self.assertAlmostEqual(progress.eta_s, 90.0)
+        self.assertIsNone(windowed_asr.WindowProgress(0.0, 240.0, 1.0).eta_s)
+
+
+class TestTranscribeWindows(unittest.TestCase):
+    def test_timestamps_are_shifted_to_file_time(self):
+        calls = []
+
+        def pipe(inputs):
+            calls.append(len(inputs["raw"]))
+            return {
+                "text": f" part{len(calls)} ",
+                "chunks": [
+                    {"text": "a", "timestamp": (0.0, 1.0),
+                     "words": [{"text": "a", "timestamp": (0.5, None)}]},
+                    {"text": "b", "timestamp": (1.0, None)},
+                ],
+            }
+
+        audio = _tone(25)
+        bounds = windowed_asr.window_bounds(audio, 10, SR)
+        out = windowed_asr.transcribe_windows(pipe, audio, 10, sampling_rate=SR)
+
+        self.assertEqual(calls, [end - start for start, end in bounds])
+        self.assertEqual(out["text"], "part1 part2 part3")
+        second_start = bounds[1][0] / SR
+        chunk = out["chunks"][2]
+        self.assertEqual(chunk["timestamp"], (round(second_start, 3), round(second_start + 1.0, 3)))
+        self.assertEqual(chunk["words"][0]["timestamp"],
+                         (round(second_start + 0.5, 3), bounds[1][1] / SR))
+        # The open end of the last chunk is closed at its window's end
+        self.assertEqual(out["chunks"][-1]["timestamp"][1], len(audio) / SR)
+
+    def test_progress_reported_after_each_window(self):
+        reports = []
+        windowed_asr.transcribe_windows(
+            lambda inputs: {"text": "x"}, _tone(25), 10,
+            sampling_rate=SR, progress_cb=reports.append,
+        )
+        self.assertEqual(len(reports), 3)
+        self.assertEqual(reports[-1].percent, 100)
+        self.assertEqual(reports[-1].audio_done_s, 25)
+        done = [r.audio_done_s for r in reports]
+        self.assertEqual(done, sorted(done))
+
+    def test_cancel_stops_between_windows(self):
+        calls = []
+        out = windowed_asr.transcribe_windows(
+            lambda inputs: calls.append(1) or {"text": "x"},
+            _tone(25),
+            10,
+            sampling_rate=SR,
+            cancel_cb=lambda: len(calls) >= 1,
+        )
+        self.assertIsNone(out)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+import logging
+from threading import Lock
+
+from requests.exceptions import HTTPError, RequestException
+
+from app.services.batch_api import (
+    BatchClient,
+    BatchJob,
+    BatchJobStore,
+    parse_batch_output,
+)
+from app.services.llm_endpoints import is_local, normalize_base_url
+
+logger = logging.getLogger("transcribrr")
+
+
+class BatchPollingThread(QThread):
+    """Submit pending batch jobs and poll them until their results are in.
+
+    Jobs come from the BatchJobStore, so a thread started after a restart
+    picks up where the last one stopped. When a batch finishes its output
+    is downloaded and emitted through job_finished; the receiver writes
+    the results and marks the job applied. The thread exits once every
+    job in the store has been handed over.
+
+    api_key_for(base_url) returns the key for a job's endpoint, so each job
+    authenticates only against its own server. Jobs whose endpoint has no
+    key stay queued for a later thread.
+    """
+
+    update_progress = pyqtSignal(str)
+    # job_id, {recording_id: text}, {recording_id: error message}
+    job_finished = pyqtSignal(str, dict, dict)
+    error = pyqtSignal(str)
+
+    POLL_INTERVAL = 60  # seconds between status checks
+    SLEEP_STEP = 250  # ms; granularity of cancellation checks while waiting
+
+    def __init__(self, store: BatchJobStore, api_key_for, poll_interval=None,
+                 *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.store = store
+        self.api_key_for = api_key_for
+        self.poll_interval = poll_interval or self.POLL_INTERVAL
+        self._handed_over = set()
+        self._missing_key = set()  # jobs left queued: no key for their endpoint
+
+        # Cancellation support
+        self._is_canceled = False
+        self._lock = Lock()
+
+    def cancel(self):
+        with self._lock:
+            if not self._is_canceled:
+                logger.info("Cancellation requested for batch polling thread.")
+                self._is_canceled = True
+                self.requestInterruption()
+
+    def is_canceled(self):
+        with self._lock:
+            return self._is_canceled or self.isInterruptionRequested()
+
+    def run(self):
+        try:
+            while not self.is_canceled():
+                jobs = [
+                    job for job in self.store.unfinished()
+                    if job.job_id not in self._handed_over
+                    and job.job_id not in self._missing_key
+                ]
+                if not jobs:
+                    logger.info("No batch jobs left to poll.")
+                    return
+                for job in jobs:
+                    if self.is_canceled():
+                        return
+                    self._advance(job)
+                if any(
+                    job.job_id not in self._handed_over
+                    and job.job_id not in self._missing_key
+                    for job in jobs
+                ):
+                    self._sleep(self.poll_interval)
+        except Exception as e:
+            logger.error(f"Batch polling failed: {e}", exc_info=True)
+            self.error.emit(f"Batch polling failed: {e}")
+
+    def _sleep(self, seconds):
+        remaining = int(seconds * 1000)
+        while remaining > 0 and not self.is_canceled():
+            step = min(self.SLEEP_STEP, remaining)
+            self.msleep(step)
+            remaining -= step
+
+    def _advance(self, job: BatchJob) -> None:
+        """Move a job one step on: submit it, refresh it, or collect it."""
+        api_key = self.api_key_for(job.base_url)
+        if not api_key and not is_local(job.base_url):
+            logger.error(
+                f"No API key for {normalize_base_url(job.base_url)}; "
+                f"batch job {job.job_id} stays queued"
+            )
+            self._missing_key.add(job.job_id)
+            return
+        client = BatchClient(api_key, job.base_url)
+        try:
+            if job.batch_id is None:
+                self._submit(client, job)
+            elif not job.is_finished:
+                job.update_from_batch(client.get_batch(job.batch_id))
+                self.store.save(job)
+                logger.info(
+                    f"Batch {job.batch_id}: {job.status} "
+                    f"({job.completed_requests}/{len(job.recording_ids)} done)"
+                )
+                self.update_progress.emit(
+                    f"Batch {job.status}: {job.completed_requests} of "
+                    f"{len(job.recording_ids)} recordings processed"
+                )
+            if job.is_finished:
+                self._collect(client, job)
+        except HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if job.batch_id is None and status is not None and status < 500 \
+                    and status != 429:
+                # The request itself was rejected; retrying won't help
+                job.status = "failed"
+                job.error = f"Batch submission rejected: {e}"
+                job.input_jsonl = None
+                self.store.save(job)
+                self._collect(client, job)
+            else:
+                logger.warning(f"Batch job {job.job_id} poll failed: {e}")
+        except RequestException as e:
+            # Network trouble: keep the job and try again next round
+            logger.warning(f"Batch job {job.job_id} poll failed: {e}")
+            self.update_progress.emit(f"Batch status check failed, will retry: {e}")
+        except Exception as e:
+            # A malformed job or response would fail the same way on every
+            # round; fail this job alone and keep polling the others
+            logger.error(f"Batch job {job.job_id} failed: {e}", exc_info=True)
+            job.status = "failed"
+            job.error = f"Batch job failed: {e}"
+            job.input_jsonl = None
+            # Output that couldn't be read is reported as failed requests
+            job.output_file_id = job.error_file_id = None
+            self.store.save(job)
+            self._collect(client, job)
+
+    def _submit(self, client: BatchClient, job: BatchJob) -> None:
+        if not job.input_jsonl:
+            raise ValueError(f"Batch job {job.job_id} has no input to submit")
+        self.update_progress.emit(
+            f"Submitting batch of {len(job.recording_ids)} recordings...")
+        if job.input_file_id is None:
+            job.input_file_id = client.upload_file(
+                job.input_jsonl, filename=f"transcribrr-{job.job_id}.jsonl")
+            self.store.save(job)  # don't re-upload if creation fails
+        batch = client.create_batch(
+            job.input_file_id, metadata={"transcribrr_job": job.job_id})
+        job.update_from_batch(batch)
+        job.input_jsonl = None  # the server has it now
+        self.store.save(job)
+        logger.info(f"Submitted batch {job.batch_id} for job {job.job_id}")
+        self.update_progress.emit(f"Batch submitted ({job.batch_id})")
+
+    def _collect(self, client: BatchClient, job: BatchJob) -> None:
+        """Download and parse a finished batch, then hand it over."""
+        results, errors = {}, {}
+        for file_id in (job.output_file_id, job.error_file_id):
+            if file_id:
+                file_results, file_errors = parse_batch_output(
+                    client.download_file(file_id))
+                results.update(file_results)
+                errors.update(file_errors)
+        for recording_id in job.recording_ids:
+            if recording_id not in results and recording_id not in errors:
+                errors[recording_id] = job.error or f"Batch {job.status}"
+        logger.info(
+            f"Batch job {job.job_id} {job.status}: {len(results)} succeeded, "
+            f"{len(errors)} failed"
+        )
+        self._handed_over.add(job.job_id)
+        self.job_finished.emit(job.job_id, results, errors)
+
@@ -0,0 +1,189 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+import os
+import datetime
+import logging
+import multiprocessing
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    BrokenExecutor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from threading import Lock
+
+from app.constants import get_recordings_dir
+from app.file_utils import import_media_file
+
+# Configure logging
+logger = logging.getLogger("transcribrr")
+
+
+class BulkImportThread(QThread):
+    """Import many media files in parallel worker processes.
+
+    Each file is probed and copied/hard-linked or transcoded by
+    file_utils.import_media_file in a process pool. The thread only plans
+    destination names and gathers results; the caller inserts the returned
+    recording rows in one batch.
+    """
+
+    update_progress = pyqtSignal(str)
+    file_progress = pyqtSignal(int, int)  # files done, total
+    # (recording_data tuples, [(source path, error message)])
+    completed = pyqtSignal(list, list)
+    error = pyqtSignal(str)
+
+    def __init__(self, file_paths, max_workers=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.file_paths = list(file_paths)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.recordings_dir = get_recordings_dir()
+
+        # Cancellation support
+        self._is_canceled = False
+        self._lock = Lock()
+
+    def cancel(self):
+        with self._lock:
+            if not self._is_canceled:
+                logger.info("Cancellation requested for bulk import thread.")
+                self._is_canceled = True
+                self.requestInterruption()
+
+    def is_canceled(self):
+        with self._lock:
+            return self._is_canceled or self.isInterruptionRequested()
+
+    def plan_destinations(self):
+        """Return a unique destination stem (path without extension) per file.
+
+        Stems are reserved up front so parallel workers never collide, and
+        are unique regardless of the extension a worker ends up writing.
+        """
+        existing = {
+            os.path.splitext(name)[0].lower()
+            for name in os.listdir(self.recordings_dir)
+        }
+        stems = []
+        for file_path in self.file_paths:
+            name = os.path.splitext(os.path.basename(file_path))[0]
+            candidate = name
+            counter = 1
+            while candidate.lower() in existing:
+                candidate = f"{name}_{counter}"
+                counter += 1
+            existing.add(candidate.lower())
+            stems.append(os.path.join(self.recordings_dir, candidate))
+        return stems
+
+    def _create_executor(self, workers):
+        # Always spawn: forking a multithreaded Qt process can leave children
+        # deadlocked on locks held by threads that don't exist in them
+        try:
+            return ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        except (OSError, NotImplementedError, ValueError) as e:
+            # Some sandboxed/frozen environments can't spawn processes
+            logger.warning(f"Process pool unavailable ({e}); using threads")
+            return ThreadPoolExecutor(max_workers=workers)
+
+    def _collect(self, future, job, date_created, records, failures, broken):
+        """Append a finished import to records, or its error to failures.
+
+        Jobs lost to a broken pool (a worker failed to start or died) go to
+        broken so they can be retried elsewhere.
+        """
+        source = job[0]
+        try:
+            dest_path, duration = future.result()
+        except BrokenExecutor as e:
+            logger.warning(f"Worker pool failed while importing {source}: {e}")
+            broken.append(job)
+            return
+        except Exception as e:
+            logger.error(f"Error importing {source}: {e}")
+            failures.append((source, str(e)))
+            return
+        records.append((
+            os.path.basename(dest_path),
+            dest_path,
+            date_created,
+            duration,
+            "",
+            "",
+            source,
+        ))
+
+    def _run_pool(self, executor, jobs, date_created, records, failures):
+        """Import (source, stem) jobs on executor; return jobs it couldn't run."""
+        total = len(self.file_paths)
+        broken = []
+        pending = {}
+        try:
+            for index, job in enumerate(jobs):
+                try:
+                    pending[executor.submit(import_media_file, *job)] = job
+                except (BrokenExecutor, OSError, RuntimeError) as e:
+                    # Process pools report start-up failures at submit time
+                    logger.warning(f"Could not submit import job: {e}")
+                    broken.extend(jobs[index:])
+                    break
+
+            while pending and not self.is_canceled():
+                # Wake periodically so cancellation is noticed promptly
+                done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._collect(future, pending.pop(future), date_created,
+                                  records, failures, broken)
+                if done:
+                    done_count = len(records) + len(failures)
+                    self.file_progress.emit(done_count, total)
+                    self.update_progress.emit(
+                        f"Imported {done_count}/{total} files...")
+        finally:
+            # Drop queued files but let in-flight ones finish so their
+            # output is recorded rather than left orphaned on disk
+            executor.shutdown(wait=True, cancel_futures=True)
+            for future, job in pending.items():
+                if future.done() and not future.cancelled():
+                    self._collect(future, job, date_created,
+                                  records, failures, broken)
+        return broken
+
+    def run(self):
+        records = []
+        failures = []
+        total = len(self.file_paths)
+        try:
+            if not total:
+                return
+            os.makedirs(self.recordings_dir, exist_ok=True)
+            stems = self.plan_destinations()
+            date_created = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            workers = max(1, min(self.max_workers, total))
+            self.update_progress.emit(
+                f"Importing {total} files using {workers} workers...")
+
+            jobs = list(zip(self.file_paths, stems))
+            broken = self._run_pool(self._create_executor(workers), jobs,
+                                    date_created, records, failures)
+            if broken and not self.is_canceled():
+                logger.warning(
+                    f"Process pool failed; importing {len(broken)} "
+                    "remaining files with threads")
+                self._run_pool(ThreadPoolExecutor(max_workers=workers), broken,
+                               date_created, records, failures)
+
+            if self.is_canceled():
+                self.update_progress.emit(
+                    f"Import cancelled after {len(records)} of {total} files.")
+        except Exception as e:
+            logger.error(f"Bulk import failed: {e}", exc_info=True)
+            self.error.emit(f"Import failed: {e}")
+        finally:
+            # Always hand back finished files so they get added to the library
+            self.completed.emit(records, failures)
+            logger.info("Bulk import thread finished execution.")
@@ -2,10 +2,45 @@ from PyQt6.QtCore import QThread, pyqtSignal
 import requests
 from requests.exceptions import RequestException, Timeout, ConnectionError
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 from threading import Lock  # Import Lock
-from typing import List, Dict, Optional, Any, Union
+from typing import List, Dict, Optional, Any, Tuple, Union
 import logging  # Use logging
 
+from app.services.http_client import get_session
+from app.services.incremental_format import (
+    clean_fragment,
+    has_markers,
+    plan_blocks,
+    render_blocks,
+)
+from app.services.llm_endpoints import (
+    OPENAI_BASE_URL,
+    chat_completions_url,
+    check_health,
+    endpoint_key_name,
+    endpoint_slot,
+    is_local,
+    is_openai,
+    normalize_base_url,
+    validate_base_url,
+)
+from app.services.response_cache import (
+    cache_enabled_for,
+    get_response_cache,
+    make_key,
+)
+from app.services.rate_limiter import (
+    RATE_PRIORITY_BATCH,
+    RATE_PRIORITY_NORMAL,
+    backoff_delay,
+    get_rate_limiter,
+    parse_retry_after,
+)
+from app.services.text_chunker import estimate_tokens, input_budget, split_text
+
 logger = logging.getLogger("transcribrr")
 
 
@@ -13,12 +48,35 @@ class GPT4ProcessingThread(QThread):
     update_progress = pyqtSignal(str)
     completed = pyqtSignal(str)
     error = pyqtSignal(str)
+    partial_text = pyqtSignal(str)  # Accumulated text so far while streaming
 
     # Constants
     MAX_RETRY_ATTEMPTS = 3
     RETRY_DELAY = 2  # seconds
     API_ENDPOINT = "https://api.openai.com/v1/chat/completions"  # Always use HTTPS
     TIMEOUT = 120  # seconds (Increased timeout for potentially long responses)
+    CONNECT_TIMEOUT = 10  # seconds to establish the connection
+    PARTIAL_EMIT_INTERVAL = 0.1  # seconds between partial_text emissions
+    MAP_CONCURRENCY = 4  # parallel chunk requests for long transcripts
+
+    MAP_INSTRUCTIONS = (
+        "The transcript is too long to process at once and has been split "
+        "into consecutive parts. This is part {index} of {total}. Apply the "
+        "instructions to this part only; the results for all parts will be "
+        "combined afterwards."
+    )
+    BLOCK_FORMAT_INSTRUCTIONS = (
+        "The text is one excerpt of a longer document that is formatted piece "
+        "by piece. Return only the HTML for this excerpt, without <html> or "
+        "<body> tags, code fences or commentary."
+    )
+    REDUCE_INSTRUCTIONS = (
+        "The user message contains the results of applying the instructions "
+        "below to consecutive parts of one long transcript, in order. Combine "
+        "them into a single coherent result that follows the instructions, "
+        "merging content that was split across parts and removing "
+        "repetition.\n\nInstructions:\n{instructions}"
+    )
 
     def __init__(
         self,
@@ -29,6 +87,11 @@ class GPT4ProcessingThread(QThread):
         temperature: float,
         openai_api_key: str,
         messages: Optional[List[Dict[str, str]]] = None,
+        stream: bool = True,
+        priority: int = RATE_PRIORITY_NORMAL,
+        use_cache: bool = True,
+        api_base_url: Optional[str] = None,
+        previous_html: Optional[str] = None,
         *args,
         **kwargs,
     ):
@@ -38,16 +101,32 @@ class GPT4ProcessingThread(QThread):
         self.gpt_model = gpt_model
         self.max_tokens = max_tokens
         self.temperature = temperature
+        # Key for this endpoint; the OpenAI key only when it is api.openai.com
         self.openai_api_key = openai_api_key
         self.messages = messages
+        # Stream tokens as server-sent events instead of one blocking response
+        self.stream = stream
+        # Queue position for the shared rate limiter; lower goes first
+        self.priority = priority
+        # Serve repeated requests from the persistent response cache
+        self.use_cache = use_cache
+        # OpenAI-compatible server to use instead of api.openai.com
+        self.api_base_url = normalize_base_url(api_base_url)
+        # Last smart-format output; when it carries block markers, format the
+        # text incrementally, sending only blocks that changed since then
+        self.previous_html = previous_html
+        self.api_url = (
+            chat_completions_url(api_base_url) if api_base_url else self.API_ENDPOINT
+        )
 
         # Cancellation flag
         self._is_canceled = False
         self._lock = Lock()
         # To potentially cancel the request
         self.current_request: Optional[requests.Session] = None
-        self._session: Optional[requests.Session] = None
-        self._response: Optional[requests.Response] = None
+        # Responses of in-flight requests; several are open at once while
+        # chunks of a long transcript are processed in parallel
+        self._open_requests: List[Any] = []
 
     def cancel(self):
         with self._lock:
@@ -57,22 +136,9 @@ class GPT4ProcessingThread(QThread):
                 self._is_canceled = True
                 self.requestInterruption()  # Use QThread's built-in interruption
 
-                # Close the response first, then the session
-                if self._response is not None:
-                    try:
-                        logger.debug("Closing active HTTP response.")
-                        self._response.close()
-                    except Exception as e:
-                        logger.warning(f"Could not close response: {e}")
-                    self._response = None
-
-                if self._session is not None:
-                    try:
-                        logger.debug("Closing active HTTP session.")
-                        self._session.close()
-                    except Exception as e:
-                        logger.warning(f"Could not close session: {e}")
-                    self._session = None
+                # Close in-flight responses, unblocking any worker reading
+                # from them
+                self._close_open_requests()
 
                 # Backward compatibility with existing code
                 if self.current_request and hasattr(self.current_request, "close"):
@@ -90,6 +156,33 @@ class GPT4ProcessingThread(QThread):
         with self._lock:
             return self._is_canceled or self.isInterruptionRequested()
 
+    def _track(self, resource: Any) -> None:
+        with self._lock:
+            if not self._is_canceled:
+                self._open_requests.append(resource)
+                return
+        resource.close()  # cancel() already ran; don't leave it open
+
+    def _release(self, resource: Any) -> None:
+        """Close resource and stop tracking it."""
+        with self._lock:
+            if resource in self._open_requests:
+                self._open_requests.remove(resource)
+        try:
+            resource.close()
+        except Exception as e:
+            logger.warning(f"Error closing HTTP resource: {e}")
+
+    def _close_open_requests(self) -> None:
+        """Close every tracked response. Caller holds _lock."""
+        resources, self._open_requests = self._open_requests, []
+        for resource in resources:
+            try:
+                logger.debug(f"Closing active HTTP {type(resource).__name__}.")
+                resource.close()
+            except Exception as e:
+                logger.warning(f"Could not close {type(resource).__name__}: {e}")
+
     def run(self):
         if self.is_canceled():
             self.update_progress.emit(
@@ -99,18 +192,29 @@ class GPT4ProcessingThread(QThread):
         try:
             self.update_progress.emit("GPT processing started...")
 
-            # Validate API key before proceeding
-            if not self.openai_api_key:
+            # Validate API key before proceeding; local servers may not need one
+            if not self.openai_api_key and not is_local(self.api_base_url):
+                if is_openai(self.api_base_url):
+                    raise ValueError(
+                        "OpenAI API key is missing. Please add your API key in Settings."
+                    )
                 raise ValueError(
-                    "OpenAI API key is missing. Please add your API key in Settings."
+                    f"No API key is stored for {self.api_base_url} "
+                    f"({endpoint_key_name(self.api_base_url)})."
                 )
+            self._check_endpoint()
 
+            chunks: List[str] = []
+            # Without markers to diff against, format the whole document at once
+            incremental = has_markers(self.previous_html) and not self.messages
             # Construct messages if not provided
             if not self.messages:
                 messages_to_send = [
                     {"role": "system", "content": self.prompt_instructions},
                     {"role": "user", "content": self.transcript},
                 ]
+                if not incremental:
+                    chunks = self._split_if_too_long()
             else:
                 messages_to_send = self.messages
 
@@ -118,11 +222,37 @@ class GPT4ProcessingThread(QThread):
                 self.update_progress.emit("GPT processing cancelled.")
                 return
 
-            result = self._send_api_request(messages_to_send)
+            cache_key = None
+            # Incremental formatting caches each block separately
+            if (
+                self.use_cache
+                and not incremental
+                and cache_enabled_for(self.temperature)
+            ):
+                # Keyed on the whole request, before any chunking
+                cache_key = make_key(
+                    messages_to_send, self.gpt_model, self.temperature,
+                    self.max_tokens, self.api_base_url,
+                )
+                cached = get_response_cache().get(cache_key)
+                if cached is not None:
+                    logger.info("Using cached GPT response.")
+                    self.completed.emit(cached)
+                    self.update_progress.emit("GPT processing finished (cached).")
+                    return
+
+            if incremental:
+                result = self._format_incrementally()
+            elif len(chunks) > 1:
+                result = self._map_reduce(chunks)
+            else:
+                result = self._send_api_request(messages_to_send)
 
             if self.is_canceled():  # Check after API call returns
                 self.update_progress.emit("GPT processing cancelled.")
             else:
+                if cache_key is not None and result:
+                    get_response_cache().put(cache_key, self.gpt_model, result)
                 self.completed.emit(result)
                 self.update_progress.emit("GPT processing finished.")
 
@@ -228,24 +358,8 @@ class GPT4ProcessingThread(QThread):
         finally:
             # Clean up any resources
             try:
-                # Close the response first, then the session
-                if self._response is not None:
-                    try:
-                        logger.debug("Closing HTTP response in finally block.")
-                        self._response.close()
-                    except Exception as e:
-                        logger.warning(
-                            f"Error closing response in finally block: {e}")
-                    self._response = None
-
-                if self._session is not None:
-                    try:
-                        logger.debug("Closing HTTP session in finally block.")
-                        self._session.close()
-                    except Exception as e:
-                        logger.warning(
-                            f"Error closing session in finally block: {e}")
-                    self._session = None
+                with self._lock:
+                    self._close_open_requests()
 
                 # Legacy cleanup
                 if hasattr(self, "current_request") and self.current_request:
@@ -261,23 +375,198 @@ class GPT4ProcessingThread(QThread):
                 logger.warning(f"Error during resource cleanup: {cleanup_e}")
             logger.info("GPT processing thread finished execution.")
 
-    def _send_api_request(self, messages: List[Dict[str, str]]) -> str:
+    def _check_endpoint(self) -> None:
+        """Fail fast if a self-hosted endpoint isn't reachable."""
+        if self.api_base_url == OPENAI_BASE_URL:
+            return
+        validate_base_url(self.api_base_url)
+        healthy, message = check_health(self.api_base_url, self.openai_api_key)
+        if not healthy:
+            raise ValueError(
+                f"The language model server at {self.api_base_url} is not "
+                f"reachable ({message}). Check that it is running or change "
+                f"the API base URL in Settings."
+            )
+
+    def _split_if_too_long(self) -> List[str]:
+        """Return transcript chunks when it won't fit the model's context."""
+        budget = input_budget(
+            self.gpt_model, self.max_tokens, self.prompt_instructions)
+        tokens = estimate_tokens(self.transcript)
+        if budget <= 0 or tokens <= budget:
+            return []
+        chunks = split_text(self.transcript, budget)
+        logger.info(
+            f"Transcript (~{tokens} tokens) exceeds the {self.gpt_model} "
+            f"input budget of {budget}; processing {len(chunks)} parts."
+        )
+        return chunks
+
+    def _map_reduce(self, chunks: List[str]) -> str:
+        """Run the prompt on each chunk, then combine the partial results."""
+        # Part requests queue behind single requests from other threads;
+        # only the final combine goes out at this thread's own priority
+        partials = self._process_parts(
+            chunks,
+            lambda i, n: f"{self.prompt_instructions}\n\n"
+            + self.MAP_INSTRUCTIONS.format(index=i, total=n),
+            "part",
+            priority=RATE_PRIORITY_BATCH,
+        )
+        if partials is None:
+            return "[Cancelled]"
+
+        reduce_prompt = self.REDUCE_INSTRUCTIONS.format(
+            instructions=self.prompt_instructions)
+        budget = input_budget(self.gpt_model, self.max_tokens, reduce_prompt)
+
+        # Combine in rounds until the partial results fit in one request
+        combined = self._join_partials(partials)
+        while len(partials) > 1 and estimate_tokens(combined) > budget:
+            groups = split_text(combined, budget)
+            if len(groups) >= len(partials):
+                break  # Partials can't be grouped further; send as is
+            partials = self._process_parts(
+                groups, lambda i, n: reduce_prompt, "summary group",
+                priority=RATE_PRIORITY_BATCH)
+            if partials is None:
+                return "[Cancelled]"
+            combined = self._join_partials(partials)
+
+        self.update_progress.emit("Combining results...")
+        return self._send_api_request(
+            [
+                {"role": "system", "content": reduce_prompt},
+                {"role": "user", "content": combined},
+            ]
+        )
+
+    def _format_incrementally(self) -> str:
+        """Format only blocks changed since previous_html and merge the result."""
+        blocks = plan_blocks(self.transcript, self.previous_html)
+        pending = [block for block in blocks if block.html is None]
+        logger.info(
+            f"Smart format: reusing {len(blocks) - len(pending)} of "
+            f"{len(blocks)} blocks, formatting {len(pending)}."
+        )
+        prompt = f"{self.prompt_instructions}\n\n{self.BLOCK_FORMAT_INSTRUCTIONS}"
+        cache = (
+            get_response_cache()
+            if self.use_cache and cache_enabled_for(self.temperature)
+            else None
+        )
+
+        to_send = []
+        for block in pending:
+            key = make_key(
+                [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": block.text},
+                ],
+                self.gpt_model, self.temperature, self.max_tokens,
+                self.api_base_url,
+            )
+            cached = cache.get(key) if cache else None
+            if cached is not None:
+                block.html = clean_fragment(cached) or None
+            else:
+                to_send.append((block, key))
+
+        if to_send:
+            responses = self._process_parts(
+                [block.text for block, _ in to_send], lambda i, n: prompt, "block")
+            if responses is None:
+                return "[Cancelled]"
+            for (block, key), response in zip(to_send, responses):
+                # An empty reply keeps the block as plain paragraphs
+                block.html = clean_fragment(response) or None
+                if cache and block.html:
+                    cache.put(key, self.gpt_model, response)
+        else:
+            self.update_progress.emit("No changes to format.")
+        return render_blocks(blocks)
+
+    @staticmethod
+    def _join_partials(partials: List[str]) -> str:
+        return "\n\n".join(
+            f"[Part {i}]\n{text.strip()}" for i, text in enumerate(partials, 1)
+        )
+
+    def _process_parts(
+        self, parts: List[str], system_prompt, label: str, priority: Optional[int] = None
+    ):
+        """Send each part concurrently; return results in order, None if cancelled."""
+        total = len(parts)
+        results: List[Optional[str]] = [None] * total
+        done = 0
+        self.update_progress.emit(f"Processing {total} {label}s...")
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.MAP_CONCURRENCY, total))
+        try:
+            futures = {
+                executor.submit(
+                    self._send_api_request,
+                    [
+                        {"role": "system", "content": system_prompt(i + 1, total)},
+                        {"role": "user", "content": part},
+                    ],
+                    stream=False,
+                    quiet=True,
+                    priority=priority,
+                ): i
+                for i, part in enumerate(parts)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                done += 1
+                if self.is_canceled():
+                    return None
+                self.update_progress.emit(f"Processed {label} {done}/{total}...")
+        finally:
+            # On error or cancel, drop chunks that haven't started yet
+            executor.shutdown(wait=True, cancel_futures=True)
+        return [text or "" for text in results]
+
+    def _send_api_request(
+        self,
+        messages: List[Dict[str, str]],
+        stream: Optional[bool] = None,
+        quiet: bool = False,
+        priority: Optional[int] = None,
+    ) -> str:
+        """Send one chat completion request with retries and return its text.
+
+        stream and priority default to self.stream and self.priority; quiet
+        suppresses per-attempt progress messages, for requests made in
+        parallel.
+        """
+        stream = self.stream if stream is None else stream
+        priority = self.priority if priority is None else priority
         retry_count = 0
         last_error: Optional[Exception] = None
-        session: Optional[requests.Session] = None
+        retry_after: Optional[float] = None
+        if self.api_base_url == OPENAI_BASE_URL:
+            limiter = get_rate_limiter(self.gpt_model)
+        else:
+            limiter = get_rate_limiter(f"{self.api_base_url} {self.gpt_model}")
+        # Output tokens count against the tokens-per-minute limit up front
+        request_tokens = self.max_tokens + sum(
+            estimate_tokens(m.get("content") or "") for m in messages)
 
         while retry_count < self.MAX_RETRY_ATTEMPTS:
             if self.isInterruptionRequested() or self.is_canceled():
                 return "[Cancelled]"
 
+            response: Optional[requests.Response] = None
+            slot = ExitStack()
             try:
-                self.update_progress.emit(
-                    f"Sending request to OpenAI ({self.gpt_model})... Attempt {retry_count + 1}"
-                )
+                if not quiet:
+                    self.update_progress.emit(
+                        f"Sending request to OpenAI ({self.gpt_model})... Attempt {retry_count + 1}"
+                    )
 
-                # Verify HTTPS is being used
-                if not self.API_ENDPOINT.startswith("https://"):
-                    raise ValueError("API URL must use HTTPS for security")
+                # Verify HTTPS is being used (plain HTTP only for local servers)
+                validate_base_url(self.api_url)
 
                 data = {
                     "messages": messages,
@@ -285,45 +574,63 @@ class GPT4ProcessingThread(QThread):
                     "max_tokens": self.max_tokens,
                     "temperature": self.temperature,
                 }
-                headers = {
-                    "Authorization": f"Bearer {self.openai_api_key}",
-                    "Content-Type": "application/json",
-                }
-
-                # Create a new session for each attempt to ensure clean state
-                # This assignment ensures type is maintained for mypy
-                self._session = requests.Session()
+                if stream:
+                    data["stream"] = True
+                headers = {"Content-Type": "application/json"}
+                if self.openai_api_key:
+                    headers["Authorization"] = f"Bearer {self.openai_api_key}"
+
+                # Reuse pooled keep-alive connections across requests
+                session = get_session()
                 prepared_request = requests.Request(
-                    "POST", self.API_ENDPOINT, json=data, headers=headers
+                    "POST", self.api_url, json=data, headers=headers
                 ).prepare()
-                self.current_request = (
-                    self._session  # Store session for potential cancellation
-                )
 
-                # Check cancellation again before sending request
-                if self.isInterruptionRequested() or self.is_canceled():
+                # Wait for our turn under the shared requests/tokens budget
+                if not limiter.acquire(
+                    request_tokens, priority, cancel_check=self.is_canceled
+                ):
+                    return "[Cancelled]"
+                # Stay within the endpoint's concurrent request limit
+                if not slot.enter_context(
+                    endpoint_slot(self.api_base_url, self.is_canceled)
+                ):
                     return "[Cancelled]"
 
-                self._response = self._session.send(
-                    prepared_request, timeout=self.TIMEOUT
+                # When streaming, TIMEOUT bounds the gap between chunks rather
+                # than the whole completion
+                response = session.send(
+                    prepared_request,
+                    timeout=(self.CONNECT_TIMEOUT, self.TIMEOUT),
+                    stream=stream,
                 )
-                self.current_request = None  # Request finished
+                self._track(response)
+                limiter.update_from_headers(response.headers)
 
                 if self.isInterruptionRequested() or self.is_canceled():
                     # Check after potentially long request
                     return "[Cancelled]"
 
                 # Raise HTTPError for bad responses (4xx or 5xx)
-                self._response.raise_for_status()
+                response.raise_for_status()
 
-                response_data = self._response.json()
+                if stream:
+                    content = self._read_stream(response)
+                    if self.is_canceled():
+                        return "[Cancelled]"
+                    logger.info(
+                        "Finished streaming response from OpenAI API. Content length: %s", len(content)
+                    )
+                    return content
+
+                response_data = response.json()
                 content: str = (
                     response_data.get("choices", [{}])[0]
                     .get("message", {})
                     .get("content", "")
                 )
                 logger.info(
-                    f"Received successful response from OpenAI API. Choice 0 content length: {len(content)}"
+                    "Received successful response from OpenAI API. Choice 0 content length: %s", len(content)
                 )
                 return content
 
@@ -340,20 +647,27 @@ class GPT4ProcessingThread(QThread):
 
             except RequestException as e:  # Catches HTTPError, etc.
                 last_error = e
+                # Responses are falsy for error statuses, so compare to None
+                error_response = e.response
+                has_response = error_response is not None
                 logger.warning(
-                    f"RequestException (Attempt {retry_count + 1}): {e}. Status: {e.response.status_code if e.response else 'N/A'}"
+                    f"RequestException (Attempt {retry_count + 1}): {e}. Status: {error_response.status_code if has_response else 'N/A'}"
                 )
                 error_info = (
                     self._parse_error_response(
-                        e.response) if e.response else str(e)
+                        error_response) if has_response else str(e)
                 )
                 status_code = (
-                    e.response.status_code if e.response else 500
+                    error_response.status_code if has_response else 500
                 )  # Assume server error if no response code
 
                 if self._should_retry(status_code, error_info):
                     # Fall through to retry logic
-                    pass
+                    if has_response:
+                        retry_after = parse_retry_after(error_response.headers)
+                    if status_code == 429:
+                        # Hold every thread sharing this model's limit
+                        limiter.pause(backoff_delay(retry_count, retry_after))
                 else:
                     # Don't retry other client errors (e.g., 400 Bad Request, 401 Auth Error)
                     raise Exception(f"OpenAI API error: {error_info}") from e
@@ -366,15 +680,21 @@ class GPT4ProcessingThread(QThread):
                 )
                 # Don't retry unexpected errors
                 raise  # Re-raise the original exception
+            finally:
+                # Closing returns the connection to the shared pool
+                if response is not None:
+                    self._release(response)
+                slot.close()
 
             # --- Retry Logic ---
             retry_count += 1
             if retry_count < self.MAX_RETRY_ATTEMPTS:
                 if self.isInterruptionRequested() or self.is_canceled():
                     return "[Cancelled]"
-                retry_delay = self.RETRY_DELAY * (
-                    2 ** (retry_count - 1)
-                )  # Exponential backoff
+                # Jittered exponential backoff, or the server's Retry-After
+                retry_delay = backoff_delay(
+                    retry_count - 1, retry_after, base=self.RETRY_DELAY)
+                retry_after = None
                 self.update_progress.emit(
                     f"Retrying in {retry_delay:.1f}s... (Attempt {retry_count + 1}/{self.MAX_RETRY_ATTEMPTS})"
                 )
@@ -394,6 +714,77 @@ class GPT4ProcessingThread(QThread):
 
         return "[Error: Max retries exceeded]"  # Should not be reached
 
+    def _read_stream(self, response: requests.Response) -> str:
+        """Accumulate streamed content deltas, emitting partial_text as they arrive.
+
+        A stream that ends without [DONE] or a finish_reason (dropped
+        connection, proxy timeout) raises, so a truncated reply is retried
+        rather than returned as complete.
+        """
+        parts: List[str] = []
+        last_emit = 0.0
+        finished = False
+        # text/event-stream has no charset, so requests would assume latin-1
+        response.encoding = "utf-8"
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if self.is_canceled():
+                    break
+                event = self._parse_stream_line(line)
+                if event is None:
+                    finished = True
+                    break  # [DONE]
+                delta, finish_reason = event
+                if finish_reason:
+                    finished = True  # [DONE] may still follow
+                if not delta:
+                    continue
+                parts.append(delta)
+                now = time.monotonic()
+                if now - last_emit >= self.PARTIAL_EMIT_INTERVAL:
+                    last_emit = now
+                    self.partial_text.emit("".join(parts))
+        except (RequestException, AttributeError, ValueError):
+            # cancel() closes the response underneath the iterator
+            if self.is_canceled():
+                return "".join(parts)
+            raise
+
+        content = "".join(parts)
+        if self.is_canceled():
+            return content
+        if not finished:
+            raise RequestException(
+                "Response stream ended before the completion finished"
+            )
+        if content:
+            self.partial_text.emit(content)
+        return content
+
+    @staticmethod
+    def _parse_stream_line(line: Optional[str]) -> Optional[Tuple[str, Optional[str]]]:
+        """Parse one SSE line into (content delta, finish_reason); None at [DONE].
+
+        Blank separators, comments and other fields give ("", None).
+        """
+        if not line or not line.startswith("data:"):
+            return "", None
+        payload = line[5:].strip()
+        if payload == "[DONE]":
+            return None
+        try:
+            event = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.warning(f"Ignoring malformed stream event: {payload[:100]}")
+            return "", None
+        if "error" in event:
+            error = event["error"]
+            message = error.get("message") if isinstance(error, dict) else error
+            raise Exception(f"OpenAI API error: {message}")
+        choice = (event.get("choices") or [{}])[0]
+        delta = (choice.get("delta") or {}).get("content") or ""
+        return delta, choice.get("finish_reason")
+
     def _parse_error_response(self, response: requests.Response) -> str:
         try:
             error_data = response.json()
@@ -0,0 +1,142 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+import logging
+import threading
+from typing import Optional
+
+from app.ThreadManager import ThreadManager
+
+logger = logging.getLogger("transcribrr")
+
+GB = 1024**3
+PREFETCH_MIN_FREE_GB = 4.0  # don't start loading with less free memory
+RELEASE_BELOW_FREE_GB = 1.0  # drop the prefetched model below this
+MEMORY_POLL_SECONDS = 15
+WARMUP_AUDIO_SECONDS = 30  # one pipeline chunk of silence
+
+
+class ModelPrefetchThread(QThread):
+    """Load the configured local model and warm it up while the app is idle.
+
+    Runs at the lowest priority and outside the worker pools, so it never
+    delays a real job. After the warm-up it keeps the model held until
+    cancelled (a real transcription is starting) or free memory runs low.
+    Loading weights can't be interrupted, but a job that starts meanwhile
+    waits for that load instead of loading the model a second time.
+    """
+
+    update_progress = pyqtSignal(str)
+
+    def __init__(self, model_id: str, language: str = "english", parent=None):
+        super().__init__(parent)
+        self.model_id = model_id
+        self.language = language
+        self._cancelled = threading.Event()
+        self._holding = False
+        self._evict = False  # release without keep-warm (memory pressure)
+
+    def cancel(self) -> None:
+        if not self._cancelled.is_set():
+            logger.debug("Model prefetch cancelled")
+            self._cancelled.set()
+            self.requestInterruption()
+
+    def is_canceled(self) -> bool:
+        return self._cancelled.is_set() or self.isInterruptionRequested()
+
+    def _free_gb(self, device: str) -> Optional[float]:
+        from app.services.batch_tuner import free_memory_bytes
+
+        free = free_memory_bytes(device)
+        return None if free is None else free / GB
+
+    def run(self) -> None:
+        self.setPriority(QThread.Priority.LowestPriority)
+        try:
+            from app.services.transcription_service import ModelManager
+
+            manager = ModelManager.instance()
+            free = self._free_gb(manager.device)
+            if free is not None and free < PREFETCH_MIN_FREE_GB:
+                logger.info(f"Skipping model prefetch: only {free:.1f}GB free")
+                return
+            if self.is_canceled():
+                return
+
+            manager.hold()
+            self._holding = True
+            logger.info(f"Prefetching {self.model_id} on {manager.device}")
+            manager.get_model(self.model_id)
+            manager.get_processor(self.model_id)
+            if self.is_canceled() or self._memory_tight(manager):
+                return
+
+            self._warm_up(manager)
+            self.update_progress.emit("Transcription model ready")
+            logger.info(f"Model {self.model_id} prefetched and warmed up")
+
+            # Keep it loaded for the first job, unless memory runs short
+            while not self._cancelled.wait(MEMORY_POLL_SECONDS):
+                if self.isInterruptionRequested() or self._memory_tight(manager):
+                    return
+        except Exception as e:
+            logger.warning(f"Model prefetch failed: {e}")
+        finally:
+            if self._holding:
+                self._holding = False
+                self._release(manager)
+
+    def _warm_up(self, manager) -> None:
+        """Run silence through the pipeline so kernels and buffers are ready."""
+        import numpy as np
+        from app.services.windowed_asr import SAMPLING_RATE
+
+        pipe = manager.create_pipeline(self.model_id, self.language, batch_size=1)
+        silence = np.zeros(SAMPLING_RATE * WARMUP_AUDIO_SECONDS, dtype=np.float32)
+        pipe({"raw": silence, "sampling_rate": SAMPLING_RATE})
+
+    def _memory_tight(self, manager) -> bool:
+        free = self._free_gb(manager.device)
+        if free is not None and free < RELEASE_BELOW_FREE_GB:
+            logger.info(f"Releasing prefetched model: only {free:.1f}GB free")
+            self._evict = True
+            return True
+        return False
+
+    def _release(self, manager) -> None:
+        # Under memory pressure evict at once, unless a job has started and
+        # holds the model; otherwise the usual keep-warm timer applies, which
+        # a job starting now cancels with hold(). MPS jobs use the same
+        # ModelManager copy, so the warm model serves them too.
+        manager.release_memory(force=self._evict)
+
+
+_prefetch_thread: Optional[ModelPrefetchThread] = None
+
+
+def start_model_prefetch() -> Optional[ModelPrefetchThread]:
+    """Start prefetching if enabled and the local method is configured."""
+    global _prefetch_thread
+    from app.utils import ConfigManager
+
+    config = ConfigManager.instance()
+    if not config.get("model_prefetch_enabled", False):
+        return None
+    if config.get("transcription_method", "local") != "local":
+        return None
+    if _prefetch_thread is not None and _prefetch_thread.isRunning():
+        return _prefetch_thread
+
+    thread = ModelPrefetchThread(
+        config.get("transcription_quality", "openai/whisper-small"),
+        config.get("transcription_language", "english"),
+    )
+    ThreadManager.instance().register_thread(thread)
+    thread.start()
+    _prefetch_thread = thread
+    return thread
+
+
+def cancel_model_prefetch() -> None:
+    """Stop a running prefetch, e.g. because a real transcription starts."""
+    if _prefetch_thread is not None and _prefetch_thread.isRunning():
+        _prefetch_thread.cancel()
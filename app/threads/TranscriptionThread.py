@@ -99,8 +99,8 @@ class TranscriptionThread(QThread):
                 logger.info("Cancellation requested for transcription thread.")
                 self._is_canceled = True
                 self.requestInterruption()  # Use QThread's built-in interruption
-                # Note: Cannot easily interrupt underlying model inference once started.
-                # Cancellation primarily prevents starting new steps or chunks.
+                # Local inference polls is_canceled() between audio windows, and
+                # the chunked API path between chunks, so work stops within a batch.
 
     def is_canceled(self):
         # Check both the custom flag and QThread's interruption status
@@ -198,19 +198,10 @@ class TranscriptionThread(QThread):
             self.update_progress.emit("Transcription failed: Unexpected error")
         finally:
             try:
-                # Always attempt to release resources regardless of cancellation state
+                # Local models are released by the service when the job that
+                # held them finishes; only temporary files are left here
                 self.update_progress.emit(
                     "Cleaning up transcription resources...")
-                try:
-                    if ModelManager is None:
-                        from app.services.transcription_service import ModelManager as _MM
-                        _MM.instance().release_memory()
-                    else:
-                        ModelManager.instance().release_memory()
-                except Exception:
-                    pass
-
-                # Clean up any temporary files that might still exist
                 self._cleanup_temp_files()
             except Exception as cleanup_error:
                 logger.error(
@@ -287,6 +278,27 @@ class TranscriptionThread(QThread):
             self._cleanup_temp_files()
             return []
 
+    def _record_runtime(self, file_path: str, runtime: float) -> None:
+        """Add this job to the history that transcription estimates learn from."""
+        try:
+            from app.file_utils import probe_duration
+            from app.services.time_estimator import device_class, get_time_estimator
+
+            audio_seconds = probe_duration(file_path)
+            if not audio_seconds:
+                return
+            method = self.transcription_method.lower().strip()
+            device = None if method == "api" else ModelManager.instance().device
+            get_time_estimator().record(
+                method,
+                self.transcription_quality,
+                device_class(method, device),
+                audio_seconds,
+                runtime,
+            )
+        except Exception as e:
+            logger.debug(f"Could not record transcription time: {e}")
+
     def _cleanup_temp_files(self):
         """Delete any temporary files created during processing."""
         for temp_file in self.temp_files:
@@ -411,6 +423,8 @@ class TranscriptionThread(QThread):
             end_time = time.time()
             runtime = end_time - start_time
             logger.info(f"Finished processing {task_label} in {runtime:.2f}s")
+            if transcription_result.get("text") != "[Cancelled]":
+                self._record_runtime(file_path, runtime)
 
             # Return formatted text if speaker detection was successful, otherwise plain text
             if (
@@ -1,93 +1,233 @@
+import hashlib
 import os
+import sys
 import logging
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from app.path_utils import resource_path
 
 try:  # pragma: no cover - exercised in packaged app
-    from PyQt6.QtGui import QIcon, QPixmap
-    from PyQt6.QtCore import QSize, QRectF, Qt
+    from PyQt6.QtGui import QGuiApplication, QIcon, QImage, QPixmap
+    from PyQt6.QtCore import QSize, QRectF, Qt, QTimer
     try:
         from PyQt6.QtSvg import QSvgRenderer  # type: ignore
     except Exception:  # QtSvg may be missing in some runtimes
         QSvgRenderer = None  # type: ignore
 except Exception:  # pragma: no cover
     # Minimal stubs for test import; tests don't render icons
+    QGuiApplication = None  # type: ignore
     QIcon = object  # type: ignore
+    QImage = object  # type: ignore
     QPixmap = object  # type: ignore
     QSize = object  # type: ignore
+    QTimer = None  # type: ignore
     QSvgRenderer = None  # type: ignore
 
 logger = logging.getLogger("transcribrr")
 
+# Sizes the UI requests most; pre-rendered to disk on first launch
+PRERENDER_SIZES = (20, 24)
+PRERENDER_BATCH = 8  # icons rendered per event-loop turn while idle
 
-def _render_svg_to_pixmap(svg_path: str, size: int = 32):
-    """Render an SVG into a QPixmap of a given size.
+# (absolute path, size, theme, device pixel ratio) -> QIcon
+_icon_cache: Dict[Tuple[str, int, str, float], "QIcon"] = {}
 
-    Returns None if QtSvg is unavailable or rendering fails.
+
+def _current_theme() -> str:
+    """Return the active theme without importing ThemeManager (and Qt) here."""
+    module = sys.modules.get("app.ThemeManager")
+    manager = getattr(getattr(module, "ThemeManager", None), "_instance", None)
+    return getattr(manager, "current_theme", None) or "light"
+
+
+def _device_pixel_ratio() -> float:
+    try:
+        app = QGuiApplication.instance() if QGuiApplication is not None else None
+        return float(app.devicePixelRatio()) if app is not None else 1.0
+    except Exception:
+        return 1.0
+
+
+def _disk_cache_dir() -> Optional[str]:
+    """Return the PNG cache directory, or None if the disk cache is off."""
+    try:
+        from app.constants import get_user_data_dir
+        from app.utils import ConfigManager
+
+        if not ConfigManager.instance().get("icon_disk_cache", True):
+            return None
+        return os.path.join(get_user_data_dir(), "icon_cache")
+    except Exception as e:  # Qt unavailable or config not loaded
+        logger.debug(f"Icon disk cache unavailable: {e}")
+        return None
+
+
+def _disk_cache_path(cache_dir: str, abs_path: str, size: int, theme: str,
+                     ratio: float) -> str:
+    """Name a cached PNG after the source file's identity and render settings.
+
+    Modification time and file size are part of the name, so an edited
+    SVG is re-rendered rather than served stale.
     """
+    stat = os.stat(abs_path)
+    digest = hashlib.sha1(
+        f"{abs_path}|{stat.st_mtime_ns}|{stat.st_size}".encode("utf-8")
+    ).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(abs_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{digest}-{theme}-{size}@{ratio:g}x.png")
+
+
+def _render_svg_to_image(svg_path: str, pixels: int):
+    """Render an SVG into a transparent QImage; None if unavailable or invalid."""
     if QSvgRenderer is None:  # QtSvg not available
         return None
     try:
         renderer = QSvgRenderer(svg_path)
         if not renderer.isValid():
             return None
-        pm = QPixmap(size, size)
-        # Transparent background
-        try:
-            pm.fill(Qt.GlobalColor.transparent)
-        except Exception:
-            # Fallback if Qt namespace differs
-            pm.fill(0)
+        image = QImage(pixels, pixels, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
         from PyQt6.QtGui import QPainter
 
-        p = QPainter(pm)
-        # Render into the full pixmap rect to ensure scaling
-        renderer.render(p, QRectF(0, 0, size, size))
+        p = QPainter(image)
+        # Render into the full image rect to ensure scaling
+        renderer.render(p, QRectF(0, 0, pixels, pixels))
         p.end()
-        return pm
+        return image
     except Exception as e:
         logger.debug(f"SVG render failed for {svg_path}: {e}")
         return None
 
 
-def load_icon(path: str, *, size: int = 32) -> "QIcon":
-    """Load an icon from a relative or absolute path with SVG fallback.
+def _render_svg_to_pixmap(svg_path: str, size: int = 32, ratio: float = 1.0):
+    """Render an SVG into a QPixmap of a given (logical) size.
 
-    - Resolves relative paths through resource_path().
-    - If loading an SVG and QIcon cannot load via plugins, renders with QSvgRenderer.
-    - Returns an empty QIcon if the path does not exist.
+    The pixmap is rendered at size * ratio device pixels so icons stay
+    sharp on high-DPI screens. Returns None if QtSvg is unavailable or
+    rendering fails.
     """
-    abs_path = path if os.path.isabs(path) else resource_path(path)
+    image = _render_svg_to_image(svg_path, max(1, round(size * ratio)))
+    if image is None:
+        return None
+    try:
+        pm = QPixmap.fromImage(image)
+        pm.setDevicePixelRatio(ratio)
+        return pm
+    except Exception as e:
+        logger.debug(f"SVG pixmap conversion failed for {svg_path}: {e}")
+        return None
 
-    if not os.path.exists(abs_path):
-        logger.warning(f"Icon path does not exist: {abs_path}")
+
+def _load_svg_pixmap(abs_path: str, size: int, theme: str, ratio: float):
+    """Return a rendered pixmap for an SVG, reading/writing the PNG disk cache."""
+    cache_dir = _disk_cache_dir()
+    png_path = None
+    if cache_dir is not None:
+        try:
+            png_path = _disk_cache_path(cache_dir, abs_path, size, theme, ratio)
+            if os.path.exists(png_path):
+                pm = QPixmap(png_path)
+                if not pm.isNull():
+                    pm.setDevicePixelRatio(ratio)
+                    return pm
+        except Exception as e:
+            logger.debug(f"Icon cache read failed for {abs_path}: {e}")
+
+    pm = _render_svg_to_pixmap(abs_path, size=size, ratio=ratio)
+    if pm is not None and png_path is not None:
         try:
-            return QIcon()  # type: ignore
-        except Exception:
-            return QIcon  # type: ignore
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{png_path}.{os.getpid()}.tmp"
+            if pm.save(tmp_path, "PNG"):
+                os.replace(tmp_path, png_path)
+        except Exception as e:
+            logger.debug(f"Icon cache write failed for {abs_path}: {e}")
+    return pm
+
 
-    # Try native QIcon loading first
+def _empty_icon():
     try:
-        icon = QIcon(abs_path)  # type: ignore
-        # If it's a non-SVG or the icon loaded, return it
-        if not abs_path.lower().endswith(".svg") or not getattr(icon, "isNull", lambda: False)():
-            return icon
+        return QIcon()  # type: ignore
     except Exception:
-        # Fall through to SVG rendering below
-        pass
+        return QIcon  # type: ignore
 
-    # Attempt manual SVG rendering
-    pm = _render_svg_to_pixmap(abs_path, size=size)
-    if pm is not None:
-        try:
-            ic = QIcon(pm)  # type: ignore
-            return ic
-        except Exception:
-            pass
 
-    # Last resort: return whatever QIcon() yields (likely null)
+def _create_icon(abs_path: str, size: int, theme: str, ratio: float) -> "QIcon":
+    # SVGs are rasterised once per key instead of being re-parsed by the
+    # icon engine for every QIcon
+    if abs_path.lower().endswith(".svg"):
+        pm = _load_svg_pixmap(abs_path, size, theme, ratio)
+        if pm is not None:
+            try:
+                return QIcon(pm)  # type: ignore
+            except Exception:
+                pass
+
+    # Native loading for other formats, or if SVG rendering is unavailable
     try:
         return QIcon(abs_path)  # type: ignore
     except Exception:
         return QIcon  # type: ignore
+
+
+def load_icon(path: str, *, size: int = 32, theme: Optional[str] = None) -> "QIcon":
+    """Load an icon from a relative or absolute path with SVG fallback.
+
+    - Resolves relative paths through resource_path().
+    - Icons are cached per (absolute path, size, theme, device pixel ratio),
+      so repeated calls (e.g. once per row in a tree rebuild) are lookups.
+    - SVGs are rendered with QSvgRenderer and, unless icon_disk_cache is
+      off, kept as PNGs in the user data directory for later launches.
+    - Returns an empty QIcon if the path does not exist.
+    """
+    abs_path = os.path.abspath(path if os.path.isabs(path) else resource_path(path))
+    key = (abs_path, size, theme or _current_theme(), _device_pixel_ratio())
+    icon = _icon_cache.get(key)
+    if icon is not None:
+        return icon
+
+    if not os.path.exists(abs_path):
+        logger.warning(f"Icon path does not exist: {abs_path}")
+        return _empty_icon()
+
+    icon = _create_icon(abs_path, *key[1:])
+    _icon_cache[key] = icon
+    return icon
+
+
+def clear_icon_cache() -> None:
+    """Drop cached icons (the PNG disk cache is kept)."""
+    _icon_cache.clear()
+
+
+def _svg_icon_paths() -> List[str]:
+    root = resource_path("icons")
+    paths = []
+    for dirpath, _dirnames, filenames in os.walk(root):
+        paths.extend(
+            os.path.join(dirpath, name)
+            for name in sorted(filenames)
+            if name.lower().endswith(".svg")
+        )
+    return paths
+
+
+def prerender_icons(sizes=PRERENDER_SIZES) -> None:
+    """Render every bundled SVG icon to the disk cache during idle time.
+
+    Work is spread over event-loop turns, a few icons at a time, so the UI
+    stays responsive. Icons already on disk are only loaded into memory.
+    """
+    if QTimer is None or _disk_cache_dir() is None:
+        return
+    pending = [(path, size) for path in _svg_icon_paths() for size in sizes]
+    logger.debug(f"Pre-rendering {len(pending)} icons")
+
+    def render_batch():
+        batch, pending[:] = pending[:PRERENDER_BATCH], pending[PRERENDER_BATCH:]
+        for path, size in batch:
+            load_icon(path, size=size)
+        if pending:
+            QTimer.singleShot(0, render_batch)
+
+    QTimer.singleShot(0, render_batch)
@@ -1,5 +1,5 @@
 from .path_utils import resource_path
-from logging.handlers import RotatingFileHandler
+from .log_utils import setup_logging
 import os
 import re
 import sys
@@ -82,28 +82,11 @@ from .constants import (
 # Configure logging
 # Ensure log directory exists
 os.makedirs(get_log_dir(), exist_ok=True)
-# Configure logging once, using a rotating file handler to avoid unbounded
-# growth of the log file.  If another module (e.g. main.py) re‑configures
-# logging later this block will silently be ignored thanks to the `force`
-# parameter defaulting to *False* in older Python versions.
-
-
+# Configure logging once: records are queued and written by a background
+# listener with a rotating file handler (see app.log_utils).  If logging
+# was already configured (e.g. by a test runner) it is left alone.
 if not logging.getLogger().handlers:
-    max_bytes = 5 * 1024 * 1024  # 5 MB per log file
-    backup_count = 3  # keep up to 15 MB total
-
-    rotating_handler = RotatingFileHandler(
-        get_log_file(),
-        maxBytes=max_bytes,
-        backupCount=backup_count,
-        encoding="utf-8",
-    )
-
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s",
-        handlers=[logging.StreamHandler(), rotating_handler],
-    )
+    setup_logging(log_file=get_log_file())
 
 # Use app name for logger consistently
 logger = logging.getLogger(APP_NAME)
@@ -847,12 +830,22 @@ class PromptManager(QObject):
 
 
 def estimate_transcription_time(
-    file_path: str, model_name: str, is_gpu: bool = False
+    file_path: str, model_name: str, is_gpu: bool = False, method: str = "local"
 ) -> Optional[int]:
-    """Estimate transcription time (very rough estimate)."""
+    """Estimate transcription time.
+
+    Uses the runtimes of earlier jobs with the same configuration when
+    there are any, otherwise a rough guess from file size and model name.
+    """
     if not os.path.exists(file_path):
         return None
     try:
+        from app.services.time_estimator import predict_transcription
+
+        estimate = predict_transcription(file_path, method, model_name, is_gpu)
+        if estimate is not None:
+            return max(int(estimate.seconds), 5)
+
         file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
         # Simplified speed factor based on model size name
         speed_factor = 1.0  # Base (medium)
@@ -0,0 +1,170 @@
+"""
+Benchmark local transcription on the CPU: baseline vs. optimized settings.
+
+Runs every audio file in a sample folder through a Whisper model loaded in
+each mode and reports real-time factor (compute seconds per audio second,
+lower is faster) and word error rate against a reference transcript: a
+.txt file with the same name next to each audio file. Keep the folder
+fixed so runs stay comparable.
+
+Usage:
+    python benchmark_cpu_asr.py SAMPLES_DIR [--model openai/whisper-small]
+        [--modes baseline,threads,int8,int8+compile] [--json results.json]
+
+Modes:
+    baseline        float32 weights, torch's default threads, eager attention
+    threads         physical-core threads and SDPA attention
+    int8            threads + dynamic int8 quantization of linear layers
+    int8+compile    int8 + torch.compile on the encoder
+
+Modes always run in the order above: thread settings can't be undone
+within a process, so the baseline has to come first.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from app.services.cpu_inference import (
+    configure_cpu_threads,
+    load_cpu_model,
+    word_error_rate,
+)
+from app.services.windowed_asr import SAMPLING_RATE
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".flac", ".m4a", ".ogg")
+MODES = ("baseline", "threads", "int8", "int8+compile")
+BATCH_SIZE = 8
+
+
+def load_samples(samples_dir):
+    """Return [(audio path, reference text or None)] sorted by name."""
+    samples = []
+    for name in sorted(os.listdir(samples_dir)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() not in AUDIO_EXTENSIONS:
+            continue
+        reference = None
+        ref_path = os.path.join(samples_dir, stem + ".txt")
+        if os.path.exists(ref_path):
+            with open(ref_path, encoding="utf-8") as f:
+                reference = f.read()
+        samples.append((os.path.join(samples_dir, name), reference))
+    return samples
+
+
+def load_model(model_id, mode):
+    from transformers import AutoModelForSpeechSeq2Seq
+    import torch
+
+    if mode == "baseline":
+        return AutoModelForSpeechSeq2Seq.from_pretrained(
+            model_id, torch_dtype=torch.float32, low_cpu_mem_usage=True,
+            use_safetensors=True, attn_implementation="eager",
+        ).eval()
+    return load_cpu_model(
+        model_id,
+        quantize=mode.startswith("int8"),
+        compile_encoder=mode.endswith("+compile"),
+    )
+
+
+def run_mode(model_id, mode, samples, language):
+    from transformers import AutoProcessor, pipeline
+    import torch
+
+    from app.ffmpeg_utils import decode_audio
+
+    if mode != "baseline":
+        configure_cpu_threads()
+    started = time.perf_counter()
+    model = load_model(model_id, mode)
+    processor = AutoProcessor.from_pretrained(model_id)
+    pipe = pipeline(
+        "automatic-speech-recognition",
+        model=model,
+        tokenizer=processor.tokenizer,
+        feature_extractor=processor.feature_extractor,
+        torch_dtype=torch.float32,
+        chunk_length_s=30,
+        batch_size=BATCH_SIZE,
+        device="cpu",
+        generate_kwargs={"language": language},
+    )
+    load_s = time.perf_counter() - started
+
+    audio = [decode_audio(path, SAMPLING_RATE) for path, _ in samples]
+    # Warm-up so one-off costs (compilation, allocator growth) aren't timed
+    pipe({"raw": audio[0][: SAMPLING_RATE * 30], "sampling_rate": SAMPLING_RATE})
+
+    total_audio = total_compute = 0.0
+    errors = []
+    for (path, reference), samples_ in zip(samples, audio):
+        started = time.perf_counter()
+        text = pipe({"raw": samples_, "sampling_rate": SAMPLING_RATE})["text"]
+        elapsed = time.perf_counter() - started
+        duration = len(samples_) / SAMPLING_RATE
+        total_audio += duration
+        total_compute += elapsed
+        wer = word_error_rate(reference, text) if reference else None
+        if wer is not None:
+            errors.append(wer)
+        print(
+            f"  {os.path.basename(path)}: rtf {elapsed / duration:.3f}"
+            + (f", wer {wer:.3f}" if wer is not None else ""),
+            flush=True,
+        )
+
+    return {
+        "mode": mode,
+        "load_seconds": round(load_s, 2),
+        "audio_seconds": round(total_audio, 2),
+        "compute_seconds": round(total_compute, 2),
+        "rtf": round(total_compute / total_audio, 4) if total_audio else None,
+        "wer": round(sum(errors) / len(errors), 4) if errors else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("samples_dir", help="folder of audio files with .txt references")
+    parser.add_argument("--model", default="openai/whisper-small")
+    parser.add_argument("--language", default="english")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    requested = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = [m for m in requested if m not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+    modes = [m for m in MODES if m in requested]
+    samples = load_samples(args.samples_dir)
+    if not samples:
+        parser.error(f"no audio files in {args.samples_dir}")
+
+    results = []
+    for mode in modes:
+        print(f"{mode}:", flush=True)
+        results.append(run_mode(args.model, mode, samples, args.language))
+
+    baseline = next((r for r in results if r["mode"] == "baseline"), None)
+    print(f"\n{'mode':<14}{'rtf':>8}{'speedup':>9}{'wer':>8}{'load s':>8}")
+    for r in results:
+        speedup = (
+            f"{baseline['rtf'] / r['rtf']:.2f}x"
+            if baseline and baseline["rtf"] and r["rtf"] else "-"
+        )
+        wer = f"{r['wer']:.3f}" if r["wer"] is not None else "-"
+        print(f"{r['mode']:<14}{r['rtf']:>8.3f}{speedup:>9}{wer:>8}{r['load_seconds']:>8.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"model": args.model, "samples": len(samples), "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,7 @@ For packaged builds, use the entry point in app/__main__.py instead.
 """
 
 from app.__main__ import run_application
+import multiprocessing
 import sys
 import os
 
@@ -18,5 +19,8 @@ if app_dir not in sys.path:
 # Import the main execution function from the new location
 
 if __name__ == "__main__":
+    # Frozen builds re-execute this script for process pool workers (bulk
+    # import); they must run their task instead of starting the GUI again
+    multiprocessing.freeze_support()
     # This allows running `python main.py` during development
     sys.exit(run_application())